@@ -0,0 +1,114 @@
+"""Compare the shared front-matter engine with the legacy regex + PyYAML path.
+
+Usage: python benchmarks/bench_front_matter.py [--repeat N] [DIR ...]
+
+Every MDX file under the given directories (default: all plugin_dev_* dirs)
+is parsed with both implementations; results are checked for equality before
+timings are reported.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import yaml
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+from front_matter import SafeLoader, extract_front_matter  # noqa: E402
+
+
+def legacy_extract_front_matter(content):
+    """The implementation previously copied into rename.py and friends."""
+    match = re.match(r"^\s*---\s*$(.*?)^---\s*$(.*)", content, re.DOTALL | re.MULTILINE)
+    if match:
+        yaml_str = match.group(1).strip()
+        markdown_content = match.group(2).strip()
+        try:
+            front_matter = yaml.safe_load(yaml_str)
+            if front_matter is None:
+                return {}, markdown_content
+            return (
+                front_matter if isinstance(front_matter, dict) else {}
+            ), markdown_content
+        except yaml.YAMLError:
+            return None, content
+    else:
+        return {}, content
+
+
+def load_corpus(dirs):
+    contents = []
+    for directory in dirs:
+        for root, _, files in os.walk(directory):
+            for filename in sorted(files):
+                if filename.lower().endswith(".mdx"):
+                    with open(os.path.join(root, filename), "r", encoding="utf-8") as f:
+                        contents.append(f.read())
+    return contents
+
+
+def time_it(func, contents, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for content in contents:
+            func(content)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("dirs", nargs="*", help="Directories to scan")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds (best is kept)")
+    args = parser.parse_args()
+
+    dirs = args.dirs or [
+        os.path.join(BASE_DIR, name)
+        for name in sorted(os.listdir(BASE_DIR))
+        if re.match(r"^plugin_dev_[a-z]+$", name)
+    ]
+    contents = load_corpus(dirs)
+    if not contents:
+        print("No MDX files found.")
+        return
+
+    # The new engine must agree with the old one before its timing means anything.
+    # YAML errors are printed by extract_front_matter, so silence stdout here.
+    mismatches = 0
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        for content in contents:
+            old_fm, old_body = legacy_extract_front_matter(content)
+            new_fm, new_body = extract_front_matter(content)
+            if old_fm != new_fm or old_body != str(new_body):
+                mismatches += 1
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+
+    total_bytes = sum(len(c) for c in contents)
+    print(f"Files: {len(contents)} ({total_bytes / 1024:.1f} KiB)")
+    print(f"libyaml loader: {'yes' if SafeLoader.__name__.startswith('C') else 'no'}")
+    print(f"Mismatches: {mismatches}")
+
+    sys.stdout = open(os.devnull, "w")
+    try:
+        legacy = time_it(legacy_extract_front_matter, contents, args.repeat)
+        shared = time_it(extract_front_matter, contents, args.repeat)
+    finally:
+        sys.stdout.close()
+        sys.stdout = real_stdout
+
+    print(f"{'legacy regex + yaml.safe_load':<34}{legacy * 1000:10.2f} ms")
+    print(f"{'front_matter.extract_front_matter':<34}{shared * 1000:10.2f} ms")
+    if shared:
+        print(f"{'speedup':<34}{legacy / shared:10.2f} x")
+
+
+if __name__ == "__main__":
+    main()
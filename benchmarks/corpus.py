@@ -0,0 +1,195 @@
+"""Synthetic plugin_dev_<lang> corpus generator for the pipeline benchmarks.
+
+Usage: python benchmarks/corpus.py OUTPUT_DIR [--pages N] [--languages en zh]
+       [--link-density K] [--nav-depth D] [--seed S]
+
+Writes OUTPUT_DIR/plugin_dev_<lang>/PWXY-<title>.<lang>.mdx pages whose front
+matter follows the `dimensions` schema from about_dimensions.md (mapped values
+from pwxy.py, plus a small share of missing/unmapped ones), bodies with
+internal links and fenced code, and an OUTPUT_DIR/docs.json whose navigation
+lists every page at the requested nesting depth.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import pwxy  # noqa: E402
+import rename  # noqa: E402
+from front_matter import dump_yaml  # noqa: E402
+
+# Share of pages whose dimensions are deliberately incomplete or unmapped,
+# so the warning paths of the scripts are exercised too.
+IRREGULAR_SHARE = 0.05
+# Share of pages still using the legacy 'summary' key (fix_summary_to_description.py)
+SUMMARY_SHARE = 0.2
+
+LOREM = (
+    "Plugins extend Dify with tools, models, agent strategies and endpoints. "
+    "This section walks through configuration, credentials and packaging. "
+    "Each step links to the reference pages for the fields it uses. "
+)
+
+CODE_SAMPLE = """```python
+from dify_plugin import Tool
+
+
+class ExampleTool(Tool):
+    def _invoke(self, tool_parameters):
+        yield self.create_text_message("hello [not a link](/plugin_dev_en/x)")
+```"""
+
+
+def random_dimensions(rng):
+    """Pick a (primary, detail, level) triple, occasionally irregular."""
+    primary = rng.choice(sorted(pwxy.DETAIL_TYPE_MAPS))
+    detail = rng.choice(sorted(pwxy.DETAIL_TYPE_MAPS[primary]))
+    level = rng.choice(sorted(pwxy.LEVEL_MAP))
+    if rng.random() < IRREGULAR_SHARE:
+        choice = rng.randrange(3)
+        if choice == 0:
+            detail = "unknown-detail"
+        elif choice == 1:
+            level = None
+        else:
+            primary = "unmapped"
+    dimensions = {"type": {"primary": primary, "detail": detail}}
+    if level is not None:
+        dimensions["level"] = level
+    return dimensions
+
+
+def build_front_matter(rng, index, lang):
+    front_matter = {
+        "dimensions": random_dimensions(rng),
+        "standard_title": f"Synthetic Page {index:06d}",
+        "language": lang,
+        "title": f"Synthetic page {index} ({lang})",
+    }
+    description = (LOREM * 2).strip()
+    if rng.random() < SUMMARY_SHARE:
+        front_matter["summary"] = description
+    else:
+        front_matter["description"] = description
+    return front_matter
+
+
+def build_body(rng, page_paths, link_density):
+    paragraphs = []
+    for section in range(3):
+        links = " ".join(
+            f"[related {n}](/{rng.choice(page_paths)})"
+            for n in range(max(0, link_density // 3 + (section < link_density % 3)))
+        )
+        paragraphs.append(f"## Section {section + 1}\n\n{LOREM * 3}{links}")
+    paragraphs.insert(2, CODE_SAMPLE)
+    return "\n\n".join(paragraphs)
+
+
+def build_navigation(pages_by_group, nav_depth):
+    """Tabs -> groups (-> nested groups...) with the requested depth (1..3)."""
+    tabs = {}
+    for (tab_name, group_name, nested_name), pages in sorted(
+        pages_by_group.items(), key=lambda item: (str(item[0]), item[1][0])
+    ):
+        tab = tabs.setdefault(tab_name, {"tab": tab_name, "groups": []})
+        group = next((g for g in tab["groups"] if g["group"] == group_name), None)
+        if group is None:
+            group = {"group": group_name, "pages": []}
+            tab["groups"].append(group)
+        container = group["pages"]
+        for depth in range(1, nav_depth):
+            name = nested_name if depth == 1 else f"{nested_name} ({depth})"
+            if not name:
+                break
+            nested = next(
+                (p for p in container if isinstance(p, dict) and p["group"] == name), None
+            )
+            if nested is None:
+                nested = {"group": name, "pages": []}
+                container.append(nested)
+            container = nested["pages"]
+        container.extend(sorted(pages))
+    return list(tabs.values())
+
+
+def generate_corpus(output_dir, pages=1000, languages=("en", "zh"), link_density=3,
+                    nav_depth=2, seed=0, group_maps=None):
+    """
+    Generate the corpus; returns {lang: [page paths]}.
+    `pages` is per language. group_maps maps lang -> PWX group map (defaults to
+    the maps of letsgo.LANGUAGE_CONFIGS, and to the English map otherwise).
+    """
+    import letsgo
+
+    if group_maps is None:
+        group_maps = {config["language"]: config["group_map"] for config in letsgo.LANGUAGE_CONFIGS}
+    rng = random.Random(seed)
+    os.makedirs(output_dir, exist_ok=True)
+    all_pages = {}
+    languages_nav = []
+
+    for lang in languages:
+        docs_dir_name = f"plugin_dev_{lang}"
+        docs_dir = os.path.join(output_dir, docs_dir_name)
+        os.makedirs(docs_dir, exist_ok=True)
+        group_map = group_maps.get(lang) or group_maps.get("en", {})
+
+        records = []
+        for index in range(pages):
+            front_matter = build_front_matter(rng, index, lang)
+            _, filename, _ = rename.compute_target_name(front_matter, f"page-{index}.mdx")
+            records.append((filename, front_matter))
+        page_paths = [f"{docs_dir_name}/{filename[:-len('.mdx')]}" for filename, _ in records]
+
+        pages_by_group = {}
+        for (filename, front_matter), page_path in zip(records, page_paths):
+            body = build_body(rng, page_paths, link_density)
+            with open(os.path.join(docs_dir, filename), "w", encoding="utf-8") as f:
+                f.write(f"---\n{dump_yaml(front_matter)}---\n\n{body}")
+            key = tuple(filename[:3])
+            if key in group_map:
+                pages_by_group.setdefault(group_map[key], []).append(page_path)
+
+        all_pages[lang] = page_paths
+        languages_nav.append(
+            {"language": lang, "tabs": build_navigation(pages_by_group, nav_depth)}
+        )
+
+    with open(os.path.join(output_dir, "docs.json"), "w", encoding="utf-8") as f:
+        json.dump(
+            {"name": "Synthetic docs", "navigation": {"languages": languages_nav}},
+            f,
+            ensure_ascii=False,
+            indent=4,
+        )
+    return all_pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output_dir")
+    parser.add_argument("--pages", type=int, default=1000, help="Pages per language")
+    parser.add_argument("--languages", nargs="+", default=["en", "zh"])
+    parser.add_argument("--link-density", type=int, default=3, help="Internal links per page")
+    parser.add_argument("--nav-depth", type=int, default=2, choices=(1, 2, 3))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    pages = generate_corpus(
+        args.output_dir,
+        pages=args.pages,
+        languages=args.languages,
+        link_density=args.link_density,
+        nav_depth=args.nav_depth,
+        seed=args.seed,
+    )
+    print(f"Generated {sum(len(p) for p in pages.values())} pages in {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""Time every stage of the docs pipeline on synthetic corpora of growing size.
+
+Usage: python benchmarks/run_pipeline.py [--sizes 1000 10000 100000]
+       [--languages en zh] [--link-density K] [--nav-depth D] [--jobs N]
+       [--output report.json] [--compare BASELINE.json] [--keep DIR]
+
+For each size a corpus is generated with benchmarks/corpus.py (SIZE pages in
+total, split evenly across the languages) and the stages below are timed on
+it. Stages call the same functions the scripts use, with their console output
+discarded:
+
+  scan         letsgo.scan_language_dir over every language
+  read         read every page into memory
+  parse        front_matter.extract_front_matter
+  compute      rename.compute_target_name (PWXY prefix + filename)
+  classify     pwxy.classify_many over every front matter (prefixes only)
+  dump         front_matter.dump_yaml
+  write        write the rendered pages to a fresh directory
+  nav_sync     letsgo.sync_language against the generated docs.json + encode
+  nav_build    letsgo.sync_language into empty tabs + encode
+  nav_rebuild  letsgo.rebuild_language over the generated docs.json + encode
+  link_fix     fix_ref.rewrite_links over every page
+  link_index   link_index.LinkIndex.build
+  rename_<lang>       rename.process_markdown_files end to end (no cache)
+  summary_fix_<lang>  fix_summary_to_description.process_markdown_files (in place)
+
+The JSON report records the commit, interpreter and corpus parameters so runs
+from different commits can be compared with --compare.
+"""
+import argparse
+import contextlib
+import copy
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import fix_ref  # noqa: E402
+import fix_summary_to_description  # noqa: E402
+import letsgo  # noqa: E402
+import pwxy  # noqa: E402
+import rename  # noqa: E402
+from corpus import generate_corpus  # noqa: E402
+from docs_nav import encode_docs_json  # noqa: E402
+from front_matter import dump_yaml, extract_front_matter  # noqa: E402
+from link_index import LinkIndex  # noqa: E402
+
+REPORT_VERSION = 1
+
+
+@contextlib.contextmanager
+def quiet():
+    """Discard everything the pipeline functions print."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+class StageTimer:
+    def __init__(self):
+        self.stages = {}
+
+    @contextlib.contextmanager
+    def stage(self, name, items):
+        start = time.perf_counter()
+        with quiet():
+            yield
+        seconds = time.perf_counter() - start
+        self.stages[name] = {
+            "seconds": round(seconds, 6),
+            "items": items,
+            "us_per_item": round(seconds * 1e6 / items, 3) if items else None,
+        }
+        print(f"  {name:<18}{seconds * 1000:12.1f} ms  ({items} items)")
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_size(root, size, args):
+    """Generate a corpus of `size` pages under root and time every stage."""
+    per_language = max(1, size // len(args.languages))
+    print(f"\n== {per_language * len(args.languages)} pages ({per_language} x {', '.join(args.languages)}) ==")
+    start = time.perf_counter()
+    generate_corpus(
+        root,
+        pages=per_language,
+        languages=args.languages,
+        link_density=args.link_density,
+        nav_depth=args.nav_depth,
+        seed=args.seed,
+    )
+    print(f"  {'generate':<18}{(time.perf_counter() - start) * 1000:12.1f} ms")
+
+    configs = [c for c in letsgo.LANGUAGE_CONFIGS if c["language"] in args.languages]
+    timer = StageTimer()
+    previous_cwd = os.getcwd()
+    # letsgo builds page paths relative to the working directory, as in docs.json
+    os.chdir(root)
+    try:
+        with timer.stage("scan", len(configs)):
+            scans = [letsgo.scan_language_dir(config) for config in configs]
+        paths = [
+            os.path.join(root, config["docs_dir"], filename)
+            for config, filenames in zip(configs, scans)
+            for filename in filenames or ()
+        ]
+        total = len(paths)
+
+        with timer.stage("read", total):
+            contents = []
+            for path in paths:
+                with open(path, "r", encoding="utf-8") as f:
+                    contents.append(f.read())
+
+        with timer.stage("parse", total):
+            parsed = [extract_front_matter(content) for content in contents]
+
+        with timer.stage("compute", total):
+            names = []
+            for path, (front_matter, _) in zip(paths, parsed):
+                try:
+                    names.append(rename.compute_target_name(front_matter or {}, os.path.basename(path))[1])
+                except ValueError:
+                    names.append(os.path.basename(path))
+
+        with timer.stage("classify", total):
+            pwxy.classify_many(front_matter or {} for front_matter, _ in parsed)
+
+        with timer.stage("dump", total):
+            rendered = [
+                (name, f"---\n{dump_yaml(front_matter)}---\n\n{body}")
+                for name, (front_matter, body) in zip(names, parsed)
+                if front_matter is not None
+            ]
+
+        write_dir = os.path.join(root, "_bench_write")
+        os.makedirs(write_dir)
+        with timer.stage("write", len(rendered)):
+            for index, (name, content) in enumerate(rendered):
+                with open(os.path.join(write_dir, f"{index:07d}-{name}"), "w", encoding="utf-8") as f:
+                    f.write(content)
+        shutil.rmtree(write_dir)
+        del rendered, parsed
+
+        with open(os.path.join(root, "docs.json"), "r", encoding="utf-8") as f:
+            docs_data = json.load(f)
+        empty_data = copy.deepcopy(docs_data)
+        for lang_nav in empty_data["navigation"]["languages"]:
+            lang_nav["tabs"] = []
+        rebuild_data = copy.deepcopy(docs_data)
+
+        for stage, data, update_language in (
+            ("nav_sync", docs_data, letsgo.sync_language),
+            ("nav_build", empty_data, letsgo.sync_language),
+            ("nav_rebuild", rebuild_data, letsgo.rebuild_language),
+        ):
+            with timer.stage(stage, total):
+                for config, filenames in zip(configs, scans):
+                    update_language(data["navigation"], config, filenames)
+                encode_docs_json(data)
+
+        with timer.stage("link_fix", total):
+            for content in contents:
+                fix_ref.rewrite_links(content)
+        del contents
+
+        with timer.stage("link_index", total):
+            LinkIndex.build(base_dir=root, configs=configs)
+
+        # End-to-end scripts last; their targets are fresh, so nothing is archived.
+        for config, filenames in zip(configs, scans):
+            source_dir = os.path.join(root, config["docs_dir"])
+            target_dir = os.path.join(root, f"_bench_renamed_{config['language']}")
+            with timer.stage(f"rename_{config['language']}", len(filenames or ())):
+                rename.process_markdown_files(source_dir, target_dir, cache_path=None, jobs=args.jobs)
+            with timer.stage(f"summary_fix_{config['language']}", len(os.listdir(target_dir))):
+                fix_summary_to_description.process_markdown_files(target_dir)
+    finally:
+        os.chdir(previous_cwd)
+
+    return {
+        "pages": total,
+        "languages": args.languages,
+        "link_density": args.link_density,
+        "nav_depth": args.nav_depth,
+        "seed": args.seed,
+        "jobs": args.jobs,
+        "stages": timer.stages,
+    }
+
+
+def compare(report, baseline_path):
+    """Print per-stage ratios against a previous report (same page counts only)."""
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    old_runs = {run["pages"]: run for run in baseline.get("runs", [])}
+    print(f"\n== Compared with {baseline_path} ({baseline.get('commit') or 'unknown commit'}) ==")
+    for run in report["runs"]:
+        old_run = old_runs.get(run["pages"])
+        if old_run is None:
+            print(f"  {run['pages']} pages: no baseline run")
+            continue
+        print(f"  {run['pages']} pages:")
+        for name, stage in run["stages"].items():
+            old_stage = old_run["stages"].get(name)
+            if not old_stage or not old_stage["seconds"]:
+                continue
+            ratio = stage["seconds"] / old_stage["seconds"]
+            print(f"    {name:<20}{old_stage['seconds'] * 1000:10.1f} -> {stage['seconds'] * 1000:10.1f} ms  x{ratio:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Total page counts to benchmark")
+    parser.add_argument("--languages", nargs="+", default=["en", "zh"])
+    parser.add_argument("--link-density", type=int, default=3, help="Internal links per page")
+    parser.add_argument("--nav-depth", type=int, default=2, choices=(1, 2, 3))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jobs", type=int, default=1, help="Worker processes for the rename stage")
+    parser.add_argument("--output", help="Write the JSON report here")
+    parser.add_argument("--compare", metavar="BASELINE", help="Report from an earlier run to compare with")
+    parser.add_argument("--keep", metavar="DIR", help="Generate corpora under DIR and keep them")
+    args = parser.parse_args()
+
+    unknown = set(args.languages) - {c["language"] for c in letsgo.LANGUAGE_CONFIGS}
+    if unknown:
+        print(f"Error: Unknown language(s): {', '.join(sorted(unknown))}")
+        return 1
+
+    report = {
+        "version": REPORT_VERSION,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "runs": [],
+    }
+    for size in args.sizes:
+        if args.keep:
+            root = os.path.join(os.path.abspath(args.keep), f"corpus_{size}")
+            if os.path.exists(root):
+                shutil.rmtree(root)
+            report["runs"].append(run_size(root, size, args))
+        else:
+            with tempfile.TemporaryDirectory(prefix="docs_bench_") as root:
+                report["runs"].append(run_size(root, size, args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"\nReport written to {args.output}")
+    if args.compare:
+        compare(report, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,68 @@
+import contextlib
+import mmap
+import os
+
+# Byte-level scanning of pages through a read-only memory map, used by
+# fix_ref.py and link_index.py for large pages (long embedded code listings).
+# Instead of decoding a whole file to str and running a regex over it, the
+# link marker is searched for in the mapped bytes and only the few regions
+# around each hit are decoded and handed to the usual str pattern, so the
+# results match a full-text scan while the rest of the file is never decoded
+# (line numbers only need newlines counted, in bounded slices).
+
+# --- Configuration ---
+SCAN_MODES = ("auto", "text", "mmap")
+# 'auto' maps files of at least this many bytes and reads smaller ones as text
+MMAP_MIN_SIZE = 256 * 1024
+# Newlines are counted in slices of this size, so the copies stay small
+COUNT_CHUNK = 1024 * 1024
+
+
+def use_mmap(scan_mode, size):
+    """Whether a file of `size` bytes is scanned mapped under scan_mode."""
+    if scan_mode not in SCAN_MODES:
+        raise ValueError(f"Unknown scan mode '{scan_mode}' (expected one of {', '.join(SCAN_MODES)})")
+    return scan_mode == "mmap" or (scan_mode == "auto" and size >= MMAP_MIN_SIZE)
+
+
+@contextlib.contextmanager
+def mapped(filepath):
+    """Read-only mmap of filepath (b'' for an empty file)."""
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            yield buf
+
+
+def find_all(buf, marker, start=0):
+    """Offsets of every occurrence of the bytes marker in buf."""
+    positions = []
+    position = buf.find(marker, start)
+    while position != -1:
+        positions.append(position)
+        position = buf.find(marker, position + 1)
+    return positions
+
+
+def count_newlines(buf, start, end):
+    """Number of b'\\n' in buf[start:end], counted in COUNT_CHUNK slices."""
+    return sum(buf[chunk:min(chunk + COUNT_CHUNK, end)].count(b"\n") for chunk in range(start, end, COUNT_CHUNK))
+
+
+def line_spans(buf, positions):
+    """
+    Yield (line_no, start, end) of the lines holding the given sorted offsets,
+    once per line; end excludes the newline. Newlines are only counted up to
+    the last offset.
+    """
+    line_no, line_start, last_start = 1, 0, None
+    for position in positions:
+        line_no += count_newlines(buf, line_start, position)
+        line_start = buf.rfind(b"\n", 0, position) + 1
+        if line_start == last_start:
+            continue
+        last_start = line_start
+        line_end = buf.find(b"\n", position)
+        yield line_no, line_start, len(buf) if line_end == -1 else line_end
@@ -0,0 +1,267 @@
+import json
+import os
+import tempfile
+from collections import defaultdict
+
+try:
+    import orjson
+except ImportError:  # optional, only used by the "orjson" encoder
+    orjson = None
+
+# --- Navigation Index ---
+# docs.json navigation layout for one language:
+#   {"language": "en", "tabs": [{"tab": ..., "groups": [{"group": ..., "pages": [
+#       "plugin_dev_en/0111-....en",
+#       {"group": <nested group>, "pages": [...]},
+#   ]}]}]}
+
+
+def find_language_nav(navigation_data, lang_code):
+    """Return the navigation.languages entry for lang_code, or None."""
+    if not navigation_data or "languages" not in navigation_data:
+        return None
+    for lang_nav in navigation_data.get("languages", []):
+        if isinstance(lang_nav, dict) and lang_nav.get("language") == lang_code:
+            return lang_nav
+    return None
+
+
+class NavigationIndex:
+    """
+    Index over one language section of the docs.json navigation.
+
+    Built with a single walk; afterwards page membership, lookups of a
+    (tab, group, nested_group) container and page additions are dict
+    operations. Removals are recorded per container and each affected pages
+    list is compacted once, so removing k pages costs the size of the lists
+    they live in rather than a walk of the whole tree per page.
+
+    The index mutates the wrapped dicts/lists in place, so the docs.json data
+    it came from serialises exactly as before (json.dump of the whole file).
+    """
+
+    def __init__(self, lang_nav):
+        self.lang_nav = lang_nav
+        self._tabs = {}  # tab name -> tab dict (first match wins, as before)
+        self._groups = {}  # (tab, group) -> group dict
+        self._containers = {}  # (tab, group, nested or None) -> pages list
+        self._page_containers = defaultdict(list)  # page path -> [pages lists]
+        self._build()
+
+    # --- Building ---
+
+    def _build(self):
+        tabs = self.lang_nav.get("tabs")
+        if not isinstance(tabs, list):
+            return
+        for tab in tabs:
+            if not isinstance(tab, dict):
+                continue
+            tab_name = tab.get("tab")
+            self._tabs.setdefault(tab_name, tab)
+            groups = tab.get("groups")
+            if not isinstance(groups, list):
+                continue
+            for group in groups:
+                if not isinstance(group, dict):
+                    continue
+                group_name = group.get("group")
+                self._groups.setdefault((tab_name, group_name), group)
+                pages = group.get("pages")
+                if not isinstance(pages, list):
+                    continue
+                self._containers.setdefault((tab_name, group_name, None), pages)
+                for item in pages:
+                    if isinstance(item, dict) and "group" in item:
+                        nested_pages = item.get("pages")
+                        if isinstance(nested_pages, list):
+                            self._containers.setdefault(
+                                (tab_name, group_name, item["group"]), nested_pages
+                            )
+                self._index_pages(pages)
+
+    def _index_pages(self, pages):
+        for item in pages:
+            if isinstance(item, str):
+                self._page_containers[item].append(pages)
+            elif isinstance(item, dict) and isinstance(item.get("pages"), list):
+                self._index_pages(item["pages"])
+
+    # --- Queries ---
+
+    @property
+    def pages(self):
+        """Set-like view of every page path in this language's navigation."""
+        return self._page_containers.keys()
+
+    def __contains__(self, page):
+        return page in self._page_containers
+
+    def __len__(self):
+        return len(self._page_containers)
+
+    # --- Mutation ---
+
+    def remove_pages(self, pages_to_remove):
+        """
+        Remove every occurrence of the given page paths.
+        Returns the names of groups whose pages list became empty (their
+        structure is kept, as the previous recursive implementation did).
+        """
+        dirty = {}
+        for page in pages_to_remove:
+            for container in self._page_containers.pop(page, ()):
+                dirty[id(container)] = container
+
+        removed = set(pages_to_remove)
+        emptied = []
+        for container in dirty.values():
+            container[:] = [
+                item
+                for item in container
+                if not (isinstance(item, str) and item in removed)
+            ]
+            if not container:
+                emptied.extend(
+                    key[2] or key[1]
+                    for key, pages in self._containers.items()
+                    if pages is container
+                )
+        return emptied
+
+    def container(self, tab_name, group_name, nested_group_name=None):
+        """
+        Find or create the Tab/Group(/nested Group) structure and return the
+        lowest level pages list.
+        """
+        key = (tab_name, group_name, nested_group_name)
+        pages = self._containers.get(key)
+        if pages is not None:
+            return pages
+
+        tab = self._tabs.get(tab_name)
+        if tab is None:
+            if not isinstance(self.lang_nav.get("tabs"), list):
+                self.lang_nav["tabs"] = []
+            tab = {"tab": tab_name, "groups": []}
+            self.lang_nav["tabs"].append(tab)
+            self._tabs[tab_name] = tab
+        if not isinstance(tab.get("groups"), list):
+            tab["groups"] = []
+
+        group = self._groups.get((tab_name, group_name))
+        if group is None:
+            group = {"group": group_name, "pages": []}
+            tab["groups"].append(group)
+            self._groups[(tab_name, group_name)] = group
+        if not isinstance(group.get("pages"), list):
+            group["pages"] = []
+        self._containers[(tab_name, group_name, None)] = group["pages"]
+
+        if nested_group_name:
+            # Reuse a nested group whose pages entry was missing or malformed.
+            nested = next(
+                (
+                    item
+                    for item in group["pages"]
+                    if isinstance(item, dict) and item.get("group") == nested_group_name
+                ),
+                None,
+            )
+            if nested is None:
+                nested = {"group": nested_group_name, "pages": []}
+                group["pages"].append(nested)
+            elif not isinstance(nested.get("pages"), list):
+                nested["pages"] = []
+            pages = nested["pages"]
+        else:
+            pages = group["pages"]
+        self._containers[key] = pages
+        return pages
+
+    def add_page(self, page, tab_name, group_name, nested_group_name=None):
+        """Append page to the given group unless it is already listed there.
+        Returns True if the page was added."""
+        pages = self.container(tab_name, group_name, nested_group_name)
+        containers = self._page_containers[page]
+        if any(existing is pages for existing in containers):
+            return False
+        pages.append(page)
+        containers.append(pages)
+        return True
+
+    def to_dict(self):
+        """The (mutated in place) language section this index wraps."""
+        return self.lang_nav
+
+
+# --- docs.json Writer ---
+ENCODERS = ("indent", "compact", "orjson")
+
+
+def encode_docs_json(docs_data, encoder="indent"):
+    """
+    Serialise docs.json to UTF-8 bytes.
+    "indent" matches the historical json.dump(..., ensure_ascii=False, indent=4)
+    output byte for byte; "compact" drops all whitespace; "orjson" uses orjson
+    with two-space indentation when it is installed (falling back to the
+    standard library with the same layout otherwise).
+    """
+    if encoder == "indent":
+        text = json.dumps(docs_data, ensure_ascii=False, indent=4)
+    elif encoder == "compact":
+        text = json.dumps(docs_data, ensure_ascii=False, separators=(",", ":"))
+    elif encoder == "orjson":
+        if orjson is not None:
+            return orjson.dumps(docs_data, option=orjson.OPT_INDENT_2)
+        text = json.dumps(docs_data, ensure_ascii=False, indent=2)
+    else:
+        raise ValueError(f"Unknown encoder '{encoder}', expected one of {ENCODERS}")
+    return text.encode("utf-8")
+
+
+def write_docs_json(path, docs_data, encoder="indent"):
+    """
+    Write docs.json only if its serialised content changed.
+    The new content is rendered to a buffer and compared with the file on disk
+    (size first, then bytes); an unchanged file is not touched, so watchers and
+    git see nothing. Otherwise the buffer goes to a temporary file in the same
+    directory which then replaces the original atomically via os.replace.
+    Returns True if the file was written. Raises OSError on failure.
+    """
+    data = encode_docs_json(docs_data, encoder)
+    try:
+        current = os.stat(path)
+    except FileNotFoundError:
+        current = None
+
+    if current is not None and current.st_size == len(data):
+        with open(path, "rb") as f:
+            if f.read() == data:
+                return False
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file 0600; keep the original (or default) mode.
+        if current is not None:
+            mode = current.st_mode & 0o7777
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    return True
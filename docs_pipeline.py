@@ -0,0 +1,132 @@
+import argparse
+import os
+
+import fix_ref
+import instrument
+import letsgo
+import migrate_front_matter
+import page_corpus
+import rename
+from docs_nav import ENCODERS
+
+# Runs several docs pipeline steps in one process, in this order:
+#   rename    rename.py        PWXY filenames for plugin_dev_zh (+ inbound link migration)
+#   migrate   migrate_front_matter.py   a front-matter migration over every plugin_dev_<lang>
+#   link-fix  fix_ref.py       language suffixes on internal links
+#   nav-sync  letsgo.py        docs.json navigation for every language
+# e.g. python docs_pipeline.py --stages migrate link-fix nav-sync --timings -
+#
+# Every module is imported once (and yaml with it), the directory listings of
+# scanner.py are shared, and all stages report into one Instrumentation, so
+# --timings gives one summary for the whole run. migrate and link-fix work on
+# one page_corpus.Corpus loaded after the rename: every header is read and
+# parsed once, and the pages either stage changed are written by a single
+# flush before nav-sync. Each stage's wall time is
+# recorded under its name (rename, migrate, link_fix, nav_sync). Stages that
+# report per-file errors (e.g. unparsable front matter) do not stop the run,
+# but make it exit with 1; only an aborted rename does, as the later stages
+# expect the renamed tree.
+
+# --- Configuration ---
+STAGES = ("rename", "migrate", "link-fix", "nav-sync")
+DEFAULT_MIGRATION = "summary-to-description"
+
+
+# --- Stages ---
+
+
+def run_rename(args, instr, corpus):
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    renames = rename.rename_docs(instr, jobs=jobs, use_cache=not args.no_cache)
+    return renames is not None
+
+
+def run_migrate(args, instr, corpus):
+    operations = migrate_front_matter.validate_operations(migrate_front_matter.MIGRATIONS[args.migration])
+    counts = migrate_front_matter.migrate_corpus(corpus, operations, verbose=False, instr=instr)
+    instr.info(
+        f"Migration '{args.migration}': checked {counts['checked']}, modified {counts['modified']}, "
+        f"unchanged {counts['unchanged']}, skipped {counts['skipped']}, errors {counts['errors']}"
+    )
+    return not counts["errors"]
+
+
+def run_link_fix(args, instr, corpus):
+    checked, skipped, updated, errors = fix_ref.fix_links_in_corpus(corpus, force=args.force, instr=instr)
+    instr.info(
+        f"Links: {checked} files checked, {skipped} unchanged since last run, "
+        f"{updated} updated, {errors} errors."
+    )
+    return not errors
+
+
+def run_nav_sync(args, instr, corpus):
+    return letsgo.update_navigation(letsgo.LANGUAGE_CONFIGS, args, instr) == 0
+
+
+# Stages that transform the shared corpus instead of the files directly
+CORPUS_STAGES = ("migrate", "link-fix")
+STAGE_FUNCTIONS = {
+    "rename": run_rename,
+    "migrate": run_migrate,
+    "link-fix": run_link_fix,
+    "nav-sync": run_nav_sync,
+}
+
+
+def run_stages(stages, args, instr):
+    """Run the given stages in pipeline order. Returns the exit code."""
+    failed = []
+    corpus = None
+    selected = [name for name in STAGES if name in stages]
+    last_corpus_stage = max((selected.index(name) for name in CORPUS_STAGES if name in selected), default=None)
+    for position, name in enumerate(selected):
+        if name in CORPUS_STAGES and corpus is None:
+            with instr.stage("load"):
+                corpus = page_corpus.Corpus(fix_ref.find_docs_dirs(), instr=instr)
+            instr.info(f"Loaded {len(corpus)} pages.")
+        instr.info(f"\n=== {name} ===")
+        with instr.stage(name.replace("-", "_")):
+            ok = STAGE_FUNCTIONS[name](args, instr, corpus)
+        instr.flush()
+        if not ok:
+            failed.append(name)
+            if name == "rename":
+                instr.error("[Error] Rename aborted; later stages skipped.")
+                break
+        if position == last_corpus_stage:
+            with instr.stage("flush"):
+                written, errors = corpus.flush()
+            instr.info(f"\nWrote {written} changed pages.")
+            if errors:
+                failed.append("flush")
+    if failed:
+        instr.error(f"\nStages with errors: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+# --- Main Logic ---
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the docs pipeline stages in one process.")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES), metavar="STAGE",
+                        help=f"Stages to run, always in pipeline order (default: {' '.join(STAGES)})")
+    parser.add_argument("--jobs", "-j", type=int, default=1, metavar="N",
+                        help="rename: worker processes (0 = one per CPU)")
+    parser.add_argument("--no-cache", action="store_true", help="rename: ignore the content-hash cache")
+    parser.add_argument("--migration", choices=sorted(migrate_front_matter.MIGRATIONS), default=DEFAULT_MIGRATION,
+                        help="migrate: built-in migration to apply (default: %(default)s)")
+    parser.add_argument("--force", action="store_true", help="link-fix: read every file, ignoring the manifest")
+    parser.add_argument("--rebuild", action="store_true", help="nav-sync: regenerate tabs instead of appending")
+    parser.add_argument("--encoder", choices=ENCODERS, default="indent", help="nav-sync: docs.json layout")
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    with instrument.session("docs_pipeline", args) as instr:
+        return run_stages(args.stages, args, instr)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,353 @@
+import argparse
+import bisect
+import json
+import os
+import re
+import shutil
+
+import byte_scan
+import instrument
+import mdx_tokens
+import scanner
+
+# Adds the language suffix to internal doc links in every plugin_dev_<lang>
+# folder, e.g. [x](/plugin_dev_zh/0111-foo) -> [x](/plugin_dev_zh/0111-foo.zh).
+# Generalises fix_zh_ref.py: one compiled pattern covers every language prefix,
+# and a stat manifest lets files untouched since the last run be skipped unread.
+# Large files are scanned memory-mapped (byte_scan.py): only the regions around
+# link markers are decoded, and the rewritten file is assembled from the mapped
+# bytes plus the rewritten regions. Only prose is rewritten (mdx_tokens.py):
+# links inside front matter, fenced code samples and JSX tags are left as written.
+
+# --- Path Setup ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# --- Configuration ---
+DOCS_DIR_PATTERN = re.compile(r"^plugin_dev_([a-z]+)$")
+MANIFEST_PATH = os.path.join(BASE_DIR, ".fix_ref_manifest.json")
+MANIFEST_VERSION = 1
+LINK_MARKER = "](/plugin_dev_"
+LINK_MARKER_BYTES = LINK_MARKER.encode()
+# [text](/plugin_dev_<lang>/target) -> text (1), target (2), lang (3)
+LINK_PATTERN = re.compile(r"\[([^\]]+)\]\((/plugin_dev_([a-z]+)/[^\)\s]+)\)")
+
+
+# --- Helper Functions ---
+
+
+def fix_target(link_target, lang):
+    """Return link_target with the .<lang> suffix added, or None if it already has one."""
+    path, sep, fragment = link_target.partition("#")
+    suffix = f".{lang}"
+    if path.endswith(suffix) or path.endswith(f"{suffix}.mdx"):
+        return None
+    if path.endswith(".mdx"):
+        path = path[: -len(".mdx")] + f"{suffix}.mdx"
+    else:
+        path = path + suffix
+    return f"{path}{sep}{fragment}"
+
+
+def _fix_link(match):
+    new_target = fix_target(match.group(2), match.group(3))
+    if new_target is None:
+        return match.group(0)
+    return f"[{match.group(1)}]({new_target})"
+
+
+def _rewrite_span(text):
+    return LINK_PATTERN.sub(_fix_link, text) if LINK_MARKER in text else text
+
+
+def rewrite_links(content, front_matter=True):
+    """
+    Rewrite every internal link in the prose of content in one pass.
+    front_matter=False for a page body whose header was split off.
+    Returns (new_content, changed).
+    """
+    if LINK_MARKER not in content:
+        return content, False
+    return mdx_tokens.rewrite_prose(content, _rewrite_span, front_matter)
+
+
+def link_regions(buf):
+    """
+    Sorted, non-overlapping (start, end) byte ranges of buf that hold every
+    LINK_PATTERN match in prose: from just after the ']' preceding a marker
+    (the link text cannot contain one) to the ')' closing its target, or the
+    line end, clipped to the prose region holding the marker.
+    """
+    positions = byte_scan.find_all(buf, LINK_MARKER_BYTES)
+    if not positions:
+        return []
+    spans = mdx_tokens.prose_spans(buf)
+    span_starts = [span_start for span_start, _ in spans]
+    regions = []
+    for position in positions:
+        index = bisect.bisect_right(span_starts, position) - 1
+        if index < 0 or position >= spans[index][1]:
+            continue  # front matter, code or JSX
+        span_start, span_end = spans[index]
+        start = max(buf.rfind(b"]", 0, position) + 1, span_start)
+        stops = [
+            stop
+            for stop in (buf.find(b")", position, span_end), buf.find(b"\n", position, span_end))
+            if stop != -1
+        ]
+        end = min(stops) + 1 if stops else span_end
+        if regions and start < regions[-1][1]:
+            regions[-1] = (regions[-1][0], max(end, regions[-1][1]))
+        else:
+            regions.append((start, end))
+    return regions
+
+
+def write_text(filepath, content):
+    """
+    Replace filepath with content through a temporary file and os.replace.
+    Writing in place would also change every hard link to the page, such as
+    the copy rename.py links into its archive. Newlines are written as they
+    are in content (read it with newline="" to keep CRLF pages CRLF).
+    """
+    tmp_path = f"{filepath}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        shutil.copymode(filepath, tmp_path)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def rewrite_links_mapped(filepath):
+    """
+    rewrite_links for a memory-mapped file: only the link regions are decoded,
+    and the file is replaced only if one of them changed. Line endings and all
+    other bytes are kept as they are. Returns True if the file was rewritten.
+    """
+    with byte_scan.mapped(filepath) as buf:
+        replacements = []  # (start, end, new bytes)
+        for start, end in link_regions(buf):
+            region = buf[start:end].decode("utf-8")
+            new_region = _rewrite_span(region)
+            if new_region != region:
+                replacements.append((start, end, new_region.encode("utf-8")))
+        if not replacements:
+            return False
+
+        tmp_path = f"{filepath}.tmp"
+        try:
+            with memoryview(buf) as view, open(tmp_path, "wb") as f:
+                last = 0
+                for start, end, new_region in replacements:
+                    f.write(view[last:start])
+                    f.write(new_region)
+                    last = end
+                f.write(view[last:])
+            shutil.copymode(filepath, tmp_path)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+    return True
+
+
+def find_docs_dirs(base_dir=BASE_DIR):
+    """All plugin_dev_<lang> folders (timestamped archives are excluded)."""
+    return [
+        os.path.join(base_dir, name)
+        for name in sorted(os.listdir(base_dir))
+        if DOCS_DIR_PATTERN.match(name) and os.path.isdir(os.path.join(base_dir, name))
+    ]
+
+
+def load_manifest(manifest_path):
+    if not manifest_path or not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest.get("files", {})
+
+
+def save_manifest(manifest_path, files, instr):
+    tmp_path = f"{manifest_path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "files": files}, f)
+        os.replace(tmp_path, manifest_path)
+    except OSError as e:
+        instr.warning(f"Warning: Could not write manifest '{manifest_path}': {e}")
+
+
+# --- Main Processing Function ---
+
+
+def fix_links_in_dirs(folders, manifest_path=MANIFEST_PATH, force=False, scan_mode="auto", instr=None):
+    """
+    Rewrites links in every .mdx file of the given folders.
+    Files whose (size, mtime) match the manifest were already clean after the
+    previous run and are not read; force=True reads them anyway (the manifest
+    is still refreshed). manifest_path=None disables the manifest entirely.
+    scan_mode (byte_scan.SCAN_MODES) picks text reads, memory-mapped scans, or
+    mapped scans for files of at least byte_scan.MMAP_MIN_SIZE ('auto').
+    Output and per-stage timings go through instr (instrument.Instrumentation).
+    Returns (checked, skipped_unchanged, updated, errors).
+    """
+    instr = instr or instrument.Instrumentation("fix_ref")
+    old_manifest = load_manifest(manifest_path)
+    # Keep entries of folders outside this run (e.g. fix_zh_ref.py only does zh).
+    prefixes = tuple(
+        os.path.relpath(folder, BASE_DIR).replace(os.sep, "/") + "/" for folder in folders
+    )
+    new_manifest = {
+        key: value for key, value in old_manifest.items() if not key.startswith(prefixes)
+    }
+    if force:
+        old_manifest = {}
+    checked = skipped = updated = errors = 0
+
+    for folder in folders:
+        instr.info(f"Processing files in folder: {folder}")
+        with instr.stage("scan"):
+            entries = [entry for entry in scanner.scan(folder, fresh=True) if entry.name.endswith(".mdx")]
+        for entry in entries:
+            filepath = entry.path
+            key = os.path.relpath(filepath, BASE_DIR).replace(os.sep, "/")
+            try:
+                signature = [entry.size, entry.mtime_ns]
+                if old_manifest.get(key) == signature:
+                    new_manifest[key] = signature
+                    skipped += 1
+                    continue
+
+                checked += 1
+                if byte_scan.use_mmap(scan_mode, entry.size):
+                    with instr.stage("mapped", 1):
+                        changed = rewrite_links_mapped(filepath)
+                    if changed:
+                        file_stat = os.stat(filepath)
+                else:
+                    with instr.stage("read", 1):
+                        # newline="": keep CRLF, as the mapped path does
+                        with open(filepath, "r", encoding="utf-8", newline="") as f:
+                            content = f.read()
+
+                    with instr.stage("compute", 1):
+                        new_content, changed = rewrite_links(content)
+                    if changed:
+                        with instr.stage("write", 1):
+                            write_text(filepath, new_content)
+                            file_stat = os.stat(filepath)
+                if changed:
+                    instr.info(f"  File updated: {filepath}")
+                    updated += 1
+                    signature = [file_stat.st_size, file_stat.st_mtime_ns]
+                new_manifest[key] = signature
+            except Exception as e:
+                instr.error(f"Error processing file {filepath}: {e}")
+                errors += 1
+
+    if manifest_path:
+        save_manifest(manifest_path, new_manifest, instr)
+    for name, value in (("checked", checked), ("skipped", skipped), ("updated", updated), ("errors", errors)):
+        instr.count(name, value)
+    instr.flush()
+    return checked, skipped, updated, errors
+
+
+def fix_links_in_corpus(corpus, manifest_path=MANIFEST_PATH, force=False, instr=None):
+    """
+    fix_links_in_dirs for the pages of a page_corpus.Corpus. Rewritten pages are
+    only marked dirty; the manifest is saved once corpus.flush() has written
+    them, with the file stats after the flush.
+    Returns (checked, skipped_unchanged, updated, errors).
+    """
+    instr = instr or instrument.Instrumentation("fix_ref")
+    old_manifest = {} if force else load_manifest(manifest_path)
+    clean = []
+    checked = skipped = updated = errors = 0
+
+    for page in corpus:
+        if old_manifest.get(page.key) == [page.size, page.mtime_ns] and not page.dirty:
+            clean.append(page)
+            skipped += 1
+            continue
+        checked += 1
+        try:
+            with instr.stage("read", 1):
+                body = page.body
+            with instr.stage("compute", 1):
+                new_body, changed = rewrite_links(body, front_matter=False)
+            if changed:
+                page.set_body(new_body)
+                instr.info(f"  File updated: {page.path}")
+                updated += 1
+            clean.append(page)
+        except (OSError, UnicodeDecodeError) as e:
+            instr.error(f"Error processing file {page.path}: {e}")
+            errors += 1
+
+    def record_manifest(corpus):
+        manifest = {key: value for key, value in load_manifest(manifest_path).items() if key not in corpus.pages}
+        for page in clean:
+            if not page.dirty:  # not written if the flush failed for it
+                manifest[page.key] = [page.size, page.mtime_ns]
+        save_manifest(manifest_path, manifest, instr)
+
+    if manifest_path:
+        corpus.after_flush(record_manifest)
+    for name, value in (("checked", checked), ("skipped", skipped), ("updated", updated), ("errors", errors)):
+        instr.count(name, value)
+    instr.flush()
+    return checked, skipped, updated, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Add language suffixes to /plugin_dev_<lang>/ links in MDX files."
+    )
+    parser.add_argument(
+        "folders",
+        nargs="*",
+        help="Folders to process (default: every plugin_dev_<lang> folder)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help=f"Read every file, ignoring {os.path.basename(MANIFEST_PATH)}",
+    )
+    parser.add_argument(
+        "--scan",
+        choices=byte_scan.SCAN_MODES,
+        default="auto",
+        help=f"Read files as text, memory-map them, or map files of at least {byte_scan.MMAP_MIN_SIZE} bytes (default: auto)",
+    )
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    folders = args.folders or find_docs_dirs()
+    with instrument.session("fix_ref", args) as instr:
+        checked, skipped, updated, errors = fix_links_in_dirs(
+            folders, force=args.force, scan_mode=args.scan, instr=instr
+        )
+        instr.info(
+            f"Finished: {checked} files checked, {skipped} unchanged since last run, "
+            f"{updated} updated, {errors} errors."
+        )
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
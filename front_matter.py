@@ -0,0 +1,234 @@
+import re
+
+import yaml
+
+# Prefer the libyaml bindings when PyYAML was built with them; the pure-Python
+# loader/dumper produce the same documents, just several times slower.
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+# --- Configuration ---
+FENCE = "---"
+_LEADING_WHITESPACE = re.compile(r"\s*")
+
+
+# --- Helper Classes ---
+
+
+class BodyView:
+    """Lazy view of the Markdown body that follows the front matter.
+
+    Holds a reference to the original file content plus the body offset, so
+    callers that only need the metadata never copy the (often large) body.
+    The stripped body string is materialised on first use and then cached.
+    """
+
+    __slots__ = ("_source", "_start", "_strip", "_text")
+
+    def __init__(self, source, start=0, strip=True):
+        self._source = source
+        self._start = start
+        self._strip = strip
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            text = self._source[self._start:] if self._start else self._source
+            self._text = text.strip() if self._strip else text
+        return self._text
+
+    def __len__(self):
+        return len(str(self))
+
+    def __eq__(self, other):
+        if isinstance(other, BodyView):
+            other = str(other)
+        return str(self) == other
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __repr__(self):
+        return f"BodyView(start={self._start}, length={len(self._source) - self._start})"
+
+    @property
+    def start(self):
+        """Offset of the body inside the original content."""
+        return self._start
+
+
+# --- Helper Functions ---
+
+
+def split_front_matter(content):
+    """Locate the front matter fences with a single forward scan.
+
+    Returns (yaml_str, body_start). yaml_str is None when the content does not
+    open with a '---' fence or the closing fence is missing. Matches the same
+    documents as the historical regex r"^\\s*---\\s*$(.*?)^---\\s*$(.*)" but
+    never backtracks, so cost is linear in the size of the header.
+    """
+    start = _LEADING_WHITESPACE.match(content).end()
+    if not content.startswith(FENCE, start):
+        return None, 0
+
+    # The rest of the opening fence line must be blank.
+    eol = content.find("\n", start + len(FENCE))
+    if eol == -1 or content[start + len(FENCE):eol].strip():
+        return None, 0
+
+    # Jump between candidate '\n---' positions instead of visiting every line.
+    search_from = eol
+    while True:
+        candidate = content.find("\n" + FENCE, search_from)
+        if candidate == -1:
+            return None, 0
+        fence_start = candidate + 1
+        fence_eol = content.find("\n", fence_start + len(FENCE))
+        line_end = len(content) if fence_eol == -1 else fence_eol
+        if not content[fence_start + len(FENCE):line_end].strip():
+            yaml_str = content[eol + 1:fence_start].strip()
+            return yaml_str, line_end
+        search_from = fence_start
+
+
+def load_yaml(yaml_str):
+    """yaml.safe_load using the libyaml loader when available."""
+    return yaml.load(yaml_str, Loader=SafeLoader)
+
+
+def dump_yaml(data):
+    """Dump front matter the way the pipeline scripts always have."""
+    return yaml.dump(
+        data,
+        Dumper=SafeDumper,
+        allow_unicode=True,
+        default_flow_style=False,
+        sort_keys=False,
+    )
+
+
+def extract_front_matter(content, errors=None):
+    """Extracts YAML front matter and Markdown content.
+
+    Returns (front_matter, body). front_matter is {} when there is no header
+    and None when the header is not valid YAML. body is a BodyView; use
+    str(body) (or an f-string) to get the stripped Markdown text.
+    Parse errors are printed, or appended to `errors` when a list is given.
+    """
+    yaml_str, body_start = split_front_matter(content)
+    if yaml_str is None:
+        return {}, BodyView(content, strip=False)
+
+    try:
+        front_matter = load_yaml(yaml_str)
+    except yaml.YAMLError as e:
+        message = f"  [Error] YAML Parsing Failed: {e}"
+        if errors is None:
+            print(message)
+        else:
+            errors.append(message)
+        return None, BodyView(content, strip=False)
+
+    body = BodyView(content, body_start)
+    if front_matter is None:
+        return {}, body
+    return (front_matter if isinstance(front_matter, dict) else {}), body
+
+
+# --- Header Editing ---
+
+
+def split_yaml_blocks(yaml_text):
+    """Split a block-mapping YAML document into its top-level entries.
+
+    Returns (prefix, blocks) where prefix holds the lines before the first key
+    (comments, blank lines) and blocks is a list of (key, key_columns, text):
+    the text of an entry runs from its key line to the next key line, so
+    comments and blank lines stay with the entry above them. Returns None for
+    anything else (flow mappings, non-string keys, several keys on a line).
+    """
+    try:
+        node = yaml.compose(yaml_text, Loader=SafeLoader)
+    except yaml.YAMLError:
+        return None
+    if node is None or not isinstance(node, yaml.MappingNode) or node.flow_style:
+        return None
+
+    lines = yaml_text.splitlines(keepends=True)
+    starts = []
+    for key_node, _ in node.value:
+        mark, end = key_node.start_mark, key_node.end_mark
+        if (
+            key_node.tag != "tag:yaml.org,2002:str"
+            or mark.column != 0
+            or end.line != mark.line
+            or (starts and mark.line <= starts[-1][2])
+        ):
+            return None
+        starts.append((key_node.value, (mark.column, end.column), mark.line))
+    if not starts:
+        return None
+
+    prefix = "".join(lines[: starts[0][2]])
+    blocks = []
+    for position, (key, columns, line) in enumerate(starts):
+        next_line = starts[position + 1][2] if position + 1 < len(starts) else len(lines)
+        text = "".join(lines[line:next_line])
+        if not text.endswith("\n"):
+            text += "\n"
+        blocks.append((key, columns, text))
+    return prefix, blocks
+
+
+def _dump_key(key):
+    """The YAML spelling of a mapping key, as dump_yaml would write it."""
+    return dump_yaml({key: 0})[: -len(": 0\n")]
+
+
+def patch_yaml(yaml_text, old_data, new_data):
+    """Rewrite a YAML header for new_data, touching only the entries that changed.
+
+    Top-level entries whose value is unchanged keep their original text
+    (quoting, line folding, comments); a key renamed without changing its value
+    keeps its value text; only new or changed entries are dumped. Entries come
+    out in new_data's order. Falls back to dump_yaml(new_data) when the header
+    is not a plain block mapping or the patched text would not load back as
+    new_data.
+    """
+    split = split_yaml_blocks(yaml_text) if isinstance(old_data, dict) else None
+    if split is None:
+        return dump_yaml(new_data)
+    prefix, blocks = split
+    old_blocks = {key: (columns, text) for key, columns, text in blocks}
+    if len(old_blocks) != len(blocks) or set(old_blocks) != set(old_data):
+        return dump_yaml(new_data)
+
+    # Keys that disappeared, by value, so a renamed key can reuse its text.
+    vanished = [key for key in old_data if key not in new_data]
+    parts = [prefix]
+    for key, value in new_data.items():
+        if key in old_data and old_data[key] == value:
+            parts.append(old_blocks[key][1])
+            continue
+        renamed_from = None
+        if key not in old_data:
+            renamed_from = next((old for old in vanished if old_data[old] == value), None)
+        if renamed_from is not None:
+            vanished.remove(renamed_from)
+            (start, end), text = old_blocks[renamed_from]
+            parts.append(f"{text[:start]}{_dump_key(key)}{text[end:]}")
+        else:
+            parts.append(dump_yaml({key: value}))
+
+    patched = "".join(parts)
+    try:
+        reloaded = load_yaml(patched)
+    except yaml.YAMLError:
+        return dump_yaml(new_data)
+    if reloaded != new_data or list(reloaded or ()) != list(new_data):
+        return dump_yaml(new_data)
+    return patched
@@ -0,0 +1,204 @@
+import contextlib
+import cProfile
+import datetime
+import io
+import json
+import os
+import pstats
+import sys
+import time
+
+# Shared timing, counting and logging surface of the docs pipeline scripts
+# (rename.py, letsgo*.py, fix_ref.py / fix_zh_ref.py, migrate_front_matter.py /
+# fix_summary_to_description.py, nav_watch.py).
+#
+#   instr = Instrumentation("rename")
+#   with instr.stage("parse", items=1): ...      accumulated wall time per stage
+#   instr.add_time("parse", seconds)             time measured elsewhere (workers)
+#   instr.count("written")                       named counters
+#   instr.warning("Processing: x", "  [Warning] ...")   levelled, buffered output
+#   instr.flush(); instr.summary()               JSON-ready dict
+#
+# Log lines are collected and written in blocks of BUFFER_LINES (and on
+# flush), so a verbose run over many files costs a handful of terminal writes
+# instead of one per line. The stream is looked up when a block is written,
+# so output redirected with contextlib.redirect_stdout stays redirected.
+#
+# Scripts expose the surface through add_arguments() and session():
+#   --log-level LEVEL   debug | info (default) | warning | error
+#   --timings PATH      write the JSON summary to PATH ('-' for stderr)
+#   --profile PATH      run under cProfile, dump pstats to PATH and print the top entries
+
+# --- Configuration ---
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40}
+DEFAULT_LEVEL = "info"
+BUFFER_LINES = 4096
+PROGRESS_INTERVAL = 0.2  # seconds between progress line updates on a terminal
+PROFILE_TOP = 25
+SUMMARY_VERSION = 1
+# Stages the scripts report, in display order (others follow in first-use order)
+STAGES = ("scan", "read", "parse", "compute", "dump", "write")
+
+
+class Instrumentation:
+    """Per-run stage timers, counters and buffered levelled output of one script."""
+
+    def __init__(self, script, level=DEFAULT_LEVEL, stream=None, buffer_lines=BUFFER_LINES):
+        if level not in LEVELS:
+            raise ValueError(f"Unknown log level '{level}' (expected one of {', '.join(LEVELS)})")
+        self.script = script
+        self.level = level
+        self.threshold = LEVELS[level]
+        self.stream = stream
+        self.buffer_lines = buffer_lines
+        self.started = time.perf_counter()
+        self.stages = {}  # name -> [seconds, calls, items]
+        self.counters = {}
+        self.logged = dict.fromkeys(LEVELS, 0)
+        self._buffer = []
+        self._last_progress = 0.0
+
+    # --- Timing ---
+
+    @contextlib.contextmanager
+    def stage(self, name, items=0):
+        """Time the enclosed block and add it to stage `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start, items)
+
+    def add_time(self, name, seconds, items=0):
+        stage = self.stages.setdefault(name, [0.0, 0, 0])
+        stage[0] += seconds
+        stage[1] += 1
+        stage[2] += items
+
+    def add_timings(self, timings):
+        """Merge a {stage: seconds} dict, e.g. measured in a worker process."""
+        for name, seconds in timings.items():
+            self.add_time(name, seconds, 1)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    # --- Output ---
+
+    def enabled(self, level):
+        return LEVELS[level] >= self.threshold
+
+    def log(self, level, *lines):
+        """Queue lines at a level; lines below the threshold are dropped (but counted)."""
+        self.logged[level] += 1
+        if LEVELS[level] < self.threshold:
+            return
+        self._buffer.extend(lines)
+        if len(self._buffer) >= self.buffer_lines:
+            self.flush()
+
+    def debug(self, *lines):
+        self.log("debug", *lines)
+
+    def info(self, *lines):
+        self.log("info", *lines)
+
+    def warning(self, *lines):
+        self.log("warning", *lines)
+
+    def error(self, *lines):
+        self.log("error", *lines)
+
+    def flush(self):
+        """Write every queued line in one call."""
+        if self._buffer:
+            stream = self.stream or sys.stdout
+            stream.write("\n".join(self._buffer) + "\n")
+            stream.flush()
+            self._buffer.clear()
+
+    def progress(self, done, total, label="files processed"):
+        """Overwrite a progress line, on a terminal only and at most every PROGRESS_INTERVAL."""
+        stream = self.stream or sys.stdout
+        if not self.enabled("info") or not stream.isatty():
+            return
+        now = time.perf_counter()
+        if done != total and now - self._last_progress < PROGRESS_INTERVAL:
+            return
+        self._last_progress = now
+        self.flush()
+        stream.write(f"Progress: {done}/{total} {label}\r")
+        stream.flush()
+
+    # --- Summary ---
+
+    def summary(self):
+        ordered = [name for name in STAGES if name in self.stages]
+        ordered += [name for name in self.stages if name not in STAGES]
+        return {
+            "version": SUMMARY_VERSION,
+            "script": self.script,
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "elapsed": round(time.perf_counter() - self.started, 6),
+            "stages": {
+                name: {
+                    "seconds": round(self.stages[name][0], 6),
+                    "calls": self.stages[name][1],
+                    "items": self.stages[name][2],
+                }
+                for name in ordered
+            },
+            "counters": dict(self.counters),
+            "log": {level: count for level, count in self.logged.items() if count},
+        }
+
+    def write_summary(self, path):
+        """Write summary() as JSON to path, or to stderr for '-'."""
+        text = json.dumps(self.summary(), ensure_ascii=False, indent=2) + "\n"
+        if path == "-":
+            sys.stderr.write(text)
+            return
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+# --- Command Line ---
+
+
+def add_arguments(parser):
+    """Add --log-level, --timings and --profile to an argparse parser."""
+    group = parser.add_argument_group("instrumentation")
+    group.add_argument("--log-level", choices=LEVELS, default=DEFAULT_LEVEL,
+                       help="Only print messages at or above this level (default: %(default)s)")
+    group.add_argument("--timings", metavar="PATH",
+                       help="Write per-stage timings and counters as JSON to PATH ('-' for stderr)")
+    group.add_argument("--profile", metavar="PATH",
+                       help="Run under cProfile, dump pstats to PATH and print the top functions")
+    return parser
+
+
+@contextlib.contextmanager
+def session(script, args):
+    """
+    Instrumentation for one script run configured from add_arguments() flags.
+    On exit the output is flushed, the profile dumped and the summary written,
+    also when the run fails.
+    """
+    instr = Instrumentation(script, level=args.log_level)
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield instr
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        instr.flush()
+        if profiler is not None:
+            profiler.dump_stats(args.profile)
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats("cumulative").print_stats(PROFILE_TOP)
+            sys.stderr.write(report.getvalue())
+            sys.stderr.write(f"Profile written to {os.path.abspath(args.profile)}\n")
+        if args.timings:
+            instr.write_summary(args.timings)
@@ -0,0 +1,265 @@
+import argparse
+import json
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import instrument
+import letsgo_en
+import letsgo_zh
+import scanner
+from docs_nav import ENCODERS, NavigationIndex, find_language_nav, write_docs_json
+
+# Syncs the docs.json navigation of every language in one run: all
+# plugin_dev_<lang> directories are scanned concurrently, every language
+# section is updated in memory, and docs.json is parsed and written once.
+# letsgo_en.py / letsgo_zh.py remain available for single-language runs.
+#
+# The incremental sync only appends new pages, so existing entries keep their
+# position. --rebuild instead regenerates each language's tabs from the scan
+# and the group map (nav_groups.json), ordered by the map's entries and then by
+# PWXY prefix; keys other than the tab/group structure are carried over.
+
+# --- Configuration ---
+DOCS_JSON_PATH = 'docs.json'
+
+# One entry per language, built from the single-language scripts' settings.
+# Adding a language means adding a letsgo_<lang>.py module (its settings and
+# docs.json code), a nav_groups.json section, and the module to the tuple below.
+LANGUAGE_CONFIGS = [
+    {
+        'language': module.LANGUAGE_CODE,
+        'docs_dir': module.DOCS_DIR,
+        'file_extension': module.FILE_EXTENSION,
+        'filename_pattern': module.FILENAME_PATTERN,
+        'group_map': module.PWX_TO_GROUP_MAP,
+        'nav_groups': module.GROUP_MAP,
+    }
+    for module in (letsgo_en, letsgo_zh)
+]
+
+
+# --- Helper Functions ---
+def get_page_path(config, filename):
+    """Get the mintlify page path from the mdx filename (remove .mdx suffix)"""
+    return os.path.join(config['docs_dir'], filename[:-len('.mdx')])
+
+
+def scan_language_dir(config):
+    """Return the sorted valid document filenames for one language, or None if its directory is missing"""
+    docs_dir = config['docs_dir']
+    if not os.path.isdir(docs_dir):
+        return None
+    pattern = config['filename_pattern']
+    extension = config['file_extension']
+    return [
+        entry.name
+        for entry in scanner.scan(docs_dir)
+        if entry.name.endswith(extension) and pattern.match(entry.name)
+    ]
+
+
+def sync_language(navigation, config, valid_files, instr=None):
+    """Apply the filesystem state of one language to its navigation section. Returns True on success."""
+    instr = instr or instrument.Instrumentation("letsgo")
+    lang = config['language']
+    target_lang_nav = find_language_nav(navigation, lang)
+    if target_lang_nav is None:
+        instr.error(f"[{lang}] Error: Could not find navigation section for language '{lang}'. Skipped.")
+        instr.flush()
+        return False
+    nav_index = NavigationIndex(target_lang_nav)
+
+    page_to_file = {get_page_path(config, filename): filename for filename in valid_files}
+    filesystem_pages = set(page_to_file)
+    new_files_paths = filesystem_pages - nav_index.pages
+    removed_files_paths = nav_index.pages - filesystem_pages
+
+    instr.info(f"[{lang}] Existing pages: {len(nav_index)}, files: {len(filesystem_pages)}, "
+               f"new: {len(new_files_paths)}, removed: {len(removed_files_paths)}")
+
+    apply_changes(nav_index, config, [page_to_file[page] for page in new_files_paths], removed_files_paths, instr)
+    return True
+
+
+def apply_changes(nav_index, config, new_files, removed_pages, instr=None):
+    """Remove removed_pages and add the new_files (filenames) to one language's navigation.
+    New pages are added in filename order, grouped by their (P, W, X) mapping."""
+    instr = instr or instrument.Instrumentation("letsgo")
+    lang = config['language']
+    if removed_pages:
+        for group_name in nav_index.remove_pages(removed_pages):
+            instr.info(f"[{lang}] Info: Group '{group_name}' is empty after cleaning, structure kept.")
+        instr.info(*(f"[{lang}]   - {page}" for page in sorted(removed_pages)))
+        instr.count("removed", len(removed_pages))
+
+    if new_files:
+        groups_to_add = defaultdict(list)
+        for filename in sorted(new_files):
+            pwxy = config['filename_pattern'].match(filename).group(1)
+            group_key = (pwxy[0], pwxy[1], pwxy[2])
+            map_result = config['group_map'].get(group_key)
+            if map_result is None:
+                instr.warning(f"[{lang}] Warning: PWX prefix {group_key} for file '{filename}' not found in group map. Skipping add.")
+                continue
+            groups_to_add[map_result].append(get_page_path(config, filename))
+
+        for (tab_name, group_name, nested_group_name), pages_to_append in groups_to_add.items():
+            for new_page in pages_to_append:
+                if nav_index.add_page(new_page, tab_name, group_name, nested_group_name):
+                    instr.info(f"[{lang}]   + {new_page}")
+                    instr.count("added")
+    instr.flush()
+
+
+def structure_attributes(lang_nav):
+    """Map (tab,), (tab, group) and (tab, group, nested) to the existing dicts of one language."""
+    existing = {}
+    for tab in lang_nav.get('tabs') or []:
+        if not isinstance(tab, dict):
+            continue
+        existing.setdefault((tab.get('tab'),), tab)
+        for group in tab.get('groups') or []:
+            if not isinstance(group, dict):
+                continue
+            existing.setdefault((tab.get('tab'), group.get('group')), group)
+            for item in group.get('pages') or []:
+                if isinstance(item, dict) and 'group' in item:
+                    existing.setdefault((tab.get('tab'), group.get('group'), item['group']), item)
+    return existing
+
+
+def rebuild_language(navigation, config, valid_files, instr=None):
+    """Regenerate the tabs of one language from valid_files and its group map. Returns True on success.
+
+    Pages are routed and ranked through the compiled group map in one pass over
+    the scan; tabs, groups and nested groups appear in the order of their first
+    entry in nav_groups.json, and containers without pages are left out.
+    Existing tab/group dicts are copied so their other keys (icons etc.) stay."""
+    instr = instr or instrument.Instrumentation("letsgo")
+    lang = config['language']
+    target_lang_nav = find_language_nav(navigation, lang)
+    if target_lang_nav is None:
+        instr.error(f"[{lang}] Error: Could not find navigation section for language '{lang}'. Skipped.")
+        instr.flush()
+        return False
+    nav_groups = config['nav_groups']
+
+    pages_by_target = defaultdict(list)
+    for filename in sorted(valid_files, key=nav_groups.sort_key):
+        target = nav_groups.route(config['filename_pattern'].match(filename).group(1))
+        if target is None:
+            instr.warning(f"[{lang}] Warning: PWX prefix {tuple(filename[:3])} for file '{filename}' not found in group map. Skipping add.")
+            continue
+        pages_by_target[target].append(get_page_path(config, filename))
+
+    existing = structure_attributes(target_lang_nav)
+    tabs = []
+    containers = {}
+    for target in nav_groups.reverse:
+        pages = pages_by_target.get(target)
+        if not pages:
+            continue
+        tab_name, group_name, nested_group_name = target
+        tab = containers.get((tab_name,))
+        if tab is None:
+            tab = containers[(tab_name,)] = {**existing.get((tab_name,), {'tab': tab_name}), 'groups': []}
+            tabs.append(tab)
+        group = containers.get((tab_name, group_name))
+        if group is None:
+            group = containers[(tab_name, group_name)] = {
+                **existing.get((tab_name, group_name), {'group': group_name}), 'pages': []
+            }
+            tab['groups'].append(group)
+        if nested_group_name is None:
+            group['pages'].extend(pages)
+            continue
+        nested = containers.get(target)
+        if nested is None:
+            nested = containers[target] = {**existing.get(target, {'group': nested_group_name}), 'pages': []}
+            group['pages'].append(nested)
+        nested['pages'].extend(pages)
+
+    dropped = [key[0] for key in existing if len(key) == 1 and key not in containers]
+    for tab_name in dropped:
+        instr.info(f"[{lang}] Info: Tab '{tab_name}' has no mapped pages and was dropped.")
+    target_lang_nav['tabs'] = tabs
+    page_count = sum(map(len, pages_by_target.values()))
+    instr.count("rebuilt", page_count)
+    instr.info(f"[{lang}] Rebuilt navigation: {page_count} pages in {len(tabs)} tabs.")
+    instr.flush()
+    return True
+
+
+# --- Main Logic ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sync docs.json navigation for all languages in one pass.")
+    parser.add_argument('--lang', action='append', dest='languages', metavar='CODE',
+                        help="Only sync the given language (repeatable). Defaults to all configured languages.")
+    parser.add_argument('--encoder', choices=ENCODERS, default='indent',
+                        help="docs.json layout: 'indent' (default, 4 spaces), 'compact', or 'orjson' (2 spaces, uses orjson if installed).")
+    parser.add_argument('--rebuild', action='store_true',
+                        help="Regenerate each language's tabs from the files and nav_groups.json instead of appending new pages.")
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    configs = LANGUAGE_CONFIGS
+    if args.languages:
+        configs = [config for config in LANGUAGE_CONFIGS if config['language'] in args.languages]
+        unknown = set(args.languages) - {config['language'] for config in configs}
+        if unknown:
+            print(f"Error: Unknown language(s): {', '.join(sorted(unknown))}")
+            return 1
+
+    with instrument.session("letsgo", args) as instr:
+        return update_navigation(configs, args, instr)
+
+
+def update_navigation(configs, args, instr):
+    """Scan, update and write docs.json for the given language configs. Returns the exit code."""
+    # 1. Scan every language directory concurrently while docs.json loads
+    with ThreadPoolExecutor(max_workers=len(configs) or 1) as executor:
+        scan_start = time.perf_counter()
+        scans = executor.map(scan_language_dir, configs)
+        try:
+            with instr.stage("read"):
+                with open(DOCS_JSON_PATH, 'r', encoding='utf-8') as f:
+                    docs_data = json.load(f)
+        except FileNotFoundError:
+            instr.error(f"Error: {DOCS_JSON_PATH} not found.")
+            return 1
+        except json.JSONDecodeError:
+            instr.error(f"Error: {DOCS_JSON_PATH} format error.")
+            return 1
+        scans = list(scans)
+        instr.add_time("scan", time.perf_counter() - scan_start, sum(len(files or ()) for files in scans))
+
+    # 2. Update every language section in memory
+    navigation = docs_data.get('navigation', {})
+    update_language = rebuild_language if args.rebuild else sync_language
+    failed = False
+    for config, valid_files in zip(configs, scans):
+        if valid_files is None:
+            instr.error(f"[{config['language']}] Error: Directory '{config['docs_dir']}' does not exist. Skipped.")
+            failed = True
+            continue
+        with instr.stage("compute", len(valid_files)):
+            if not update_language(navigation, config, valid_files, instr):
+                failed = True
+
+    # 3. Write docs.json once (atomically, and only if the content changed)
+    try:
+        with instr.stage("write"):
+            written = write_docs_json(DOCS_JSON_PATH, docs_data, encoder=args.encoder)
+        if written:
+            instr.info(f"Successfully updated {DOCS_JSON_PATH}")
+        else:
+            instr.info(f"No changes; {DOCS_JSON_PATH} left untouched.")
+    except IOError:
+        instr.error(f"Error: Could not write to {DOCS_JSON_PATH}")
+        return 1
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
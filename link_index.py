@@ -0,0 +1,322 @@
+import argparse
+import bisect
+import json
+import os
+import re
+import sys
+from collections import defaultdict
+
+import byte_scan
+import mdx_tokens
+import scanner
+from fix_ref import write_text
+from letsgo import LANGUAGE_CONFIGS
+
+# Cross-reference index of the internal links between plugin_dev_<lang> pages.
+# One streaming pass records every outgoing /plugin_dev_<lang>/... link and
+# resolves it against the page paths letsgo*.py publish in docs.json, which
+# gives a broken-link validator, "who links here" lookups and inbound link
+# rewriting after a page is renamed, all without rescanning files per query.
+# Large pages are scanned memory-mapped (byte_scan.py), decoding only the
+# lines that hold a link marker. Only links in prose count (mdx_tokens.py):
+# paths in front matter, fenced code samples and JSX tags are not references.
+
+# --- Path Setup ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# --- Configuration ---
+LINK_MARKER = "](/plugin_dev_"
+LINK_MARKER_BYTES = LINK_MARKER.encode()
+# Markdown link whose target is an absolute docs path: group 1 is the target
+# without the leading slash, e.g. plugin_dev_en/0111-foo.en.mdx#anchor
+LINK_PATTERN = re.compile(r"\]\(/(plugin_dev_[a-z]+/[^\)\s#]+)(#[^\)\s]*)?\)")
+# Any page-path-like token, wherever it appears (links, docs.json strings...).
+PAGE_TOKEN_PATTERN = re.compile(r"(?<![\w/])plugin_dev_[a-z]+/[^\s\)\]\"'#<>]+")
+
+
+# --- Helper Functions ---
+
+
+def page_key(link_path):
+    """Normalise a link path (no leading slash, no fragment) to a page path."""
+    if link_path.endswith(".mdx"):
+        link_path = link_path[: -len(".mdx")]
+    return link_path.rstrip("/")
+
+
+def replace_page_paths(text, renames):
+    """
+    Replace every occurrence of the old page paths in renames with the new ones
+    in a single left-to-right pass. Each page-path-like token is looked up in
+    the dict, so the cost is linear in len(text) however many pages were
+    renamed (the effect of an Aho-Corasick automaton over all old paths,
+    without building one). A trailing .mdx on a token is preserved.
+    Returns (new_text, replacement_count).
+    """
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        token = match.group(0)
+        suffix = ".mdx" if token.endswith(".mdx") else ""
+        new_page = renames.get(token[: len(token) - len(suffix)])
+        if new_page is None:
+            return token
+        count += 1
+        return f"{new_page}{suffix}"
+
+    if not renames or "plugin_dev_" not in text:
+        return text, 0
+    return PAGE_TOKEN_PATTERN.sub(replace, text), count
+
+
+def iter_links(lines):
+    """Yield (line_no, target, page) for every internal link in an iterable of lines."""
+    return iter_numbered_links(enumerate(lines, 1))
+
+
+def iter_numbered_links(numbered_lines):
+    """iter_links for (line_no, line) pairs."""
+    for line_no, line in numbered_lines:
+        if LINK_MARKER not in line:
+            continue
+        for match in LINK_PATTERN.finditer(line):
+            yield line_no, match.group(1) + (match.group(2) or ""), page_key(match.group(1))
+
+
+def iter_page_links(content):
+    """iter_links over the prose of a whole page (links in front matter, code and JSX are skipped)."""
+    if LINK_MARKER not in content:
+        return iter(())
+    return iter_numbered_links(mdx_tokens.prose_lines(content))
+
+
+def iter_links_mapped(buf):
+    """
+    iter_page_links over a bytes-like buffer (e.g. an mmap); only the prose
+    part of lines holding a marker is decoded.
+    """
+    positions = byte_scan.find_all(buf, LINK_MARKER_BYTES)
+    if not positions:
+        return
+    spans = mdx_tokens.prose_spans(buf)
+    span_starts = [start for start, _ in spans]
+    for line_no, start, end in byte_scan.line_spans(buf, positions):
+        # Only the prose parts of the line are decoded (none for a line of code)
+        for span_start, span_end in spans[max(bisect.bisect_right(span_starts, start) - 1, 0):]:
+            if span_start >= end:
+                break
+            if span_end > start:
+                line = buf[max(start, span_start):min(end, span_end)].decode("utf-8")
+                yield from iter_numbered_links([(line_no, line)])
+
+
+def published_pages(base_dir=BASE_DIR, configs=LANGUAGE_CONFIGS):
+    """
+    Map every page path letsgo*.py would publish to its file path.
+    Page paths use '/' (as in docs.json) regardless of the platform.
+    """
+    pages = {}
+    for config in configs:
+        docs_dir = os.path.join(base_dir, config["docs_dir"])
+        if not os.path.isdir(docs_dir):
+            continue
+        for entry in scanner.scan(docs_dir):
+            if entry.name.endswith(config["file_extension"]) and config[
+                "filename_pattern"
+            ].match(entry.name):
+                page = f"{config['docs_dir']}/{entry.name[:-len('.mdx')]}"
+                pages[page] = entry.path
+    return pages
+
+
+class Link:
+    __slots__ = ("source", "line", "target", "page")
+
+    def __init__(self, source, line, target, page):
+        self.source = source  # page path of the linking page
+        self.line = line  # 1-based line number in the source file
+        self.target = target  # link target as written, without leading '/'
+        self.page = page  # page path the target resolves to (may not exist)
+
+    def to_dict(self):
+        return {
+            "source": self.source,
+            "line": self.line,
+            "target": f"/{self.target}",
+            "page": self.page,
+        }
+
+
+class LinkIndex:
+    """
+    Outgoing and inbound internal links of every published page.
+
+    Built with LinkIndex.build(); queries are dict lookups over the recorded
+    links, so checking or reverse-looking-up 100k+ links never rereads files.
+    """
+
+    def __init__(self, pages, scan_mode="auto"):
+        self.pages = pages  # page path -> file path
+        self.scan_mode = scan_mode  # byte_scan.SCAN_MODES
+        self.outgoing = defaultdict(list)  # source page -> [Link]
+        self.inbound = defaultdict(list)  # target page -> [Link]
+        self.link_count = 0
+
+    @classmethod
+    def build(cls, base_dir=BASE_DIR, configs=LANGUAGE_CONFIGS, scan_mode="auto"):
+        index = cls(published_pages(base_dir, configs), scan_mode)
+        for page, filepath in index.pages.items():
+            index.scan_file(page, filepath)
+        return index
+
+    def scan_file(self, page, filepath):
+        """Record the links in the prose of one file, read as text or scanned mapped."""
+        if byte_scan.use_mmap(self.scan_mode, os.path.getsize(filepath)):
+            with byte_scan.mapped(filepath) as buf:
+                links = list(iter_links_mapped(buf))
+        else:
+            with open(filepath, "r", encoding="utf-8") as f:
+                links = list(iter_page_links(f.read()))
+        for line_no, target, target_page in links:
+            self._add(Link(page, line_no, target, target_page))
+
+    def _add(self, link):
+        self.outgoing[link.source].append(link)
+        self.inbound[link.page].append(link)
+        self.link_count += 1
+
+    def _drop_source(self, page):
+        for link in self.outgoing.pop(page, ()):
+            inbound = self.inbound[link.page]
+            inbound[:] = [other for other in inbound if other is not link]
+            if not inbound:
+                del self.inbound[link.page]
+            self.link_count -= 1
+
+    # --- Queries ---
+
+    def broken_links(self):
+        """Links whose target does not resolve to a published page."""
+        return [
+            link
+            for target, links in self.inbound.items()
+            if target not in self.pages
+            for link in links
+        ]
+
+    def links_to(self, page):
+        """Links pointing at page ("who links to this page")."""
+        return list(self.inbound.get(page_key(page.lstrip("/")), ()))
+
+    def links_from(self, page):
+        return list(self.outgoing.get(page_key(page.lstrip("/")), ()))
+
+    # --- Rewriting ---
+
+    def rewrite_targets(self, renames):
+        """
+        Point every inbound link of the renamed pages at their new paths.
+        renames maps old page path -> new page path. Only files that link to a
+        renamed page are opened; each is rewritten in one regex pass with a
+        dict lookup per link. Returns the list of files that were changed.
+        """
+        renames = {page_key(old.lstrip("/")): page_key(new.lstrip("/")) for old, new in renames.items()}
+        sources = sorted({link.source for old in renames for link in self.inbound.get(old, ())})
+
+        def replace(match):
+            link_path = match.group(1)
+            new_page = renames.get(page_key(link_path))
+            if new_page is None:
+                return match.group(0)
+            suffix = ".mdx" if link_path.endswith(".mdx") else ""
+            return f"](/{new_page}{suffix}{match.group(2) or ''})"
+
+        changed_files = []
+        for source in sources:
+            filepath = self.pages.get(source)
+            if filepath is None:
+                continue
+            # newline="": keep CRLF, write_text writes the content back as is
+            with open(filepath, "r", encoding="utf-8", newline="") as f:
+                content = f.read()
+            new_content, changed = mdx_tokens.rewrite_prose(
+                content, lambda text: LINK_PATTERN.sub(replace, text)
+            )
+            if changed:
+                write_text(filepath, new_content)
+                changed_files.append(filepath)
+            self._drop_source(source)
+            self.scan_file(source, filepath)
+        return changed_files
+
+    def rewrite_inbound(self, old_page, new_page):
+        """Rewrite the links of a single renamed page."""
+        return self.rewrite_targets({old_page: new_page})
+
+
+# --- Main Logic ---
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Index internal links between plugin_dev_<lang> pages and report broken ones."
+    )
+    parser.add_argument("--links-to", metavar="PAGE", help="List the links pointing at PAGE")
+    parser.add_argument("--links-from", metavar="PAGE", help="List the links on PAGE")
+    parser.add_argument(
+        "--rename",
+        nargs=2,
+        metavar=("OLD_PAGE", "NEW_PAGE"),
+        help="Rewrite every link to OLD_PAGE so it points at NEW_PAGE",
+    )
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument(
+        "--scan",
+        choices=byte_scan.SCAN_MODES,
+        default="auto",
+        help=f"Read pages as text, memory-map them, or map pages of at least {byte_scan.MMAP_MIN_SIZE} bytes (default: auto)",
+    )
+    args = parser.parse_args(argv)
+
+    index = LinkIndex.build(scan_mode=args.scan)
+
+    if args.rename:
+        changed = index.rewrite_inbound(*args.rename)
+        for filepath in changed:
+            print(f"  File updated: {os.path.relpath(filepath, BASE_DIR)}")
+        print(f"Updated {len(changed)} files.")
+        return 0
+
+    if args.links_to or args.links_from:
+        links = index.links_to(args.links_to) if args.links_to else index.links_from(args.links_from)
+        if args.json:
+            json.dump([link.to_dict() for link in links], sys.stdout, ensure_ascii=False, indent=2)
+            print()
+        else:
+            for link in links:
+                print(f"{link.source}:{link.line} -> /{link.target}")
+        return 0
+
+    broken = index.broken_links()
+    if args.json:
+        json.dump(
+            {
+                "pages": len(index.pages),
+                "links": index.link_count,
+                "broken": [link.to_dict() for link in broken],
+            },
+            sys.stdout,
+            ensure_ascii=False,
+            indent=2,
+        )
+        print()
+    else:
+        for link in sorted(broken, key=lambda l: (l.source, l.line)):
+            print(f"[Broken] {link.source}:{link.line} -> /{link.target}")
+        print(f"Checked {index.link_count} links across {len(index.pages)} pages: {len(broken)} broken.")
+    return 1 if broken else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,175 @@
+import re
+from typing import NamedTuple
+
+# Splits an MDX page into front matter, prose, fenced code and JSX regions in
+# one forward pass, so link rewriters and indexers (fix_ref.py, link_index.py,
+# page_index.py) only look at prose: a link inside a ```yaml sample or a JSX
+# attribute is an example, not a reference to rewrite.
+#
+#   front_matter  the leading '---' header (same rules as front_matter.split_front_matter)
+#   code          a ``` or ~~~ fence line through its closing fence (or the end of
+#                 the page if it is never closed); fences may be indented, as
+#                 they are inside list items and components
+#   jsx           the text of a tag that opens a line (<Tab title="...">, </Tab>,
+#                 <img ... />), a {/* comment */}, or an import/export block
+#                 (up to the next blank line)
+#   prose         everything else, including the children of components,
+#                 which MDX renders as Markdown
+#
+# Only lines that may open a region are visited (one regex search per region),
+# and the same compiled rules run on str and on bytes-like buffers such as an
+# mmap, so mapped scans (byte_scan.py) see the same regions as text scans.
+
+# --- Configuration ---
+KINDS = ("front_matter", "prose", "code", "jsx")
+
+FRONT_MATTER_PATTERN = r"\A\s*---[^\S\n]*\n(?:.*\n)*?---[^\S\n]*$"
+# A line that may open a code or JSX region; BOUNDARY_PATTERN finds the next
+# one after a newline (a literal prefix re can search for quickly)
+LINE_PATTERN = (
+    r"(?P<line>[ \t]*(?:(?P<fence>`{3,}|~{3,})|(?P<tag></?[A-Za-z>])|(?P<comment>\{/\*))"
+    r"|(?P<esm>(?:import|export)[ \t]))"
+)
+BOUNDARY_PATTERN = r"\n" + LINE_PATTERN
+# From '<' to the '>' closing the tag; quoted and {braced} attribute values may contain '>'
+TAG_PATTERN = r"""<(?:"[^"]*"|'[^']*'|\{(?:[^{}]|\{[^{}]*\})*\}|[^>"'{}])*>"""
+COMMENT_END_PATTERN = r"\*/\}"
+BLANK_LINE_PATTERN = r"\n[ \t]*\r?(?:\n|\Z)"
+
+
+class Region(NamedTuple):
+    kind: str
+    start: int
+    end: int
+
+
+class _Rules:
+    """The compiled patterns for one buffer type (str or bytes)."""
+
+    def __init__(self, text_type):
+        def compile_pattern(pattern, flags=0):
+            return re.compile(pattern if text_type is str else pattern.encode("ascii"), flags)
+
+        self.text_type = text_type
+        self.front_matter = compile_pattern(FRONT_MATTER_PATTERN, re.MULTILINE)
+        self.line = compile_pattern(LINE_PATTERN)
+        self.boundary = compile_pattern(BOUNDARY_PATTERN)
+        self.tag = compile_pattern(TAG_PATTERN)
+        self.comment_end = compile_pattern(COMMENT_END_PATTERN)
+        self.blank_line = compile_pattern(BLANK_LINE_PATTERN)
+        self.newline = "\n" if text_type is str else b"\n"
+        self.backtick = "`" if text_type is str else b"`"
+        self._closing = {}
+
+    def closing_fence(self, fence):
+        """Pattern of a line closing `fence`: the same character, at least as many times."""
+        key = (fence[:1], len(fence))
+        if key not in self._closing:
+            char = fence[:1] if self.text_type is str else fence[:1].decode("ascii")
+            pattern = rf"\n[ \t]*{re.escape(char)}{{{len(fence)},}}[ \t]*\r?(?=\n|\Z)"
+            self._closing[key] = re.compile(pattern if self.text_type is str else pattern.encode("ascii"))
+        return self._closing[key]
+
+    def next_boundary(self, buf, position):
+        """The next line at or after position that may open a region, or None."""
+        if position == 0:
+            match = self.line.match(buf)
+            if match:
+                return match
+        return self.boundary.search(buf, position)
+
+    def line_end(self, buf, position):
+        end = buf.find(self.newline, position)
+        return len(buf) if end == -1 else end
+
+
+_RULES = {str: _Rules(str), bytes: _Rules(bytes)}
+
+
+# --- Tokenizer ---
+
+
+def regions(buf, front_matter=True):
+    """
+    Consecutive Regions covering buf (str, or bytes-like such as an mmap) in
+    order. front_matter=False tokenizes a body whose header was already split
+    off, so a leading '---' thematic break is not taken for a header.
+    """
+    rules = _RULES[str if isinstance(buf, str) else bytes]
+    size = len(buf)
+    result = []
+    prose_start = position = 0
+    if front_matter:
+        match = rules.front_matter.match(buf)
+        if match:
+            result.append(Region("front_matter", 0, match.end()))
+            prose_start = position = match.end()
+
+    while position < size:
+        match = rules.next_boundary(buf, position)
+        if match is None:
+            break
+        if match.group("fence"):
+            fence = match.group("fence")
+            line_end = rules.line_end(buf, match.end())
+            if fence[:1] == rules.backtick and rules.backtick in buf[match.end():line_end]:
+                position = line_end  # ```inline``` code span, not a fence
+                continue
+            closing = rules.closing_fence(fence).search(buf, line_end)
+            kind, start = "code", match.start("line")
+            end = rules.line_end(buf, closing.end()) if closing else size
+        elif match.group("esm"):
+            blank = rules.blank_line.search(buf, match.end())
+            kind, start, end = "jsx", match.start("line"), blank.start() if blank else size
+        elif match.group("tag"):
+            start = match.start("tag")
+            tag = rules.tag.match(buf, start)
+            kind, end = "jsx", tag.end() if tag else rules.line_end(buf, start)
+        else:
+            start = match.start("comment")
+            comment_end = rules.comment_end.search(buf, start)
+            kind, end = "jsx", comment_end.end() if comment_end else rules.line_end(buf, start)
+
+        if start > prose_start:
+            result.append(Region("prose", prose_start, start))
+        result.append(Region(kind, start, end))
+        prose_start = position = max(end, match.end())
+
+    if prose_start < size:
+        result.append(Region("prose", prose_start, size))
+    return result
+
+
+def prose_spans(buf, front_matter=True):
+    """(start, end) offsets of the prose regions of buf."""
+    return [(region.start, region.end) for region in regions(buf, front_matter) if region.kind == "prose"]
+
+
+def prose_lines(text, front_matter=True):
+    """Yield (line_no, text) for the prose part of every line of text that has one."""
+    line_no, counted = 1, 0
+    for start, end in prose_spans(text, front_matter):
+        line_no += text.count("\n", counted, start)
+        counted = start
+        for offset, line in enumerate(text[start:end].split("\n")):
+            if line:
+                yield line_no + offset, line
+
+
+def rewrite_prose(text, rewrite, front_matter=True):
+    """
+    Apply rewrite(str) -> str to every prose region of text, leaving front
+    matter, code and JSX untouched. Returns (new_text, changed).
+    """
+    parts = []
+    changed = False
+    for region in regions(text, front_matter):
+        part = text[region.start:region.end]
+        if region.kind == "prose":
+            new_part = rewrite(part)
+            changed = changed or new_part != part
+            part = new_part
+        parts.append(part)
+    if not changed:
+        return text, False
+    return "".join(parts), True
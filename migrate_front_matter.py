@@ -0,0 +1,372 @@
+import argparse
+import copy
+import difflib
+import json
+import os
+import shutil
+import tempfile
+
+import yaml
+
+import instrument
+from front_matter import FENCE, load_yaml, patch_yaml
+
+# Applies declarative front-matter migrations to MDX files in place.
+# A migration is a list of operations, applied in order to each file's header:
+#   {"op": "rename",  "from": "summary", "to": "description"}   key keeps its position
+#   {"op": "move",    "from": "dimensions.level", "to": "level"} dotted paths
+#   {"op": "default", "path": "language", "value": "en"}         only if missing
+#   {"op": "delete",  "path": "legacy_key"}
+# rename/move take "on_conflict": "keep" (default; the existing target wins and
+# the source key is dropped), "overwrite" or "skip".
+# Only the header is read and parsed; the body is streamed to the new file
+# untouched, and files whose header would not change are not written at all.
+# Header entries the operations did not touch keep their exact text
+# (front_matter.patch_yaml), so a migration's diff shows only what it changed.
+
+# --- Path Setup ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# --- Configuration ---
+# Named migrations available through --migration.
+MIGRATIONS = {
+    "summary-to-description": [
+        {"op": "rename", "from": "summary", "to": "description"},
+    ],
+}
+OPERATIONS = ("rename", "move", "default", "delete")
+CONFLICT_POLICIES = ("keep", "overwrite", "skip")
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+# --- Operations ---
+
+
+def validate_operations(operations):
+    """Raise ValueError unless operations is a well-formed migration."""
+    if not isinstance(operations, list):
+        raise ValueError("A migration must be a list of operations")
+    for position, operation in enumerate(operations, 1):
+        if not isinstance(operation, dict) or operation.get("op") not in OPERATIONS:
+            raise ValueError(f"Operation {position}: 'op' must be one of {', '.join(OPERATIONS)}")
+        required = ("from", "to") if operation["op"] in ("rename", "move") else ("path",)
+        if operation["op"] == "default":
+            required += ("value",)
+        for key in required:
+            if key not in operation:
+                raise ValueError(f"Operation {position} ({operation['op']}): missing '{key}'")
+        if operation.get("on_conflict", "keep") not in CONFLICT_POLICIES:
+            raise ValueError(f"Operation {position}: 'on_conflict' must be one of {', '.join(CONFLICT_POLICIES)}")
+    return operations
+
+
+def _parent(data, path, create=False):
+    """Return (mapping, last key) for a dotted path, or (None, key) if a parent is missing."""
+    *parents, key = path.split(".")
+    node = data
+    for part in parents:
+        child = node.get(part)
+        if not isinstance(child, dict):
+            if not create or child is not None:
+                return None, key
+            child = node[part] = {}
+        node = child
+    return node, key
+
+
+def apply_operations(front_matter, operations):
+    """Apply operations to front_matter in place; returns a message per change."""
+    messages = []
+    for operation in operations:
+        op = operation["op"]
+        if op in ("rename", "move"):
+            source, source_key = _parent(front_matter, operation["from"])
+            if source is None or source_key not in source:
+                continue
+            target, target_key = _parent(front_matter, operation["to"], create=True)
+            if target is None:
+                messages.append(f"[Warning] Cannot {op} '{operation['from']}': '{operation['to']}' has a non-mapping parent.")
+                continue
+            policy = operation.get("on_conflict", "keep")
+            if target_key in target and not (target is source and target_key == source_key):
+                if policy == "skip":
+                    messages.append(f"[Warning] Both '{operation['from']}' and '{operation['to']}' exist. Left unchanged.")
+                    continue
+                if policy == "keep":
+                    del source[source_key]
+                    messages.append(
+                        f"[Warning] Both '{operation['from']}' and '{operation['to']}' exist. "
+                        f"Keeping '{operation['to']}', removing '{operation['from']}'."
+                    )
+                    continue
+                del target[target_key]
+            value = source.pop(source_key) if op == "move" or target is not source else None
+            if op == "rename" and target is source:
+                # Rebuild the mapping so the renamed key keeps its position.
+                items = list(source.items())
+                source.clear()
+                for key, item in items:
+                    source[target_key if key == source_key else key] = item
+            else:
+                target[target_key] = value
+            messages.append(f"[Action] {op.capitalize()} '{operation['from']}' -> '{operation['to']}'.")
+        elif op == "default":
+            target, key = _parent(front_matter, operation["path"], create=True)
+            if target is not None and key not in target:
+                target[key] = copy.deepcopy(operation["value"])
+                messages.append(f"[Action] Default '{operation['path']}' = {operation['value']!r}.")
+        elif op == "delete":
+            target, key = _parent(front_matter, operation["path"])
+            if target is not None and key in target:
+                del target[key]
+                messages.append(f"[Action] Delete '{operation['path']}'.")
+    return messages
+
+
+# --- Header I/O ---
+
+
+def read_header(f):
+    """
+    Read only the front matter of a binary file object, line by line.
+    Follows front_matter.split_front_matter: optional leading blank lines, a
+    '---' line, the YAML, and a closing '---' line. Returns the YAML text (or
+    None without a complete header) and leaves f at the start of the body.
+    """
+    fence = FENCE.encode()
+    line = f.readline()
+    while line and not line.strip():
+        line = f.readline()
+    opening = line.lstrip()
+    if not opening.startswith(fence) or opening[len(fence):].strip():
+        return None
+
+    yaml_lines = []
+    for line in iter(f.readline, b""):
+        if line.startswith(fence) and not line[len(fence):].strip():
+            return b"".join(yaml_lines).decode("utf-8")
+        yaml_lines.append(line)
+    return None
+
+
+def header_newline(header):
+    """The line ending of a raw header ('\r\n' or '\n'), taken from its first line."""
+    eol = header.find("\n")
+    return "\r\n" if eol > 0 and header[eol - 1] == "\r" else "\n"
+
+
+def render_header(yaml_text, old_front_matter, front_matter, newline="\n"):
+    """
+    The new header; entries the migration did not touch keep their original text.
+    Every line, fences and newly dumped entries included, ends with newline, so
+    a CRLF page stays CRLF throughout.
+    """
+    yaml_text = patch_yaml(yaml_text, old_front_matter, front_matter).replace("\r\n", "\n")
+    return f"{FENCE}\n{yaml_text}{FENCE}\n".replace("\n", newline)
+
+
+def migrate_file(filepath, operations, dry_run=False, instr=None):
+    """
+    Migrate one file. Returns (status, messages, diff) with status one of
+    'modified', 'unchanged', 'no_front_matter', 'yaml_error', 'not_dict'.
+    diff holds the unified header diff of a modified file (dry runs included).
+    Stage timings (read, parse, compute, dump, write) are added to instr.
+    """
+    instr = instr or instrument.Instrumentation("migrate_front_matter")
+    with open(filepath, "rb") as src:
+        with instr.stage("read", 1):
+            yaml_text = read_header(src)
+            if yaml_text is None:
+                return "no_front_matter", [], ""
+            header_end = src.tell()
+            src.seek(0)
+            old_header = src.read(header_end).decode("utf-8")
+
+        try:
+            with instr.stage("parse", 1):
+                front_matter = load_yaml(yaml_text.strip())
+        except yaml.YAMLError as e:
+            return "yaml_error", [f"[Error] YAML Parsing Failed: {e}"], ""
+        if front_matter is None:
+            front_matter = {}
+        if not isinstance(front_matter, dict):
+            return "not_dict", [f"[Skipping] Front matter is not a dictionary (type: {type(front_matter)})."], ""
+
+        with instr.stage("compute", 1):
+            original = copy.deepcopy(front_matter)
+            messages = apply_operations(front_matter, operations)
+        if front_matter == original and list(front_matter) == list(original):
+            return "unchanged", messages, ""
+
+        with instr.stage("dump", 1):
+            new_header = render_header(yaml_text, original, front_matter, header_newline(old_header))
+        if new_header == old_header:
+            return "unchanged", messages, ""
+        diff = "".join(
+            difflib.unified_diff(
+                old_header.splitlines(keepends=True),
+                new_header.splitlines(keepends=True),
+                fromfile=f"a/{os.path.relpath(filepath, BASE_DIR)}",
+                tofile=f"b/{os.path.relpath(filepath, BASE_DIR)}",
+            )
+        )
+        if dry_run:
+            return "modified", messages, diff
+
+        # New header, then the body copied through unchanged.
+        directory = os.path.dirname(os.path.abspath(filepath))
+        with instr.stage("write", 1):
+            fd, tmp_path = tempfile.mkstemp(prefix=".migrate.", suffix=".tmp", dir=directory)
+            try:
+                with os.fdopen(fd, "wb") as dst:
+                    dst.write(new_header.encode("utf-8"))
+                    shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+                shutil.copymode(filepath, tmp_path)
+                os.replace(tmp_path, filepath)
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+    return "modified", messages, diff
+
+
+def migrate_files(folders, operations, dry_run=False, verbose=True, instr=None):
+    """
+    Migrate every .mdx file under the given folders.
+    Per-file reports are info messages of instr (instrument.Instrumentation),
+    so verbose=False only leaves warnings and errors.
+    Returns a dict of counts: checked, modified, unchanged, skipped, errors.
+    """
+    instr = instr or instrument.Instrumentation("migrate_front_matter")
+    counts = dict.fromkeys(("checked", "modified", "unchanged", "skipped", "errors"), 0)
+    for folder in folders:
+        if not os.path.isdir(folder):
+            instr.error(f"[Error] Target directory not found or is not a directory: {folder}")
+            counts["errors"] += 1
+            continue
+        with instr.stage("scan"):
+            filepaths = sorted(
+                os.path.join(root, name)
+                for root, _, files in os.walk(folder)
+                for name in files
+                if name.lower().endswith(".mdx")
+            )
+        for filepath in filepaths:
+            relative_path = os.path.relpath(filepath, BASE_DIR).replace(os.sep, "/")
+            counts["checked"] += 1
+            try:
+                status, messages, diff = migrate_file(filepath, operations, dry_run=dry_run, instr=instr)
+            except (OSError, UnicodeDecodeError) as e:
+                instr.error(f"[Error] {relative_path}: {e}")
+                counts["errors"] += 1
+                continue
+            report_result(relative_path, status, messages, diff, counts, dry_run, verbose, instr)
+    for name, value in counts.items():
+        instr.count(name, value)
+    instr.flush()
+    return counts
+
+
+def report_result(relative_path, status, messages, diff, counts, dry_run, verbose, instr):
+    """Count one file's migration status and log its messages (and diff on dry runs)."""
+    if status == "modified":
+        counts["modified"] += 1
+    elif status == "unchanged":
+        counts["unchanged"] += 1
+    elif status == "yaml_error":
+        counts["errors"] += 1
+    else:
+        counts["skipped"] += 1
+
+    if messages or status in ("modified", "yaml_error"):
+        lines = [f"{relative_path}:", *(f"  {message}" for message in messages)]
+        if status == "modified":
+            lines.append("  [Success] File updated." if not dry_run else "  [Dry run] Would update file.")
+        if status == "yaml_error":
+            instr.error(*lines)
+        elif verbose:
+            instr.log("warning" if any(m.startswith("[Warning]") for m in messages) else "info", *lines)
+    if dry_run and diff:
+        instr.info(diff.rstrip("\n"))
+
+
+def migrate_page(page, operations, instr=None):
+    """
+    migrate_file for a page_corpus.Page: the new header is set on the page (and
+    written by the corpus flush). Returns (status, messages) with the same
+    statuses as migrate_file.
+    """
+    instr = instr or instrument.Instrumentation("migrate_front_matter")
+    if page.yaml_text is None:
+        return "no_front_matter", []
+    with instr.stage("parse", 1):
+        front_matter = page.front_matter
+    if front_matter is None:
+        status = "yaml_error" if page.error.startswith("[Error]") else "not_dict"
+        return status, [page.error]
+
+    with instr.stage("compute", 1):
+        new_front_matter = copy.deepcopy(front_matter)
+        messages = apply_operations(new_front_matter, operations)
+    if new_front_matter == front_matter and list(new_front_matter) == list(front_matter):
+        return "unchanged", messages
+    old_header = page.header
+    with instr.stage("dump", 1):
+        page.set_front_matter(new_front_matter)
+    return ("modified" if page.header != old_header else "unchanged"), messages
+
+
+def migrate_corpus(corpus, operations, verbose=True, instr=None):
+    """migrate_files over the pages of a page_corpus.Corpus; nothing is written until corpus.flush()."""
+    instr = instr or instrument.Instrumentation("migrate_front_matter")
+    counts = dict.fromkeys(("checked", "modified", "unchanged", "skipped", "errors"), 0)
+    for page in corpus:
+        counts["checked"] += 1
+        status, messages = migrate_page(page, operations, instr=instr)
+        report_result(page.key, status, messages, "", counts, False, verbose, instr)
+    for name, value in counts.items():
+        instr.count(name, value)
+    instr.flush()
+    return counts
+
+
+def load_operations(args):
+    if args.ops:
+        with open(args.ops, "r", encoding="utf-8") as f:
+            return validate_operations(json.load(f))
+    return validate_operations(MIGRATIONS[args.migration])
+
+
+# --- Main Logic ---
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply declarative front-matter migrations to MDX files.")
+    parser.add_argument("folders", nargs="+", help="Folders to migrate")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--migration", choices=sorted(MIGRATIONS), help="Built-in migration to apply")
+    source.add_argument("--ops", metavar="FILE", help="JSON file with a list of operations")
+    parser.add_argument("--dry-run", action="store_true", help="Print header diffs instead of writing")
+    parser.add_argument("--quiet", action="store_true", help="Only print the summary and errors")
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        operations = load_operations(args)
+    except (OSError, ValueError) as e:
+        print(f"Error: Invalid migration: {e}")
+        return 2
+
+    with instrument.session("migrate_front_matter", args) as instr:
+        counts = migrate_files(args.folders, operations, dry_run=args.dry_run, verbose=not args.quiet, instr=instr)
+        instr.info(
+            f"Checked: {counts['checked']}, {'would modify' if args.dry_run else 'modified'}: {counts['modified']}, "
+            f"unchanged: {counts['unchanged']}, skipped: {counts['skipped']}, errors: {counts['errors']}"
+        )
+    return 1 if counts["errors"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
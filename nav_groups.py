@@ -0,0 +1,71 @@
+import json
+import os
+
+# Loads the (P, W, X) -> navigation group routing of every language from
+# nav_groups.json (previously PWX_TO_GROUP_MAP literals in letsgo_en.py and
+# letsgo_zh.py). Each language's entries are compiled once into:
+#   forward  {(P, W, X): (tab_name, group_name, nested_group_name or None)}
+#   reverse  {(tab_name, group_name, nested_group_name): [PWX, ...]} in file order
+#   rank     {(P, W, X): position in the file}, the deterministic page order
+# Entry layout: {"pwx": "011", "tab": ..., "group": ..., "nested": ... or null,
+# "note": optional free text}. Entries are listed in navigation order.
+
+# --- Path Setup ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# --- Configuration ---
+NAV_GROUPS_PATH = os.path.join(BASE_DIR, "nav_groups.json")
+
+_loaded = {}  # path -> {lang: GroupMap}
+
+
+class GroupMap:
+    """Compiled routing of one language; see the module comment."""
+
+    __slots__ = ("language", "forward", "reverse", "rank")
+
+    def __init__(self, language, entries):
+        self.language = language
+        self.forward = {}
+        self.reverse = {}
+        self.rank = {}
+        for position, entry in enumerate(entries):
+            pwx = entry.get("pwx") if isinstance(entry, dict) else None
+            if not isinstance(pwx, str) or len(pwx) != 3 or not pwx.isdigit():
+                raise ValueError(f"[{language}] Entry {position + 1}: 'pwx' must be three digits")
+            if not entry.get("tab") or not entry.get("group"):
+                raise ValueError(f"[{language}] Entry {position + 1} ({pwx}): 'tab' and 'group' are required")
+            key = tuple(pwx)
+            if key in self.forward:
+                raise ValueError(f"[{language}] Duplicate entry for PWX {pwx}")
+            target = (entry["tab"], entry["group"], entry.get("nested") or None)
+            self.forward[key] = target
+            self.reverse.setdefault(target, []).append(pwx)
+            self.rank[key] = position
+
+    def route(self, pwxy):
+        """(tab, group, nested) for a 'PWXY'/'PWX' prefix or (P, W, X) key, or None."""
+        return self.forward.get(tuple(pwxy[:3]))
+
+    def sort_key(self, filename):
+        """Order pages by their group entry, then by PWXY prefix and name."""
+        return (self.rank.get(tuple(filename[:3]), len(self.rank)), filename)
+
+
+def load_group_maps(path=NAV_GROUPS_PATH):
+    """Parse and compile the data file once per path; returns {lang: GroupMap}."""
+    group_maps = _loaded.get(path)
+    if group_maps is None:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: expected an object keyed by language code")
+        group_maps = _loaded[path] = {
+            language: GroupMap(language, entries) for language, entries in data.items()
+        }
+    return group_maps
+
+
+def group_map(language, path=NAV_GROUPS_PATH):
+    """The compiled GroupMap of one language (KeyError if it has none)."""
+    return load_group_maps(path)[language]
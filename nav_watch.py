@@ -0,0 +1,356 @@
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import time
+
+import instrument
+from docs_nav import ENCODERS, NavigationIndex, find_language_nav, write_docs_json
+from letsgo import DOCS_JSON_PATH, LANGUAGE_CONFIGS, apply_changes, get_page_path, scan_language_dir, sync_language
+
+# Keeps docs.json navigation in sync with plugin_dev_<lang> while pages are
+# added, deleted or renamed (e.g. next to `mintlify dev`). docs.json and the
+# page set of every language are loaded once and kept in memory; file events
+# only move pages in or out of the in-memory navigation, and after a short
+# debounce docs.json is written once (atomically, only if it changed).
+# Events come from inotify on Linux (through ctypes, no extra dependency) and
+# otherwise from polling the directories' mtimes, which only relists a
+# directory when an entry was created, deleted or renamed in it.
+
+# --- Configuration ---
+DEFAULT_DEBOUNCE = 0.2  # seconds without events before docs.json is written
+DEFAULT_INTERVAL = 0.5  # polling period, also how often docs.json is checked
+
+# inotify(7) constants
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+# --- Event Sources ---
+# wait(timeout) returns a list of (lang, filename, exists) events; filename None
+# means the language directory must be listed again (it was replaced, or
+# events were lost).
+
+
+def stat_signature(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class PollingSource:
+    """Stat every docs directory each interval; report the ones whose mtime changed."""
+
+    name = "polling"
+
+    def __init__(self, dirs):
+        self.dirs = dirs  # lang -> directory
+        self.signatures = {lang: stat_signature(path) for lang, path in dirs.items()}
+
+    def wait(self, timeout):
+        time.sleep(timeout)
+        events = []
+        for lang, path in self.dirs.items():
+            signature = stat_signature(path)
+            if signature != self.signatures[lang]:
+                self.signatures[lang] = signature
+                events.append((lang, None, None))
+        return events
+
+    def close(self):
+        pass
+
+
+class InotifySource:
+    """inotify watches on every docs directory, read through libc with ctypes."""
+
+    name = "inotify"
+
+    def __init__(self, dirs):
+        libc_name = ctypes.util.find_library("c")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs = dirs
+        self.watches = {}  # wd -> lang
+        self.unwatched = set(dirs)  # languages whose directory is (currently) missing
+        self._rewatch()
+
+    def _rewatch(self):
+        """(Re)create the watches of missing or replaced directories; returns the languages watched anew."""
+        added = []
+        for lang in sorted(self.unwatched):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(self.dirs[lang]), WATCH_MASK)
+            if wd >= 0:
+                self.watches[wd] = lang
+                added.append(lang)
+        self.unwatched.difference_update(added)
+        return added
+
+    def wait(self, timeout):
+        events = [(lang, None, None) for lang in self._rewatch()]
+        if events:
+            return events
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return events
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return events
+
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                events.extend((lang, None, None) for lang in self.dirs)
+                continue
+            lang = self.watches.get(wd)
+            if lang is None:
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                # Directory deleted or renamed away (rename.py archives it).
+                del self.watches[wd]
+                if not mask & IN_IGNORED:
+                    self.libc.inotify_rm_watch(self.fd, wd)
+                self.unwatched.add(lang)
+                events.append((lang, None, None))
+            elif not mask & IN_ISDIR:
+                events.append((lang, name, bool(mask & (IN_CREATE | IN_MOVED_TO))))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+def open_event_source(dirs, polling=False):
+    if not polling:
+        try:
+            return InotifySource(dirs)
+        except (OSError, AttributeError, TypeError):
+            pass
+    return PollingSource(dirs)
+
+
+# --- Watcher ---
+
+
+class NavWatcher:
+    """
+    In-memory docs.json plus the page set of every language.
+    Events update the page sets; flush() applies the difference with what the
+    navigation already holds and writes docs.json once.
+    """
+
+    def __init__(self, configs, docs_json_path=DOCS_JSON_PATH, encoder='indent', instr=None):
+        self.instr = instr or instrument.Instrumentation("nav_watch")
+        self.configs = {config['language']: config for config in configs}
+        self.docs_json_path = docs_json_path
+        self.encoder = encoder
+        self.files = {}  # lang -> set of valid filenames on disk
+        self.applied = {}  # lang -> set of filenames the navigation reflects
+        self.indexes = {}  # lang -> NavigationIndex
+        self.unsynced = set()  # languages whose directory appeared after the last load
+        self.docs_data = None
+        self.docs_signature = None
+
+    def is_page_file(self, lang, filename):
+        config = self.configs[lang]
+        return filename.endswith(config['file_extension']) and bool(config['filename_pattern'].match(filename))
+
+    def rescan(self, lang):
+        """
+        List one language directory again. While it is missing (e.g. between
+        the two renames of rename.py's swap) its page set is left as it was,
+        so its pages are not dropped from the navigation. Returns False then.
+        """
+        valid_files = scan_language_dir(self.configs[lang])
+        if valid_files is None:
+            self.instr.warning(
+                f"[{lang}] Warning: Directory '{self.configs[lang]['docs_dir']}' does not exist. Pages left as they were."
+            )
+            return False
+        self.files[lang] = set(valid_files)
+        return True
+
+    def sync(self, lang):
+        """Fully sync one language's navigation against its page set and index it."""
+        navigation = self.docs_data.get('navigation', {})
+        if not sync_language(navigation, self.configs[lang], sorted(self.files[lang]), self.instr):
+            self.indexes.pop(lang, None)
+            return
+        self.indexes[lang] = NavigationIndex(find_language_nav(navigation, lang))
+        self.applied[lang] = set(self.files[lang])
+
+    def load(self):
+        """(Re)load docs.json and fully sync every language against the page sets."""
+        with open(self.docs_json_path, 'r', encoding='utf-8') as f:
+            self.docs_data = json.load(f)
+        self.unsynced.clear()
+        for lang in self.configs:
+            if lang not in self.files and not self.rescan(lang):
+                self.indexes.pop(lang, None)  # synced by flush() once the directory appears
+                continue
+            self.sync(lang)
+        self.write()
+
+    def handle(self, events):
+        for lang, filename, exists in events:
+            if filename is None:
+                if self.rescan(lang) and lang not in self.indexes:
+                    self.unsynced.add(lang)
+            elif lang in self.files and self.is_page_file(lang, filename):
+                if exists:
+                    self.files[lang].add(filename)
+                else:
+                    self.files[lang].discard(filename)
+
+    def pending(self):
+        return bool(self.unsynced) or any(self.files[lang] != self.applied[lang] for lang in self.indexes)
+
+    def flush(self):
+        """
+        Fully sync languages whose directory appeared since the last load, then
+        apply the add/remove deltas of the others; returns True if docs.json was written.
+        """
+        for lang in sorted(self.unsynced):
+            self.sync(lang)
+        self.unsynced.clear()
+        for lang, nav_index in self.indexes.items():
+            config = self.configs[lang]
+            added = self.files[lang] - self.applied[lang]
+            removed = self.applied[lang] - self.files[lang]
+            if not added and not removed:
+                continue
+            self.instr.info(f"[{lang}] +{len(added)} -{len(removed)} pages")
+            apply_changes(
+                nav_index, config, added, {get_page_path(config, filename) for filename in removed}, self.instr
+            )
+            self.applied[lang] = set(self.files[lang])
+        return self.write()
+
+    def write(self):
+        with self.instr.stage("write"):
+            written = write_docs_json(self.docs_json_path, self.docs_data, encoder=self.encoder)
+        self.docs_signature = stat_signature(self.docs_json_path)
+        return written
+
+    def docs_json_changed(self):
+        """True if docs.json was modified by someone else since it was last read or written."""
+        return stat_signature(self.docs_json_path) != self.docs_signature
+
+
+def watch(watcher, source, debounce=DEFAULT_DEBOUNCE, interval=DEFAULT_INTERVAL, max_events=None):
+    """
+    Event loop; returns after max_events flushes (None: run until interrupted).
+    Messages and the time of each flush go through watcher.instr, whose output
+    is written out after every event batch, reload and flush.
+    """
+    instr = watcher.instr
+    flushes = 0
+    last_event = None
+    while max_events is None or flushes < max_events:
+        timeout = interval if last_event is None else max(0.0, last_event + debounce - time.monotonic())
+        events = source.wait(timeout)
+        if events:
+            watcher.handle(events)
+            instr.flush()
+            last_event = time.monotonic()
+            continue
+
+        if watcher.docs_json_changed():
+            instr.info(f"{watcher.docs_json_path} changed on disk, reloading.")
+            try:
+                with instr.stage("reload"):
+                    watcher.load()
+            except (OSError, json.JSONDecodeError) as e:
+                instr.error(f"Error: Could not reload {watcher.docs_json_path}: {e}")
+                watcher.docs_signature = stat_signature(watcher.docs_json_path)
+            instr.flush()
+
+        if last_event is not None and time.monotonic() - last_event >= debounce:
+            last_event = None
+            if watcher.pending():
+                start = time.perf_counter()
+                written = watcher.flush()
+                elapsed = time.perf_counter() - start
+                instr.add_time("flush", elapsed, 1)
+                flushes += 1
+                if written:
+                    instr.info(f"Updated {watcher.docs_json_path} in {elapsed * 1000:.1f} ms")
+                else:
+                    instr.info(f"No changes; {watcher.docs_json_path} left untouched.")
+                instr.flush()
+
+
+# --- Main Logic ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch plugin_dev_<lang> and keep docs.json navigation in sync.")
+    parser.add_argument('--lang', action='append', dest='languages', metavar='CODE',
+                        help="Only watch the given language (repeatable). Defaults to all configured languages.")
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                        help=f"Seconds to wait for further events before writing (default {DEFAULT_DEBOUNCE}).")
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help=f"Polling period in seconds (default {DEFAULT_INTERVAL}).")
+    parser.add_argument('--poll', action='store_true', help="Poll directory mtimes even where inotify is available.")
+    parser.add_argument('--encoder', choices=ENCODERS, default='indent', help="docs.json layout, as in letsgo.py.")
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    configs = LANGUAGE_CONFIGS
+    if args.languages:
+        configs = [config for config in LANGUAGE_CONFIGS if config['language'] in args.languages]
+        unknown = set(args.languages) - {config['language'] for config in configs}
+        if unknown:
+            print(f"Error: Unknown language(s): {', '.join(sorted(unknown))}")
+            return 1
+
+    with instrument.session("nav_watch", args) as instr:
+        watcher = NavWatcher(configs, encoder=args.encoder, instr=instr)
+        source = open_event_source({config['language']: config['docs_dir'] for config in configs}, polling=args.poll)
+        try:
+            with instr.stage("load"):
+                watcher.load()
+        except FileNotFoundError:
+            instr.error(f"Error: {DOCS_JSON_PATH} not found.")
+            source.close()
+            return 1
+        except json.JSONDecodeError:
+            instr.error(f"Error: {DOCS_JSON_PATH} format error.")
+            source.close()
+            return 1
+
+        instr.info(f"Watching {', '.join(config['docs_dir'] for config in configs)} ({source.name}); Ctrl+C to stop.")
+        instr.flush()
+        try:
+            watch(watcher, source, debounce=args.debounce, interval=args.interval)
+        except KeyboardInterrupt:
+            instr.info("", "Stopped.")
+        finally:
+            source.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
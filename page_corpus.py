@@ -0,0 +1,217 @@
+import io
+import os
+import shutil
+import tempfile
+
+import yaml
+
+import instrument
+import scanner
+from front_matter import load_yaml
+from migrate_front_matter import COPY_BUFFER_SIZE, header_newline, read_header, render_header
+
+# In-memory model of the plugin_dev_<lang> pages shared by the stages of
+# docs_pipeline.py, so a run reads and parses every page once:
+#
+#   corpus = Corpus(fix_ref.find_docs_dirs(), instr=instr)
+#   for page in corpus:
+#       front_matter = page.front_matter          parsed on first use, then kept
+#       page.set_front_matter(new_front_matter)   header re-rendered, page dirty
+#       page.set_body(page.body.replace(a, b))    page dirty
+#   corpus.flush()                                writes the dirty pages only
+#
+# Loading reads only each page's header (raw text up to and including the
+# closing '---' line). Bodies are not kept: page.body reads the bytes after the
+# header from disk on each access, so memory grows with the pages a stage
+# actually rewrites, not with the corpus. A flush writes the new header and
+# either the new body or the original body copied through from disk, and
+# refuses pages whose size/mtime changed since they were loaded.
+
+# --- Path Setup ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+# --- Helper Classes ---
+
+
+class Page:
+    """One MDX file: its raw header, lazily parsed front matter and on-disk body."""
+
+    __slots__ = (
+        "path", "key", "size", "mtime_ns", "header", "yaml_text", "body_offset",
+        "_front_matter", "_error", "_body", "dirty",
+    )
+
+    def __init__(self, path, key, size, mtime_ns):
+        self.path = path
+        self.key = key  # path relative to the corpus base, '/'-separated
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.dirty = False
+        self._body = None  # replacement body (bytes) once set_body was called
+        self._reset_front_matter()
+        with open(path, "rb") as f:
+            yaml_text = read_header(f)
+            self.body_offset = f.tell() if yaml_text is not None else 0
+            f.seek(0)
+            self.header = f.read(self.body_offset).decode("utf-8")
+        self.yaml_text = yaml_text  # None when the page has no complete header
+
+    def _reset_front_matter(self):
+        self._front_matter = None
+        self._error = None
+
+    def _parse(self):
+        if self._front_matter is not None or self._error is not None:
+            return
+        if self.yaml_text is None:
+            self._front_matter = {}
+            return
+        try:
+            front_matter = load_yaml(self.yaml_text.strip())
+        except yaml.YAMLError as e:
+            self._error = f"[Error] YAML Parsing Failed: {e}"
+            return
+        if front_matter is None:
+            front_matter = {}
+        if not isinstance(front_matter, dict):
+            self._error = f"[Skipping] Front matter is not a dictionary (type: {type(front_matter)})."
+            return
+        self._front_matter = front_matter
+
+    @property
+    def front_matter(self):
+        """The parsed header ({} without one), or None if it is not a valid YAML mapping (see error)."""
+        self._parse()
+        return self._front_matter
+
+    @property
+    def error(self):
+        """Why front_matter is None, or None."""
+        self._parse()
+        return self._error
+
+    def set_front_matter(self, front_matter):
+        """Replace the front matter; entries that did not change keep their header text."""
+        old_front_matter = self.front_matter
+        if old_front_matter is None or self.yaml_text is None:
+            raise ValueError(f"{self.key}: no front matter to update")
+        self.set_header(render_header(self.yaml_text, old_front_matter, front_matter, header_newline(self.header)))
+
+    def set_header(self, header):
+        """Replace the raw header text (fences included)."""
+        if header == self.header:
+            return
+        self.header = header
+        self.yaml_text = read_header(io.BytesIO(header.encode("utf-8")))
+        self._reset_front_matter()
+        self.dirty = True
+
+    def body_bytes(self):
+        """The body as bytes: the replacement if one was set, else read from disk."""
+        if self._body is not None:
+            return self._body
+        with open(self.path, "rb") as f:
+            f.seek(self.body_offset)
+            return f.read()
+
+    @property
+    def body(self):
+        return self.body_bytes().decode("utf-8")
+
+    def set_body(self, body):
+        """Replace the body (str or bytes)."""
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if body == self.body_bytes():
+            return
+        self._body = body
+        self.dirty = True
+
+    def write(self):
+        """Write header and body to a temporary file that then replaces the page."""
+        file_stat = os.stat(self.path)
+        if (file_stat.st_size, file_stat.st_mtime_ns) != (self.size, self.mtime_ns):
+            raise OSError("changed on disk since it was loaded; not written")
+        header = self.header.encode("utf-8")
+        fd, tmp_path = tempfile.mkstemp(prefix=".corpus.", suffix=".tmp", dir=os.path.dirname(self.path))
+        try:
+            with os.fdopen(fd, "wb") as dst:
+                dst.write(header)
+                if self._body is not None:
+                    dst.write(self._body)
+                else:
+                    with open(self.path, "rb") as src:
+                        src.seek(self.body_offset)
+                        shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+            shutil.copymode(self.path, tmp_path)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        file_stat = os.stat(self.path)
+        self.size, self.mtime_ns = file_stat.st_size, file_stat.st_mtime_ns
+        self.body_offset = len(header)
+        self._body = None
+        self.dirty = False
+
+    def __repr__(self):
+        return f"Page({self.key!r}{', dirty' if self.dirty else ''})"
+
+
+class Corpus:
+    """The .mdx pages of some folders, loaded once and written back with one flush()."""
+
+    def __init__(self, folders, base_dir=BASE_DIR, instr=None):
+        self.instr = instr or instrument.Instrumentation("page_corpus")
+        self.base_dir = base_dir
+        self.pages = {}  # key -> Page, in folder then name order
+        self._after_flush = []
+        for folder in folders:
+            with self.instr.stage("scan"):
+                entries = [entry for entry in scanner.scan(folder, fresh=True) if entry.name.endswith(".mdx")]
+            for entry in entries:
+                key = os.path.relpath(entry.path, base_dir).replace(os.sep, "/")
+                try:
+                    with self.instr.stage("read", 1):
+                        self.pages[key] = Page(entry.path, key, entry.size, entry.mtime_ns)
+                except (OSError, UnicodeDecodeError) as e:
+                    self.instr.error(f"[Error] {key}: {e}")
+                    self.instr.count("load_errors")
+
+    def __iter__(self):
+        return iter(self.pages.values())
+
+    def __len__(self):
+        return len(self.pages)
+
+    def get(self, key):
+        return self.pages.get(key)
+
+    def dirty_pages(self):
+        return [page for page in self if page.dirty]
+
+    def after_flush(self, callback):
+        """Call callback(corpus) after the next flush, e.g. to record the new file stats."""
+        self._after_flush.append(callback)
+
+    def flush(self):
+        """Write every dirty page. Returns (written, errors)."""
+        written = errors = 0
+        for page in self.dirty_pages():
+            try:
+                with self.instr.stage("write", 1):
+                    page.write()
+                written += 1
+            except OSError as e:
+                self.instr.error(f"[Error] {page.key}: {e}")
+                errors += 1
+        callbacks, self._after_flush = self._after_flush, []
+        for callback in callbacks:
+            callback(self)
+        self.instr.count("written", written)
+        self.instr.flush()
+        return written, errors
@@ -0,0 +1,351 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+
+import scanner
+from fix_ref import DOCS_DIR_PATTERN, find_docs_dirs
+from front_matter import extract_front_matter
+from link_index import iter_page_links
+from rename import cache_fingerprint, compute_target_name, decode_source, hash_bytes
+
+# Persistent front-matter metadata index of every plugin_dev_<lang> page.
+# Each page's dimensions, standard_title, language, title, description, the
+# PWXY prefix rename.py would compute, its body length/hash and outgoing links
+# are stored in a SQLite file. A refresh only re-parses files whose size/mtime
+# changed and whose content hash differs, so queries across the corpus (e.g.
+# "advanced implementation pages without a zh translation") need no YAML
+# parsing at all. The pwxy column is re-derived from the stored front matter
+# when the naming rules change (rename.cache_fingerprint, kept in meta).
+
+# --- Path Setup ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# --- Configuration ---
+INDEX_PATH = os.path.join(BASE_DIR, ".page_index.sqlite")
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS pages (
+    path TEXT PRIMARY KEY,          -- file path relative to BASE_DIR, '/' separated
+    dir_lang TEXT NOT NULL,         -- <lang> of the plugin_dev_<lang> folder
+    filename TEXT NOT NULL,
+    page TEXT NOT NULL,             -- docs.json page path (path without .mdx)
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha1 TEXT NOT NULL,
+    status TEXT NOT NULL,           -- ok | yaml_error
+    primary_type TEXT,
+    detail TEXT,
+    level TEXT,
+    standard_title TEXT,
+    language TEXT,
+    title TEXT,
+    description TEXT,
+    pwxy TEXT,                      -- prefix rename.py computes from dimensions
+    body_length INTEGER,
+    body_sha1 TEXT,                 -- hash of the stripped body (front matter excluded)
+    front_matter TEXT               -- full front matter as JSON
+);
+CREATE INDEX IF NOT EXISTS pages_standard_title ON pages (standard_title, language);
+CREATE TABLE IF NOT EXISTS links (
+    source TEXT NOT NULL REFERENCES pages (path) ON DELETE CASCADE,
+    line INTEGER NOT NULL,
+    target TEXT NOT NULL,           -- as written, without the leading '/'
+    page TEXT NOT NULL              -- page path the target resolves to
+);
+CREATE INDEX IF NOT EXISTS links_source ON links (source);
+CREATE INDEX IF NOT EXISTS links_page ON links (page);
+"""
+
+PAGE_COLUMNS = (
+    "path", "dir_lang", "filename", "page", "size", "mtime_ns", "sha1", "status",
+    "primary_type", "detail", "level", "standard_title", "language", "title",
+    "description", "pwxy", "body_length", "body_sha1", "front_matter",
+)
+
+
+# --- Helper Functions ---
+
+
+def scalar(value):
+    """Front-matter values as stored in a column (None stays NULL)."""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return str(value)
+
+
+def page_pwxy(front_matter, filename):
+    """The prefix rename.py would give the page, or None if it cannot form one."""
+    try:
+        return compute_target_name(front_matter, filename)[0]
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+
+def describe_page(relative_path, dir_lang, filename, content):
+    """Parse one page into a pages row (dict) and its links."""
+    errors = []
+    front_matter, body = extract_front_matter(content, errors)
+    row = dict.fromkeys(PAGE_COLUMNS)
+    row.update(
+        path=relative_path,
+        dir_lang=dir_lang,
+        filename=filename,
+        page=relative_path[: -len(".mdx")],
+        status="ok" if front_matter is not None else "yaml_error",
+    )
+    if front_matter is not None:
+        dimensions = front_matter.get("dimensions")
+        dimensions = dimensions if isinstance(dimensions, dict) else {}
+        type_info = dimensions.get("type")
+        type_info = type_info if isinstance(type_info, dict) else {}
+        row.update(
+            primary_type=scalar(type_info.get("primary")),
+            detail=scalar(type_info.get("detail")),
+            level=scalar(dimensions.get("level")),
+            standard_title=scalar(front_matter.get("standard_title")),
+            language=scalar(front_matter.get("language")),
+            title=scalar(front_matter.get("title")),
+            description=scalar(front_matter.get("description")),
+            pwxy=page_pwxy(front_matter, filename),
+            body_length=len(body),
+            body_sha1=hash_bytes(str(body).encode("utf-8")),
+            front_matter=json.dumps(front_matter, ensure_ascii=False, default=str),
+        )
+    links = [
+        (relative_path, line_no, target, page)
+        for line_no, target, page in iter_page_links(content)
+    ]
+    return row, links
+
+
+# --- Index ---
+
+
+class PageIndex:
+    """
+    SQLite-backed metadata of every page; refresh() brings it up to date.
+    Rows are plain sqlite3.Row objects, so callers can use row["level"] etc.
+    """
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA foreign_keys = ON")
+        version = self._schema_version()
+        if version is not None and version != SCHEMA_VERSION:
+            self.db.executescript("DROP TABLE IF EXISTS links; DROP TABLE IF EXISTS pages; DROP TABLE IF EXISTS meta;")
+        self.db.executescript(SCHEMA)
+        self.db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),)
+        )
+        self.db.commit()
+
+    def _schema_version(self):
+        try:
+            row = self.db.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return int(row[0]) if row else None
+
+    def _refresh_pwxy(self):
+        """Re-derive every stored pwxy if the naming rules changed since they were computed."""
+        fingerprint = cache_fingerprint()
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'pwxy_fingerprint'").fetchone()
+        if row and row[0] == fingerprint:
+            return
+        if row:
+            print("Naming rules changed since the index was built; re-deriving pwxy.", file=sys.stderr)
+        self.db.executemany(
+            "UPDATE pages SET pwxy = ? WHERE path = ?",
+            [
+                (page_pwxy(json.loads(page["front_matter"]), page["filename"]), page["path"])
+                for page in self.db.execute("SELECT path, filename, front_matter FROM pages WHERE status = 'ok'")
+            ],
+        )
+        self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('pwxy_fingerprint', ?)", (fingerprint,))
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def refresh(self, folders=None, force=False):
+        """
+        Re-index every .mdx file of the given plugin_dev_<lang> folders (default:
+        all of them). Files are only read when their size/mtime changed, and only
+        re-parsed when their content hash changed too; rows of files that no
+        longer exist or can no longer be decoded are dropped.
+        Returns (parsed, unchanged, removed).
+        """
+        folders = find_docs_dirs(BASE_DIR) if folders is None else folders
+        known = {
+            row["path"]: row
+            for row in self.db.execute("SELECT path, size, mtime_ns, sha1 FROM pages")
+        }
+        seen = set()
+        parsed = unchanged = 0
+
+        with self.db:
+            self._refresh_pwxy()
+            for folder in folders:
+                dir_match = DOCS_DIR_PATTERN.match(os.path.basename(os.path.normpath(folder)))
+                if not dir_match or not os.path.isdir(folder):
+                    print(f"[Skipping] Not a plugin_dev_<lang> folder: {folder}")
+                    continue
+                dir_lang = dir_match.group(1)
+                for entry in scanner.scan(folder, fresh=True):
+                    if not entry.name.endswith(".mdx"):
+                        continue
+                    relative_path = os.path.relpath(entry.path, BASE_DIR).replace(os.sep, "/")
+                    seen.add(relative_path)
+                    old = known.get(relative_path)
+                    if (
+                        not force
+                        and old is not None
+                        and old["size"] == entry.size
+                        and old["mtime_ns"] == entry.mtime_ns
+                    ):
+                        unchanged += 1
+                        continue
+
+                    with open(entry.path, "rb") as f:
+                        raw = f.read()
+                    sha1 = hash_bytes(raw)
+                    if not force and old is not None and old["sha1"] == sha1:
+                        # Touched but identical: only the stat signature moves.
+                        self.db.execute(
+                            "UPDATE pages SET size = ?, mtime_ns = ? WHERE path = ?",
+                            (entry.size, entry.mtime_ns, relative_path),
+                        )
+                        unchanged += 1
+                        continue
+
+                    try:
+                        content = decode_source(raw)
+                    except UnicodeDecodeError as e:
+                        print(f"[Error] Cannot decode {relative_path}: {e}")
+                        self.db.execute("DELETE FROM pages WHERE path = ?", (relative_path,))
+                        continue
+                    row, links = describe_page(relative_path, dir_lang, entry.name, content)
+                    row.update(size=entry.size, mtime_ns=entry.mtime_ns, sha1=sha1)
+                    self._store(row, links)
+                    parsed += 1
+
+            scanned_prefixes = tuple(
+                os.path.relpath(folder, BASE_DIR).replace(os.sep, "/") + "/" for folder in folders
+            )
+            removed = [
+                path for path in known if path not in seen and path.startswith(scanned_prefixes)
+            ]
+            self.db.executemany("DELETE FROM pages WHERE path = ?", ((path,) for path in removed))
+        return parsed, unchanged, len(removed)
+
+    def _store(self, row, links):
+        self.db.execute("DELETE FROM pages WHERE path = ?", (row["path"],))
+        self.db.execute(
+            f"INSERT INTO pages ({', '.join(PAGE_COLUMNS)}) VALUES ({', '.join('?' * len(PAGE_COLUMNS))})",
+            [row[column] for column in PAGE_COLUMNS],
+        )
+        self.db.executemany("INSERT INTO links (source, line, target, page) VALUES (?, ?, ?, ?)", links)
+
+    # --- Queries ---
+
+    def query(self, sql, params=()):
+        return self.db.execute(sql, params).fetchall()
+
+    def pages(self, lang=None, primary=None, detail=None, level=None, missing_in=None):
+        """
+        Pages matching every given filter (lang is the folder language).
+        missing_in=LANG keeps only pages with no page of the same
+        standard_title in plugin_dev_<LANG>.
+        """
+        conditions = []
+        params = []
+        for column, value in (
+            ("p.dir_lang", lang),
+            ("p.primary_type", primary),
+            ("p.detail", detail),
+            ("p.level", level),
+        ):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if missing_in is not None:
+            conditions.append(
+                "NOT EXISTS (SELECT 1 FROM pages t WHERE t.dir_lang = ? AND t.standard_title = p.standard_title)"
+            )
+            params.append(missing_in)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return self.query(f"SELECT p.* FROM pages p {where} ORDER BY p.path", params)
+
+    def links_from(self, path):
+        return self.query("SELECT * FROM links WHERE source = ? ORDER BY line", (path,))
+
+    def links_to(self, page):
+        return self.query("SELECT * FROM links WHERE page = ? ORDER BY source, line", (page.lstrip("/"),))
+
+
+# --- Main Logic ---
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Maintain and query the SQLite front-matter index of plugin_dev_<lang> pages."
+    )
+    parser.add_argument("--index", default=INDEX_PATH, help="Index file (default: %(default)s)")
+    parser.add_argument("--rebuild", action="store_true", help="Re-parse every file")
+    parser.add_argument("--lang", help="Only pages of plugin_dev_<LANG>")
+    parser.add_argument("--primary", help="dimensions.type.primary")
+    parser.add_argument("--detail", help="dimensions.type.detail")
+    parser.add_argument("--level", help="dimensions.level")
+    parser.add_argument("--missing-in", metavar="LANG", help="Only pages without a LANG page of the same standard_title")
+    parser.add_argument("--sql", help="Run an arbitrary SELECT against the pages/links tables instead")
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON")
+    args = parser.parse_args(argv)
+
+    with PageIndex(args.index) as index:
+        parsed, unchanged, removed = index.refresh(force=args.rebuild)
+        print(f"Index: {parsed} parsed, {unchanged} unchanged, {removed} removed.", file=sys.stderr)
+
+        if args.sql:
+            try:
+                rows = index.query(args.sql)
+            except sqlite3.Error as e:
+                print(f"Error: {e}")
+                return 1
+        else:
+            rows = index.pages(
+                lang=args.lang,
+                primary=args.primary,
+                detail=args.detail,
+                level=args.level,
+                missing_in=args.missing_in,
+            )
+
+        if args.json:
+            json.dump([dict(row) for row in rows], sys.stdout, ensure_ascii=False, indent=2)
+            print()
+        elif args.sql:
+            for row in rows:
+                print("\t".join("" if value is None else str(value) for value in row))
+        else:
+            for row in rows:
+                print(f"{row['path']}\t{row['pwxy'] or '----'}\t{row['standard_title'] or ''}")
+            print(f"{len(rows)} pages.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,12 +1,22 @@
 import os
 
+import scanner
+
 folder = "plugin_dev_zh"
-for filename in os.listdir(folder):
-    if filename.endswith(".md"):
-        old_path = os.path.join(folder, filename)
-        new_filename = filename[:-3] + ".mdx"
-        new_path = os.path.join(folder, new_filename)
-
-        # 重命名文件
-        os.rename(old_path, new_path)
-        print(f"Renamed '{old_path}' to '{new_path}'")
\ No newline at end of file
+
+
+def main():
+    for entry in scanner.scan(folder, use_cache=False):
+        filename = entry.name
+        if filename.endswith(".md"):
+            old_path = os.path.join(folder, filename)
+            new_filename = filename[:-3] + ".mdx"
+            new_path = os.path.join(folder, new_filename)
+
+            # 重命名文件
+            os.rename(old_path, new_path)
+            print(f"Renamed '{old_path}' to '{new_path}'")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
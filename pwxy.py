@@ -0,0 +1,290 @@
+import argparse
+import hashlib
+import itertools
+import os
+import re
+import sys
+from typing import NamedTuple
+
+# Single source of truth for the PWXY filename prefix (see about_dimensions.md).
+# Every (primary, detail, level) combination of known values - each of them
+# possibly missing - is classified once at import into CLASSIFICATION_TABLE, so
+# classifying a page is one dict lookup. Values outside the maps take the slow
+# path, which is also what builds the table. rename.py names files from it
+# (classify, one page at a time), the letsgo*.py group maps in nav_groups.json
+# are checked against it (--check; letsgo routes through nav_groups.py), and
+# the table section of about_dimensions.md is generated from it.
+
+# --- Path Setup ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# --- Mapping Configuration ---
+PRIMARY_TYPE_MAP = {
+    "conceptual": 1,
+    "implementation": 2,
+    "operational": 3,
+    "reference": 4,
+}
+DEFAULT_W = 0
+DETAIL_TYPE_MAPS = {
+    "conceptual": {"introduction": 1, "principles": 2, "architecture": 3},
+    "implementation": {"basic": 1, "standard": 2, "high": 3, "advanced": 4},
+    "operational": {"setup": 1, "deployment": 2, "maintenance": 3},
+    "reference": {"core": 1, "configuration": 2, "examples": 3},
+}
+DEFAULT_X = 0
+LEVEL_MAP = {
+    "beginner": 1,
+    "intermediate": 2,
+    "advanced": 3,
+}
+DEFAULT_Y = 0
+PRIORITY_NORMAL = 0
+PRIORITY_HIGH = 9
+PRIORITY_ADVANCED_LEVEL_KEY = "advanced"
+PRIORITY_IMPLEMENTATION_PRIMARY_KEY = "implementation"
+PRIORITY_IMPLEMENTATION_DETAIL_KEYS = {"high", "advanced"}
+
+# Warning codes, in the order rename.py reports them.
+MISSING_PRIMARY = "missing_primary"
+UNMAPPED_PRIMARY = "unmapped_primary"
+MISSING_DETAIL = "missing_detail"
+UNMAPPED_DETAIL = "unmapped_detail"
+NO_DETAIL_MAP = "no_detail_map"
+MISSING_LEVEL = "missing_level"
+UNMAPPED_LEVEL = "unmapped_level"
+
+DOCS_PATH = os.path.join(BASE_DIR, "about_dimensions.md")
+DOCS_TABLE_START = "<!-- PWXY-TABLE:START -->"
+DOCS_TABLE_END = "<!-- PWXY-TABLE:END -->"
+
+
+class Classification(NamedTuple):
+    prefix: str  # four digits, e.g. "0211"
+    warnings: tuple  # warning codes
+
+
+# --- Classification ---
+
+
+def _compute(primary, detail, level):
+    """Classify one combination from the mappings (the uncached path)."""
+    P = PRIORITY_NORMAL
+    if level == PRIORITY_ADVANCED_LEVEL_KEY:
+        P = PRIORITY_HIGH
+    if primary == PRIORITY_IMPLEMENTATION_PRIMARY_KEY and detail in PRIORITY_IMPLEMENTATION_DETAIL_KEYS:
+        P = PRIORITY_HIGH
+
+    W = PRIMARY_TYPE_MAP.get(primary, DEFAULT_W)
+    X = DETAIL_TYPE_MAPS.get(primary, {}).get(detail, DEFAULT_X)
+    Y = LEVEL_MAP.get(level, DEFAULT_Y)
+
+    warnings = []
+    if primary is None:
+        warnings.append(MISSING_PRIMARY)
+    elif W == DEFAULT_W:
+        warnings.append(UNMAPPED_PRIMARY)
+    if detail is None:
+        warnings.append(MISSING_DETAIL)
+    elif X == DEFAULT_X and primary in DETAIL_TYPE_MAPS:
+        warnings.append(UNMAPPED_DETAIL)
+    elif primary not in DETAIL_TYPE_MAPS and primary is not None:
+        warnings.append(NO_DETAIL_MAP)
+    if level is None:
+        warnings.append(MISSING_LEVEL)
+    elif Y == DEFAULT_Y:
+        warnings.append(UNMAPPED_LEVEL)
+
+    try:
+        prefix = f"{int(f'{P}{W}{X}{Y}'):04d}"
+    except ValueError:
+        raise ValueError(
+            f"  [Error] Could not form numeric prefix from P={P}, W={W}, X={X}, Y={Y}. Using '0000'."
+        )
+    return Classification(prefix, tuple(warnings))
+
+
+def _build_table():
+    details = sorted({detail for details in DETAIL_TYPE_MAPS.values() for detail in details})
+    return {
+        combination: _compute(*combination)
+        for combination in itertools.product(
+            [None, *PRIMARY_TYPE_MAP], [None, *details], [None, *LEVEL_MAP]
+        )
+    }
+
+
+CLASSIFICATION_TABLE = _build_table()
+
+
+def table_fingerprint():
+    """
+    sha1 of the mappings and CLASSIFICATION_TABLE. Caches of derived prefixes
+    (rename.py, page_index.py) store it and are re-derived when it changes.
+    """
+    rules = (
+        PRIMARY_TYPE_MAP, DEFAULT_W, DETAIL_TYPE_MAPS, DEFAULT_X, LEVEL_MAP, DEFAULT_Y,
+        PRIORITY_NORMAL, PRIORITY_HIGH, PRIORITY_ADVANCED_LEVEL_KEY,
+        PRIORITY_IMPLEMENTATION_PRIMARY_KEY, sorted(PRIORITY_IMPLEMENTATION_DETAIL_KEYS),
+        sorted(CLASSIFICATION_TABLE.items(), key=repr),
+    )
+    return hashlib.sha1(repr(rules).encode("utf-8")).hexdigest()
+
+
+def classify(primary, detail, level):
+    """Classification for one (primary, detail, level); raises ValueError as rename.py reports it."""
+    classification = CLASSIFICATION_TABLE.get((primary, detail, level))
+    if classification is None:
+        classification = _compute(primary, detail, level)
+    return classification
+
+
+def dimension_values(front_matter):
+    """(primary, detail, level) from a front-matter dict, as rename.py reads them."""
+    dimensions = front_matter.get("dimensions", {})
+    type_info = dimensions.get("type", {})
+    return type_info.get("primary"), type_info.get("detail"), dimensions.get("level")
+
+
+def classify_many(records):
+    """
+    Classify a batch of front-matter dicts in one call (benchmarks/run_pipeline.py).
+    Returns a list with a Classification per record, or the exception it
+    raised (ValueError, or AttributeError/TypeError for malformed dimensions),
+    so one bad page does not abort the batch. Each distinct combination is
+    computed at most once.
+    """
+    results = []
+    computed = {}
+    for record in records:
+        try:
+            combination = dimension_values(record)
+            classification = CLASSIFICATION_TABLE.get(combination) or computed.get(combination)
+            if classification is None:
+                classification = computed[combination] = _compute(*combination)
+        except (ValueError, AttributeError, TypeError) as e:
+            classification = e
+        results.append(classification)
+    return results
+
+
+def warning_message(code, primary, detail, level):
+    """The report line rename.py prints for a warning code."""
+    if code == MISSING_PRIMARY:
+        return "  [Warning] Missing dimensions.type.primary"
+    if code == UNMAPPED_PRIMARY:
+        return f"  [Warning] Unmapped primary type: '{primary}'. Using W={DEFAULT_W}"
+    if code == MISSING_DETAIL:
+        return "  [Warning] Missing dimensions.type.detail"
+    if code == UNMAPPED_DETAIL:
+        return f"  [Warning] Unmapped detail type: '{detail}' for primary '{primary}'. Using X={DEFAULT_X}"
+    if code == NO_DETAIL_MAP:
+        return f"  [Warning] No detail map defined for primary type: '{primary}'. Using X={DEFAULT_X}"
+    if code == MISSING_LEVEL:
+        return "  [Warning] Missing dimensions.level"
+    if code == UNMAPPED_LEVEL:
+        return f"  [Warning] Unmapped level: '{level}'. Using Y={DEFAULT_Y}"
+    raise ValueError(f"Unknown warning code '{code}'")
+
+
+# --- Group Map Validation ---
+
+
+def mapped_combinations():
+    """(primary, detail, level) -> prefix for every fully mapped combination."""
+    return {
+        (primary, detail, level): CLASSIFICATION_TABLE[(primary, detail, level)].prefix
+        for primary, details in DETAIL_TYPE_MAPS.items()
+        for detail in details
+        for level in LEVEL_MAP
+    }
+
+
+def validate_group_map(group_map):
+    """
+    Compare a letsgo (P, W, X) group map with the prefixes the table produces.
+    Returns (unrouted, unreachable): PWX keys pages can get but the map lacks,
+    and map keys no fully mapped page can ever get.
+    """
+    reachable = {tuple(prefix[:3]) for prefix in mapped_combinations().values()}
+    return sorted(reachable - set(group_map)), sorted(set(group_map) - reachable)
+
+
+# --- about_dimensions.md Table ---
+
+
+def render_docs_table():
+    """Markdown table of every mapped (primary, detail) with its prefix per level."""
+    levels = list(LEVEL_MAP)
+    lines = [
+        f"| primary | detail | {' | '.join(levels)} |",
+        f"| --- | --- | {' | '.join('---' for _ in levels)} |",
+    ]
+    for primary, details in DETAIL_TYPE_MAPS.items():
+        for detail in details:
+            prefixes = " | ".join(
+                f"`{CLASSIFICATION_TABLE[(primary, detail, level)].prefix}`" for level in levels
+            )
+            lines.append(f"| {primary} | {detail} | {prefixes} |")
+    return "\n".join(lines) + "\n"
+
+
+def update_docs_table(docs_path=DOCS_PATH):
+    """Replace the generated section of about_dimensions.md. Returns True if it changed."""
+    with open(docs_path, "r", encoding="utf-8") as f:
+        content = f.read()
+    pattern = re.compile(f"{re.escape(DOCS_TABLE_START)}\n.*?{re.escape(DOCS_TABLE_END)}", re.DOTALL)
+    if not pattern.search(content):
+        raise ValueError(f"Markers {DOCS_TABLE_START} / {DOCS_TABLE_END} not found in {docs_path}")
+    new_content = pattern.sub(
+        lambda _: f"{DOCS_TABLE_START}\n{render_docs_table()}{DOCS_TABLE_END}", content
+    )
+    if new_content == content:
+        return False
+    with open(docs_path, "w", encoding="utf-8") as f:
+        f.write(new_content)
+    return True
+
+
+# --- Main Logic ---
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect and validate the PWXY classification table.")
+    parser.add_argument("--table", action="store_true", help="Print the prefix table as Markdown")
+    parser.add_argument("--update-docs", action="store_true", help="Regenerate the table in about_dimensions.md")
+    parser.add_argument("--check", action="store_true",
+                        help="Validate the letsgo group maps and that about_dimensions.md is up to date")
+    parser.add_argument("--strict", action="store_true",
+                        help="With --check, also fail on PWX keys that can be produced but have no group")
+    args = parser.parse_args(argv)
+
+    if args.table:
+        sys.stdout.write(render_docs_table())
+    if args.update_docs:
+        changed = update_docs_table()
+        print(f"{'Updated' if changed else 'No changes to'} {os.path.relpath(DOCS_PATH, BASE_DIR)}")
+    if args.check or not (args.table or args.update_docs):
+        from letsgo import LANGUAGE_CONFIGS
+
+        failed = False
+        for config in LANGUAGE_CONFIGS:
+            unrouted, unreachable = validate_group_map(config["group_map"])
+            # Pages with an unrouted PWX are skipped by letsgo with a warning;
+            # routing one is a navigation decision, so it only fails --strict.
+            for key in unrouted:
+                level = "Warning" if args.strict else "Info"
+                print(f"[{config['language']}] {level}: PWX {''.join(key)} can be produced but has no group.")
+                failed = failed or args.strict
+            for key in unreachable:
+                print(f"[{config['language']}] Info: PWX {''.join(key)} is mapped but no page can get it.")
+        with open(DOCS_PATH, "r", encoding="utf-8") as f:
+            if f"{DOCS_TABLE_START}\n{render_docs_table()}{DOCS_TABLE_END}" not in f.read():
+                print(f"Warning: {os.path.relpath(DOCS_PATH, BASE_DIR)} table is out of date (run with --update-docs).")
+                failed = True
+        return 1 if failed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,81 +1,66 @@
+import argparse
 import os
-import yaml
 import re
+import sys
+import json
+import shutil
+import hashlib
 import datetime
+import inspect
+import time
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import instrument
+import scanner
+from docs_nav import write_docs_json
+from front_matter import extract_front_matter, split_front_matter
+from link_index import LinkIndex, replace_page_paths
+from pwxy import classify, dimension_values, table_fingerprint, warning_message
 
 # --- Path Setup ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # --- Configuration ---
-timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-plugin_dev_zh_path = os.path.join(BASE_DIR, "plugin_dev_zh")
-if os.path.exists(plugin_dev_zh_path):
-    plugin_dev_zh_timestamp = f"plugin_dev_zh_{timestamp}"
-    os.rename(plugin_dev_zh_path, os.path.join(BASE_DIR, plugin_dev_zh_timestamp))
-    SOURCE_DIR_NAME = plugin_dev_zh_timestamp
-    TARGET_DIR_NAME = "plugin_dev_zh"
-else:
-    print(f"Warning: 'plugin_dev_zh' directory not found in {BASE_DIR}")
-    print("Creating a new 'plugin_dev_zh' directory...")
-    SOURCE_DIR_NAME = "plugin_dev_zh_empty_source"
-    TARGET_DIR_NAME = "plugin_dev_zh"
-    os.makedirs(
-        os.path.join(BASE_DIR, SOURCE_DIR_NAME), exist_ok=True
-    )
-
+TARGET_DIR_NAME = "plugin_dev_zh"
+EMPTY_SOURCE_DIR_NAME = "plugin_dev_zh_empty_source"
 ARCHIVE_PREFIX = "plugin_dev_zh_new_archive_"  # Prefix for archived directories
-
-# --- Mapping Configuration ---
-# (Mappings remain the same as the previous version)
-PRIMARY_TYPE_MAP = {
-    "conceptual": 1,
-    "implementation": 2,
-    "operational": 3,
-    "reference": 4,
-}
-DEFAULT_W = 0
-DETAIL_TYPE_MAPS = {
-    "conceptual": {"introduction": 1, "principles": 2, "architecture": 3},
-    "implementation": {"basic": 1, "standard": 2, "high": 3, "advanced": 4},
-    "operational": {"setup": 1, "deployment": 2, "maintenance": 3},
-    "reference": {"core": 1, "configuration": 2, "examples": 3},
-}
-DEFAULT_X = 0
-LEVEL_MAP = {
-    "beginner": 1,
-    "intermediate": 2,
-    "advanced": 3,
-}
-DEFAULT_Y = 0
-PRIORITY_NORMAL = 0
-PRIORITY_HIGH = 9
-PRIORITY_ADVANCED_LEVEL_KEY = "advanced"
-PRIORITY_IMPLEMENTATION_PRIMARY_KEY = "implementation"
-PRIORITY_IMPLEMENTATION_DETAIL_KEYS = {"high", "advanced"}
+# Content-hash cache: lets unchanged pages be hard-linked instead of re-parsed.
+# CACHE_VERSION is the file layout; the naming rules are fingerprinted (cache_fingerprint).
+CACHE_PATH = os.path.join(BASE_DIR, ".rename_cache.json")
+CACHE_VERSION = 3
+DOCS_JSON_PATH = os.path.join(BASE_DIR, "docs.json")  # Navigation updated after renames
+# Output stage: files go to a staging directory that is swapped in once
+# complete (two renames: target -> archive, staging -> target). fsync: "none", "end" (every file and the directory
+# before the swap) or "file" (each file as it is written).
+FSYNC_POLICIES = ("none", "end", "file")
+DEFAULT_FSYNC = "end"
+WRITE_THREADS = 4
+# (PWXY mappings live in pwxy.py)
 
 # --- Configuration End ---
 
 # --- Helper Functions ---
-# (extract_front_matter remains the same)
 
 
-def extract_front_matter(content):
-    match = re.match(r"^\s*---\s*$(.*?)^---\s*$(.*)", content, re.DOTALL | re.MULTILINE)
-    if match:
-        yaml_str = match.group(1).strip()
-        markdown_content = match.group(2).strip()
-        try:
-            front_matter = yaml.safe_load(yaml_str)
-            if front_matter is None:
-                return {}, markdown_content
-            return (
-                front_matter if isinstance(front_matter, dict) else {}
-            ), markdown_content
-        except yaml.YAMLError as e:
-            print(f"  [Error] YAML Parsing Failed: {e}")
-            return None, content
-    else:
-        return {}, content
+def prepare_source_dir(instr):
+    """
+    Returns the source directory name of this run: plugin_dev_zh itself, which
+    is read in place and only moved aside to a timestamped directory once the
+    new tree is complete (see StagingWriter), or an empty stand-in if missing.
+    Kept out of module scope so that importing this module (which every
+    --jobs worker process does) has no side effects.
+    """
+    if os.path.exists(os.path.join(BASE_DIR, TARGET_DIR_NAME)):
+        return TARGET_DIR_NAME
+
+    instr.warning(
+        f"Warning: '{TARGET_DIR_NAME}' directory not found in {BASE_DIR}",
+        f"Creating a new '{TARGET_DIR_NAME}' directory...",
+    )
+    os.makedirs(os.path.join(BASE_DIR, EMPTY_SOURCE_DIR_NAME), exist_ok=True)
+    return EMPTY_SOURCE_DIR_NAME
 
 
 # (sanitize_filename_part remains mostly the same, ensures non-empty return)
@@ -95,266 +80,789 @@ def sanitize_filename_part(part):
     return part or "untitled"
 
 
-# --- Main Processing Function ---
+
+# --- Cache Helpers ---
+# Layout of CACHE_PATH:
+#   "stats":   {path relative to source dir: [size, mtime_ns, sha1]} for the
+#              files written by the previous run (they are the next run's source)
+#   "entries": {sha1 of a source file: {"prefix", "filename", "output_hash",
+#              "warnings"}}; output_hash == key means the file is already in
+#              its final form and can be linked into the target unchanged.
+#              Only pages named from their standard_title are recorded.
+#   "fingerprint": cache_fingerprint() of the run that wrote the entries; they
+#              are dropped when it differs (the stats stay valid).
 
 
-def process_markdown_files(source_dir, target_dir):
+def cache_fingerprint():
     """
-    Processes mdx files, archives old target dir, uses PWXY-[title].lang.mdx format.
+    Identifies the rules the cached names were derived with: the PWXY tables
+    (pwxy.table_fingerprint) and the naming and title sanitizing code.
+    """
+    naming_source = "".join(inspect.getsource(func) for func in (compute_target_name, sanitize_filename_part))
+    return hash_bytes(f"{table_fingerprint()}\n{naming_source}".encode("utf-8"))
+
+
+def load_cache(cache_path, instr):
+    fingerprint = cache_fingerprint()
+    empty = {"version": CACHE_VERSION, "fingerprint": fingerprint, "stats": {}, "entries": {}}
+    if not cache_path or not os.path.exists(cache_path):
+        return empty
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError) as e:
+        instr.warning(f"Warning: Ignoring unreadable cache '{cache_path}': {e}")
+        return empty
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return empty
+    cache.setdefault("stats", {})
+    cache.setdefault("entries", {})
+    if cache.get("fingerprint") != fingerprint:
+        if cache["entries"]:
+            instr.info("Naming rules changed since the cache was written; renaming every file afresh.")
+        cache["fingerprint"] = fingerprint
+        cache["entries"] = {}
+    return cache
+
+
+def save_cache(cache_path, cache, instr):
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        instr.warning(f"Warning: Could not write cache '{cache_path}': {e}")
+
+
+def hash_bytes(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def decode_source(raw):
+    """Decode like open(..., 'r', encoding='utf-8') does, universal newlines included."""
+    content = raw.decode("utf-8")
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
+def link_or_copy(source_path, target_path):
     """
-    print("Starting processing...")
-    print(f"Source Directory: {source_dir}")
-    print(f"Target Directory: {target_dir}")
-
-    # --- Archive Existing Target Directory ---
-    if os.path.exists(target_dir):
-        if os.path.isdir(target_dir):
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            archive_dir = os.path.join(BASE_DIR, f"{ARCHIVE_PREFIX}{timestamp}")
+    Hard-link an unchanged file into the target, copying across devices.
+    The link shares its inode with the source, which commit() moves into the
+    archive: tools that edit pages must replace them (temporary file plus
+    os.replace), as an in-place write would change the archived copy too.
+    """
+    try:
+        os.link(source_path, target_path)
+    except OSError:
+        with open(source_path, "rb") as src, open(target_path, "wb") as dst:
+            dst.write(src.read())
+
+
+# --- Output Stage ---
+
+
+def unique_path(path):
+    """path, or path_1, path_2, ... for the first that does not exist yet (archives of runs within one second)."""
+    candidate, counter = path, 0
+    while os.path.lexists(candidate):
+        counter += 1
+        candidate = f"{path}_{counter}"
+    return candidate
+
+
+def fsync_path(path, directory=False):
+    """fsync a file or directory by path."""
+    flags = os.O_RDONLY | (getattr(os, "O_DIRECTORY", 0) if directory else 0)
+    fd = os.open(path, flags)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class StagingWriter:
+    """
+    Builds a new target directory next to the old one and swaps it in.
+
+    Files are written (or hard-linked) into .<target>.staging by a pool of
+    `threads` threads; at most threads * 4 writes are queued, so rendering
+    never runs far ahead of the disk but overlaps with it. finish() waits for
+    every write and applies the fsync policy; commit() moves the old target
+    to the archive path and renames the staging directory into place. Until
+    then the old target is untouched, so a crash leaves it complete (plus a
+    stale staging directory that the next run removes). The swap is two
+    renames, not one: between them the target does not exist (watchers such
+    as nav_watch.py must tolerate that), and a crash there leaves the old
+    tree in the archive and the new one in the staging directory.
+    """
+
+    def __init__(self, target_dir, fsync=DEFAULT_FSYNC, threads=WRITE_THREADS):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync}', expected one of {FSYNC_POLICIES}")
+        self.target_dir = os.path.abspath(target_dir)
+        parent, name = os.path.split(self.target_dir)
+        self.staging_dir = os.path.join(parent, f".{name}.staging")
+        self.fsync = fsync
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+        self.slots = threading.BoundedSemaphore(threads * 4)
+        self.futures = []
+
+    def open(self):
+        """Create an empty staging directory. Returns True if a stale one was removed."""
+        stale = os.path.exists(self.staging_dir)
+        if stale:
+            shutil.rmtree(self.staging_dir)
+        os.makedirs(self.staging_dir)
+        return stale
+
+    def _submit(self, task, *args):
+        self.slots.acquire()
+        future = self.executor.submit(task, *args)
+        future.add_done_callback(lambda _: self.slots.release())
+        self.futures.append(future)
+
+    def write(self, filename, data):
+        self._submit(self._write, filename, data)
+
+    def link(self, source_path, filename):
+        self._submit(self._link, source_path, filename)
+
+    def _write(self, filename, data):
+        start = time.perf_counter()
+        path = os.path.join(self.staging_dir, filename)
+        with open(path, "wb") as f:
+            f.write(data)
+            if self.fsync == "file":
+                f.flush()
+                os.fsync(f.fileno())
+        return filename, os.stat(path), time.perf_counter() - start
+
+    def _link(self, source_path, filename):
+        start = time.perf_counter()
+        path = os.path.join(self.staging_dir, filename)
+        link_or_copy(source_path, path)
+        if self.fsync == "file":
+            fsync_path(path)
+        return filename, os.stat(path), time.perf_counter() - start
+
+    def finish(self):
+        """
+        Wait for every queued write and apply the fsync policy.
+        Returns (results, failures): (filename, stat, seconds) per written file
+        and (filename, exception) per failed one.
+        """
+        results, failures = [], []
+        for future in self.futures:
             try:
-                os.rename(target_dir, archive_dir)
-                print(f"Archived existing target directory to: {archive_dir}")
+                results.append(future.result())
             except OSError as e:
-                print(f"[Error] Failed to archive existing target directory: {e}")
-                print("Aborting to prevent data loss.")
-                return  # Stop execution if archiving fails
+                failures.append((getattr(e, "filename", None) or "?", e))
+        self.futures = []
+        if not failures and self.fsync == "end":
+            paths = [os.path.join(self.staging_dir, filename) for filename, _, _ in results]
+            list(self.executor.map(fsync_path, paths))
+        if not failures and self.fsync != "none":
+            fsync_path(self.staging_dir, directory=True)
+        self.executor.shutdown()
+        return results, failures
+
+    def commit(self, archive_dir=None):
+        """
+        Move an existing target to archive_dir, then rename the staging directory
+        into place. If the second rename fails the target is moved back.
+        """
+        if archive_dir is not None:
+            os.rename(self.target_dir, archive_dir)
+        try:
+            os.rename(self.staging_dir, self.target_dir)
+        except OSError:
+            if archive_dir is not None:
+                os.rename(archive_dir, self.target_dir)
+            raise
+        if self.fsync != "none":
+            fsync_path(os.path.dirname(self.target_dir), directory=True)
+
+    def discard(self):
+        self.executor.shutdown(cancel_futures=True)
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+
+# --- Per-File Pipeline ---
+
+
+def compute_target_name(front_matter, filename):
+    """
+    Computes the PWXY prefix and PWXY-[title].lang.mdx name for one file.
+    Returns (padded_prefix, new_filename, warnings_messages); raises ValueError
+    (with the report line as message) if no numeric prefix can be formed.
+    """
+    # --- Extract Metadata (including new fields) ---
+    primary, detail, level = dimension_values(front_matter)
+    standard_title = front_matter.get("standard_title")  # New
+    language = front_matter.get("language")  # New
+
+    # --- Determine PWXY (precompiled table in pwxy.py) ---
+    # Raises ValueError if no numeric prefix can be formed.
+    padded_prefix, warning_codes = classify(primary, detail, level)
+    warnings_messages = [
+        warning_message(code, primary, detail, level) for code in warning_codes
+    ]
+
+    # Determine title part (use standard_title or fallback)
+    title_part_to_use = standard_title
+    if not title_part_to_use:
+        warnings_messages.append(
+            "  [Warning] Missing 'standard_title'. Using original filename base as fallback."
+        )
+        title_part_to_use = os.path.splitext(filename)[0]  # Fallback
+
+    sanitized_title = sanitize_filename_part(title_part_to_use)
+
+    # Determine language suffix
+    lang_suffix = ""
+    if language:
+        lang_code = str(language).strip().lower()
+        if lang_code:
+            lang_suffix = f".{lang_code}"
         else:
-            print(
-                f"[Error] Target path '{target_dir}' exists but is not a directory. Please remove or rename it manually."
+            warnings_messages.append(
+                "  [Warning] Empty 'language' field found. Omitting suffix."
             )
-            print("Aborting.")
-            return
+    else:
+        warnings_messages.append(
+            "  [Warning] Missing 'language' field. Omitting suffix."
+        )
+
+    # Combine parts
+    # Removed brackets around sanitized_title
+    new_filename = f"{padded_prefix}-{sanitized_title}{lang_suffix}.mdx"
+    return padded_prefix, new_filename, warnings_messages
+
+
+def render_file(original_filepath):
+    """
+    Parses one source file and renders its target name and content without
+    touching the target directory, so it can run in a worker process.
+    Returns a dict with a "status" of ok, yaml_error, prefix_error, not_found
+    or exception; messages are returned rather than printed so the
+    caller can report them in source order. "timings" holds the seconds
+    spent per stage (read, parse, compute, dump) for the instrumentation.
+    """
+    filename = os.path.basename(original_filepath)
+    relative_path = os.path.relpath(original_filepath, BASE_DIR).replace(os.sep, "/")
+    timings = {}
+    result = {"status": "ok", "hash": None, "errors": [], "messages": [], "timings": timings}
+
+    try:
+        start = time.perf_counter()
+        with open(original_filepath, "rb") as f:
+            raw = f.read()
+        result["hash"] = hash_bytes(raw)
+        content = decode_source(raw)
+        timings["read"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        front_matter, markdown_content = extract_front_matter(
+            content, errors=result["errors"]
+        )
+        timings["parse"] = time.perf_counter() - start
+
+        if front_matter is None:
+            result["status"] = "yaml_error"
+            result["messages"].append("  [Skipping] YAML Error in file.")
+            return result
+
+        start = time.perf_counter()
+        try:
+            padded_prefix, new_filename, warnings_messages = compute_target_name(
+                front_matter, filename
+            )
+        except ValueError as e:
+            result["status"] = "prefix_error"
+            result["messages"].append(str(e))
+            return result
+        finally:
+            timings["compute"] = time.perf_counter() - start
+        result["filename"] = new_filename
+        result["prefix"] = padded_prefix
+        result["warnings"] = warnings_messages
+        # Without a standard_title the name comes from the source filename, so
+        # it depends on more than the content and cannot be cached by hash.
+        result["cacheable"] = bool(front_matter.get("standard_title"))
+
+        # --- Prepare New Content ---
+        # The front matter itself is not modified, so its original text is
+        # kept as is instead of re-dumping (and re-folding) the whole YAML.
+        start = time.perf_counter()
+        yaml_str, _ = split_front_matter(content)
+        new_yaml_str = f"{yaml_str}\n" if yaml_str else ""
+        new_content = f"---\n{new_yaml_str}---\n\n{markdown_content}"
+        result["data"] = new_content.encode("utf-8")
+        timings["dump"] = time.perf_counter() - start
+        return result
+
+    except FileNotFoundError:
+        result["status"] = "not_found"
+        result["messages"].append(
+            f"  [Error] File not found during processing: {original_filepath}"
+        )
+        return result
+    except Exception as e:
+        result["status"] = "exception"
+        result["messages"].append(
+            f"  [Error] Unexpected error processing file '{relative_path}': {e}"
+        )
+        result["traceback"] = traceback.format_exc()
+        return result
+
+
+# --- Main Processing Function ---
+
+
+def process_markdown_files(
+    source_dir,
+    target_dir,
+    cache_path=CACHE_PATH,
+    jobs=1,
+    instr=None,
+    fsync=DEFAULT_FSYNC,
+    write_threads=WRITE_THREADS,
+):
+    """
+    Processes mdx files, archives old target dir, uses PWXY-[title].lang.mdx format.
+    The new target is built in a staging directory (StagingWriter, written by
+    write_threads threads with the given fsync policy) and swapped in only if
+    every file was written; source_dir may be target_dir itself.
+    Returns the renames, or None if nothing was swapped in.
+    Files whose content hash shows they are already in final form are hard-linked
+    from the source instead of being parsed and rewritten (pass cache_path=None
+    to disable the cache). With jobs > 1 files are parsed and rendered in a
+    process pool; targets are still claimed and written here in sorted source
+    order, so collisions, counters and the report match a serial run.
+    Output, stage timings and counters go through instr (an
+    instrument.Instrumentation; a default one is created if omitted).
+    """
+    instr = instr or instrument.Instrumentation("rename")
+    instr.info(
+        "Starting processing...",
+        f"Source Directory: {source_dir}",
+        f"Target Directory: {target_dir}",
+    )
+
+    if os.path.exists(target_dir) and not os.path.isdir(target_dir):
+        instr.error(
+            f"[Error] Target path '{target_dir}' exists but is not a directory. Please remove or rename it manually.",
+            "Aborting.",
+        )
+        instr.flush()
+        return
 
-    # --- Create New Target Directory ---
+    # --- Create Staging Directory (the target is only replaced at the end) ---
+    writer = StagingWriter(target_dir, fsync=fsync, threads=write_threads)
     try:
-        # Should not exist after archiving
-        os.makedirs(target_dir, exist_ok=False)
-        print(f"Created new target directory: {target_dir}")
+        if writer.open():
+            instr.warning(f"Warning: Removed stale staging directory of an interrupted run: {writer.staging_dir}")
+        instr.info(f"Created staging directory: {writer.staging_dir}")
     except OSError as e:
-        print(f"[Error] Failed to create target directory '{target_dir}': {e}")
-        print("Aborting.")
+        instr.error(f"[Error] Failed to create staging directory '{writer.staging_dir}': {e}", "Aborting.")
+        writer.discard()
+        instr.flush()
         return
 
     processed_count = 0
     skipped_count = 0
     error_count = 0
     warning_count = 0  # Counts files with at least one warning
+    cached_count = 0  # Files linked unchanged thanks to the cache
+
+    cache = load_cache(cache_path, instr)
+    old_stats = cache["stats"]
+    old_entries = cache["entries"]
+    new_stats = {}
+    new_entries = {}
+    written_hashes = {}  # target filename -> output hash, stat filled in once written
+
+    # --- Collect Files (sorted, so the first claimant of a name is stable) ---
+    # One scandir pass per directory; its stat data feeds the cache lookup.
+    scan_start = time.perf_counter()
+    source_files = [
+        page_entry
+        for _, page_entry in scanner.scan_tree(source_dir, fresh=True)
+        if page_entry.name.lower().endswith(".mdx")  # Changed from .md
+    ]
+    total_files = len(source_files)
+    instr.info(f"Found {total_files} MDX files to process")  # Changed from Markdown
+
+    # Old page path -> new page path (as used in links and docs.json)
+    target_name = os.path.basename(os.path.normpath(target_dir))
+    renames = {}
+
+    # --- Cache Lookup (stat data from the scan; content is only read on a miss) ---
+    work_items = []  # (filepath, scanner.PageEntry, linkable cache entry or None)
+    to_render = []
+    for page_entry in source_files:
+        filepath = page_entry.path
+        cache_key = os.path.relpath(filepath, source_dir).replace(os.sep, "/")
+        entry = None
+        cached_stat = old_stats.get(cache_key)
+        if cached_stat and cached_stat[:2] == [page_entry.size, page_entry.mtime_ns]:
+            candidate = old_entries.get(cached_stat[2])
+            if candidate and candidate["output_hash"] == cached_stat[2]:
+                entry = candidate
+        if entry is None:
+            to_render.append(filepath)
+        work_items.append((filepath, page_entry, entry))
+    instr.add_time("scan", time.perf_counter() - scan_start, total_files)
+
+    # --- Render (in worker processes with --jobs) ---
+    executor = None
+    if jobs > 1 and len(to_render) > 1:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        chunksize = max(1, len(to_render) // (jobs * 4))
+        rendered = executor.map(render_file, to_render, chunksize=chunksize)
+    else:
+        rendered = map(render_file, to_render)
 
-    total_files = sum(
-        1
-        for root, _, files in os.walk(source_dir)
-        for file in files
-        if file.lower().endswith(".mdx")  # Changed from .md
-    )
-    print(f"Found {total_files} MDX files to process")  # Changed from Markdown
-
-    for root, _, files in os.walk(source_dir):
-        for filename in files:
-            if not filename.lower().endswith(".mdx"):  # Changed from .md
-                continue
-
-            original_filepath = os.path.join(root, filename)
+    # --- Claim Targets and Write, in Source Order ---
+    claimed = set()
+    try:
+        for original_filepath, page_entry, entry in work_items:
             relative_path = os.path.relpath(original_filepath, BASE_DIR).replace(
                 os.sep, "/"
             )
-
-            current_warnings = 0
-
             try:
-                with open(original_filepath, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                front_matter, markdown_content = extract_front_matter(content)
-
-                if front_matter is None:
-                    print(f"\nProcessing: {relative_path}")
-                    print("  [Skipping] YAML Error in file.")
+                result = None
+                if entry is None:
+                    result = next(rendered)
+                    instr.add_timings(result["timings"])
+                    if result["errors"]:
+                        instr.error(*result["errors"])
+                    candidate = old_entries.get(result["hash"])
+                    if (
+                        result["status"] == "ok"
+                        and candidate
+                        and candidate["output_hash"] == result["hash"]
+                    ):
+                        # Content unchanged even though the stat was not.
+                        entry = candidate
+
+                if result is not None and entry is None and result["status"] != "ok":
+                    instr.error("", f"Processing: {relative_path}", *result["messages"])
+                    if "traceback" in result:
+                        instr.flush()
+                        sys.stderr.write(result["traceback"])
                     error_count += 1
                     continue
 
-                # --- Extract Metadata (including new fields) ---
-                dimensions = front_matter.get("dimensions", {})
-                type_info = dimensions.get("type", {})
-                primary = type_info.get("primary")
-                detail = type_info.get("detail")
-                level = dimensions.get("level")
-                standard_title = front_matter.get("standard_title")  # New
-                language = front_matter.get("language")  # New
-
-                # --- Determine P, W, X, Y (Logic remains the same) ---
-                P = PRIORITY_NORMAL
-                # (Priority logic based on level and implementation/detail)
-                if level == PRIORITY_ADVANCED_LEVEL_KEY:
-                    P = PRIORITY_HIGH
-                if (
-                    primary == PRIORITY_IMPLEMENTATION_PRIMARY_KEY
-                    and detail in PRIORITY_IMPLEMENTATION_DETAIL_KEYS
-                ):
-                    P = PRIORITY_HIGH
-
-                W = PRIMARY_TYPE_MAP.get(primary, DEFAULT_W)
-                primary_detail_map = DETAIL_TYPE_MAPS.get(primary, {})
-                X = primary_detail_map.get(detail, DEFAULT_X)
-                Y = LEVEL_MAP.get(level, DEFAULT_Y)
-
-                # --- Warnings for missing dimension data (same as before) ---
-                warnings_messages = []
-                if primary is None:
-                    current_warnings += 1
-                    warnings_messages.append(
-                        "  [Warning] Missing dimensions.type.primary"
-                    )
-                elif W == DEFAULT_W:
-                    current_warnings += 1
-                    warnings_messages.append(
-                        f"  [Warning] Unmapped primary type: '{primary}'. Using W={DEFAULT_W}"
-                    )
-                if detail is None:
-                    current_warnings += 1
-                    warnings_messages.append(
-                        "  [Warning] Missing dimensions.type.detail"
-                    )
-                elif X == DEFAULT_X and primary in DETAIL_TYPE_MAPS:
-                    current_warnings += 1
-                    warnings_messages.append(
-                        f"  [Warning] Unmapped detail type: '{detail}' for primary '{primary}'. Using X={DEFAULT_X}"
-                    )
-                elif primary not in DETAIL_TYPE_MAPS and primary is not None:
-                    current_warnings += 1
-                    warnings_messages.append(
-                        f"  [Warning] No detail map defined for primary type: '{primary}'. Using X={DEFAULT_X}"
-                    )
-                if level is None:
-                    current_warnings += 1
-                    warnings_messages.append("  [Warning] Missing dimensions.level")
-                elif Y == DEFAULT_Y:
-                    current_warnings += 1
-                    warnings_messages.append(
-                        f"  [Warning] Unmapped level: '{level}'. Using Y={DEFAULT_Y}"
-                    )
-
-                # --- Construct New Filename using standard_title and language ---
-                prefix_str = f"{P}{W}{X}{Y}"
-                try:
-                    numeric_prefix = int(prefix_str)
-                    padded_prefix = f"{numeric_prefix:04d}"
-                except ValueError:
-                    print(f"\nProcessing: {relative_path}")
-                    print(
-                        f"  [Error] Could not form numeric prefix from P={P}, W={W}, X={X}, Y={Y}. Using '0000'."
-                    )
-                    error_count += 1
-                    continue  # Skip file
-
-                # Determine title part (use standard_title or fallback)
-                title_part_to_use = standard_title
-                if not title_part_to_use:
-                    current_warnings += 1
-                    warnings_messages.append(
-                        "  [Warning] Missing 'standard_title'. Using original filename base as fallback."
-                    )
-                    title_part_to_use = os.path.splitext(filename)[0]  # Fallback
-
-                sanitized_title = sanitize_filename_part(title_part_to_use)
-
-                # Determine language suffix
-                lang_suffix = ""
-                if language:
-                    lang_code = str(language).strip().lower()
-                    if lang_code:
-                        lang_suffix = f".{lang_code}"
-                    else:
-                        current_warnings += 1
-                        warnings_messages.append(
-                            "  [Warning] Empty 'language' field found. Omitting suffix."
-                        )
+                if entry is not None:
+                    new_filename = entry["filename"]
+                    warnings_messages = entry["warnings"]
                 else:
-                    current_warnings += 1
-                    warnings_messages.append(
-                        "  [Warning] Missing 'language' field. Omitting suffix."
-                    )
-
-                # Combine parts
-                # Removed brackets around sanitized_title
-                new_filename = f"{padded_prefix}-{sanitized_title}{lang_suffix}.mdx"
-                target_filepath = os.path.join(target_dir, new_filename)
+                    new_filename = result["filename"]
+                    warnings_messages = result["warnings"]
 
                 # --- Check for Collisions ---
-                if os.path.exists(target_filepath):
-                    print(f"\nProcessing: {relative_path}")
-                    print(f"  [Skipping] Target file already exists: {new_filename}")
-                    skipped_count += 1
-                    continue
-
-                # --- Prepare New Content ---
-                try:
-                    new_yaml_str = yaml.dump(
-                        front_matter,
-                        allow_unicode=True,
-                        default_flow_style=False,
-                        sort_keys=False,
+                if new_filename in claimed:
+                    instr.warning(
+                        "",
+                        f"Processing: {relative_path}",
+                        f"  [Skipping] Target file already exists: {new_filename}",
                     )
-                except Exception as dump_error:
-                    print(f"\nProcessing: {relative_path}")
-                    print(f"  [Error] Failed to dump updated YAML: {dump_error}")
-                    error_count += 1
+                    skipped_count += 1
                     continue
 
-                new_content = f"---\n{new_yaml_str}---\n\n{markdown_content}"
-
-                # --- Write New File ---
-                with open(target_filepath, "w", encoding="utf-8") as f:
-                    f.write(new_content)
-
-                if current_warnings > 0:
-                    print(f"\nProcessing: {relative_path}")
-                    for warning in warnings_messages:
-                        print(warning)
+                claimed.add(new_filename)
+
+                if entry is not None:
+                    # --- Link Unchanged File ---
+                    writer.link(original_filepath, new_filename)
+                    new_stats[new_filename] = [
+                        page_entry.size,
+                        page_entry.mtime_ns,
+                        entry["output_hash"],
+                    ]
+                    new_entries[entry["output_hash"]] = entry
+                    cached_count += 1
+                else:
+                    # --- Write New File (queued to the writer threads) ---
+                    new_bytes = result["data"]
+                    writer.write(new_filename, new_bytes)
+
+                    # --- Record in Cache ---
+                    # With a standard_title the name depends on the content only
+                    # and the output is a fixed point of this script, so next run
+                    # it (and any unchanged copy of it) can be linked as-is.
+                    # Names from the filename fallback are derived anew every run.
+                    if result["cacheable"]:
+                        output_hash = hash_bytes(new_bytes)
+                        entry = {
+                            "prefix": result["prefix"],
+                            "filename": new_filename,
+                            "output_hash": output_hash,
+                            "warnings": warnings_messages,
+                        }
+                        new_entries[result["hash"]] = entry
+                        new_entries[output_hash] = entry
+                        written_hashes[new_filename] = output_hash
+
+                if warnings_messages:
+                    instr.warning("", f"Processing: {relative_path}", *warnings_messages)
                     warning_count += (
                         1  # Increment file warning count if this file had warnings
                     )
 
+                old_stem = os.path.splitext(
+                    os.path.relpath(original_filepath, source_dir).replace(os.sep, "/")
+                )[0]
+                old_page = f"{target_name}/{old_stem}"
+                new_page = f"{target_name}/{os.path.splitext(new_filename)[0]}"
+                if old_page != new_page:
+                    renames[old_page] = new_page
+
                 processed_count += 1
-                if processed_count % 10 == 0 or processed_count == total_files:
-                    print(
-                        f"Progress: {processed_count}/{total_files} files processed",
-                        end="\r",
-                    )
+                instr.progress(processed_count, total_files)
 
             except FileNotFoundError:
-                print(f"\nProcessing: {relative_path}")
-                print(
-                    f"  [Error] File not found during processing: {original_filepath}"
+                instr.error(
+                    "",
+                    f"Processing: {relative_path}",
+                    f"  [Error] File not found during processing: {original_filepath}",
                 )
                 error_count += 1
             except Exception as e:
-                print(f"\nProcessing: {relative_path}")
-                print(
-                    f"  [Error] Unexpected error processing file '{relative_path}': {e}"
+                instr.error(
+                    "",
+                    f"Processing: {relative_path}",
+                    f"  [Error] Unexpected error processing file '{relative_path}': {e}",
                 )
-                import traceback
-
+                instr.flush()
                 traceback.print_exc()
                 error_count += 1
+    except BaseException:
+        writer.discard()
+        raise
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    instr.info("\n")  # Add a newline after progress counter
+
+    # --- Wait for the Writers, then Swap the Staging Directory In ---
+    with instr.stage("fsync" if fsync != "none" else "drain"):
+        written, failures = writer.finish()
+    for filename, file_stat, seconds in written:
+        instr.add_time("write", seconds, 1)
+        if filename in written_hashes:
+            new_stats[filename] = [file_stat.st_size, file_stat.st_mtime_ns, written_hashes[filename]]
+    if failures:
+        instr.error(*(f"[Error] Failed to write '{filename}': {e}" for filename, e in failures))
+        instr.error(f"Aborting; {target_dir} left unchanged.")
+        writer.discard()
+        instr.flush()
+        return
+
+    archive_dir = None
+    if os.path.isdir(target_dir):
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        target_name_on_disk = os.path.basename(os.path.abspath(target_dir))
+        same_dir = os.path.abspath(source_dir) == os.path.abspath(target_dir)
+        # Read in place: the previous tree is kept as <target>_<timestamp>.
+        prefix = f"{target_name_on_disk}_" if same_dir else ARCHIVE_PREFIX
+        archive_dir = unique_path(
+            os.path.join(os.path.dirname(os.path.abspath(target_dir)), f"{prefix}{timestamp}")
+        )
+    try:
+        writer.commit(archive_dir)
+    except OSError as e:
+        instr.error(
+            f"[Error] Failed to swap in the new target directory: {e}",
+            f"Aborting; {target_dir} left unchanged.",
+        )
+        writer.discard()
+        instr.flush()
+        return
+    if archive_dir is not None:
+        instr.info(f"Archived existing target directory to: {archive_dir}")
+    instr.info(f"Swapped staging directory in as: {target_dir}")
+
+    if cache_path:
+        save_cache(
+            cache_path,
+            {"version": CACHE_VERSION, "fingerprint": cache["fingerprint"], "stats": new_stats, "entries": new_entries},
+            instr,
+        )
+    for name, value in (
+        ("processed", processed_count),
+        ("cached", cached_count),
+        ("skipped", skipped_count),
+        ("warnings", warning_count),
+        ("errors", error_count),
+        ("renamed", len(renames)),
+    ):
+        instr.count(name, value)
 
-    print("\n")  # Add a newline after progress counter
     # --- Final Report ---
-    print("\n--- Processing Complete ---")
-    print(f"Successfully processed: {processed_count} files")
-    print(f"Skipped (target exists): {skipped_count} files")
-    print(f"Files with warnings (missing/unmapped data): {warning_count}")
-    print(f"Errors encountered: {error_count} files")
-    print("-" * 27)
+    instr.info(
+        "\n--- Processing Complete ---",
+        f"Successfully processed: {processed_count} files",
+        f"  Unchanged (linked from cache): {cached_count} files",
+        f"Skipped (target exists): {skipped_count} files",
+        f"Files with warnings (missing/unmapped data): {warning_count}",
+        f"Errors encountered: {error_count} files",
+        f"Renamed pages: {len(renames)}",
+        "-" * 27,
+    )
+    instr.flush()
+    return renames
 
 
-if __name__ == "__main__":
-    SOURCE_PATH = os.path.join(BASE_DIR, SOURCE_DIR_NAME)
-    TARGET_PATH = os.path.join(BASE_DIR, TARGET_DIR_NAME)
-    process_markdown_files(SOURCE_PATH, TARGET_PATH)
+# --- Link Migration ---
 
-    if SOURCE_DIR_NAME == "plugin_dev_zh_empty_source" and os.path.exists(SOURCE_PATH):
+
+def migrate_links(renames, docs_json_path=DOCS_JSON_PATH, instr=None):
+    """
+    Applies an old -> new page path map to every inbound link in the
+    plugin_dev_<lang> folders and to the docs.json navigation.
+    Links are rewritten through the link index (only linking files are
+    opened); docs.json gets one multi-path replacement pass over its text.
+    """
+    instr = instr or instrument.Instrumentation("rename")
+    try:
+        _migrate_links(renames, docs_json_path, instr)
+    finally:
+        instr.flush()
+
+
+def _migrate_links(renames, docs_json_path, instr):
+    if not renames:
+        instr.info("No pages were renamed; links and navigation left untouched.")
+        return
+
+    instr.info(f"\nMigrating links for {len(renames)} renamed pages...")
+    with instr.stage("links"):
+        link_index = LinkIndex.build(BASE_DIR)
+        for filepath in link_index.rewrite_targets(renames):
+            instr.info(f"  Links updated: {os.path.relpath(filepath, BASE_DIR)}")
+            instr.count("link_files_updated")
+
+    if not os.path.exists(docs_json_path):
+        instr.info(f"Note: {docs_json_path} not found; navigation not updated.")
+        return
+    try:
+        with instr.stage("navigation"):
+            with open(docs_json_path, "r", encoding="utf-8") as f:
+                docs_text = f.read()
+            new_text, count = replace_page_paths(docs_text, renames)
+            if count and write_docs_json(docs_json_path, json.loads(new_text)):
+                instr.info(f"  Navigation entries updated in docs.json: {count}")
+                instr.count("navigation_entries_updated", count)
+    except (OSError, ValueError) as e:
+        instr.error(f"[Error] Failed to update {docs_json_path}: {e}")
+
+
+def rename_docs(
+    instr,
+    jobs=1,
+    use_cache=True,
+    map_out=None,
+    migrate=True,
+    fsync=DEFAULT_FSYNC,
+    write_threads=WRITE_THREADS,
+):
+    """
+    One full rename run over plugin_dev_zh: render into the staging directory,
+    swap it in, then optionally write the rename map and migrate inbound links.
+    Returns the {old page: new page} map, or None if the run failed.
+    """
+    source_dir_name = prepare_source_dir(instr)
+    source_path = os.path.join(BASE_DIR, source_dir_name)
+    target_path = os.path.join(BASE_DIR, TARGET_DIR_NAME)
+    renames = process_markdown_files(
+        source_path,
+        target_path,
+        cache_path=CACHE_PATH if use_cache else None,
+        jobs=jobs,
+        instr=instr,
+        fsync=fsync,
+        write_threads=max(1, write_threads),
+    )
+
+    if renames is not None:
+        if map_out:
+            with open(map_out, "w", encoding="utf-8") as f:
+                json.dump(renames, f, ensure_ascii=False, indent=2)
+            instr.info(f"Wrote rename map ({len(renames)} entries) to {map_out}")
+        if migrate:
+            migrate_links(renames, instr=instr)
+
+    if source_dir_name == EMPTY_SOURCE_DIR_NAME and os.path.exists(source_path):
         try:
-            os.rmdir(SOURCE_PATH)
-            print(f"Removed temporary source directory: {SOURCE_PATH}")
+            os.rmdir(source_path)
+            instr.info(f"Removed temporary source directory: {source_path}")
         except OSError as e:
-            print(f"Note: Could not remove temporary directory: {e}")
+            instr.info(f"Note: Could not remove temporary directory: {e}")
+    return renames
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Rename plugin_dev_zh pages to the PWXY-[title].lang.mdx format."
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Re-parse every file and do not read or update {os.path.basename(CACHE_PATH)}",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Parse and render files in N worker processes (0 = one per CPU)",
+    )
+    parser.add_argument(
+        "--map-out",
+        metavar="PATH",
+        help="Write the old -> new page path map of this run to PATH as JSON",
+    )
+    parser.add_argument(
+        "--no-migrate-links",
+        action="store_true",
+        help="Do not rewrite inbound links and docs.json entries of renamed pages",
+    )
+    parser.add_argument(
+        "--fsync",
+        choices=FSYNC_POLICIES,
+        default=DEFAULT_FSYNC,
+        help="When to fsync the new files: none, at the end before the directory swap (default), or per file",
+    )
+    parser.add_argument(
+        "--write-threads",
+        type=int,
+        default=WRITE_THREADS,
+        metavar="N",
+        help=f"Threads writing the staging directory (default: {WRITE_THREADS})",
+    )
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+
+    with instrument.session("rename", args) as instr:
+        renames = rename_docs(
+            instr,
+            jobs=jobs,
+            use_cache=not args.no_cache,
+            map_out=args.map_out,
+            migrate=not args.no_migrate_links,
+            fsync=args.fsync,
+            write_threads=args.write_threads,
+        )
+    return 0 if renames is not None else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
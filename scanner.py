@@ -0,0 +1,152 @@
+import atexit
+import json
+import os
+import re
+import time
+from typing import NamedTuple, Optional
+
+# One os.scandir pass per docs directory, shared by letsgo*.py, rename.py,
+# fix_ref.py / fix_zh_ref.py, link_index.py and page_index.py. Each regular
+# file becomes a PageEntry whose PWXY prefix, title and language are parsed
+# from the filename once, e.g. 0211-getting-started.en.mdx ->
+# ('0211', 'getting-started', 'en').
+#
+# Listings are cached in SCAN_CACHE_PATH keyed by the directory's mtime, which
+# changes whenever a file is added, removed or renamed in it. An unchanged
+# directory is therefore not listed at all; its entries (including the size
+# and mtime recorded at the last scan) come from the cache. Callers that need
+# the current size/mtime of each file, e.g. to detect in-place edits, pass
+# fresh=True: the directory is then listed again with one DirEntry stat per
+# file, reusing only the parsed names. Directories modified within
+# RACY_WINDOW_NS of the scan are not cached, as a later change could keep the
+# same mtime.
+
+# --- Path Setup ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# --- Configuration ---
+SCAN_CACHE_PATH = os.path.join(BASE_DIR, ".scan_cache.json")
+SCAN_CACHE_VERSION = 1
+RACY_WINDOW_NS = 2_000_000_000
+# PWXY-title[.lang].md(x); names without the prefix only get a title
+NAME_PATTERN = re.compile(r"^(?:(\d{4})-)?(.*?)(?:\.([a-z]+))?\.mdx?$")
+
+_cache = None  # {"dirs": {realpath: {"mtime_ns", "files", "dirs"}}} once loaded
+_dirty = False
+
+
+class PageEntry(NamedTuple):
+    name: str
+    path: str
+    size: int
+    mtime_ns: int
+    pwxy: Optional[str]  # four-digit filename prefix, or None
+    title: Optional[str]  # part between prefix and language suffix (Markdown files only)
+    language: Optional[str]  # language suffix, e.g. 'en', or None
+
+
+def parse_name(name):
+    """(pwxy, title, language) from a filename; all None for non-Markdown files."""
+    match = NAME_PATTERN.match(name)
+    if match is None:
+        return None, None, None
+    return match.group(1), match.group(2), match.group(3)
+
+
+# --- Cache ---
+
+
+def _load_cache():
+    global _cache
+    if _cache is None:
+        _cache = {"dirs": {}}
+        try:
+            with open(SCAN_CACHE_PATH, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get("version") == SCAN_CACHE_VERSION:
+                _cache["dirs"] = data.get("dirs", {})
+        except (OSError, ValueError):
+            pass
+    return _cache
+
+
+def save_cache():
+    """Write the listings of this process to SCAN_CACHE_PATH (runs at exit once something changed)."""
+    global _dirty
+    if not _dirty:
+        return
+    tmp_path = f"{SCAN_CACHE_PATH}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": SCAN_CACHE_VERSION, "dirs": _cache["dirs"]}, f, ensure_ascii=False)
+        os.replace(tmp_path, SCAN_CACHE_PATH)
+        _dirty = False
+    except OSError:
+        pass  # the cache is an optimisation; the next run just lists again
+
+
+def _store(key, listing):
+    global _dirty
+    if not _dirty:
+        atexit.register(save_cache)
+    _cache["dirs"][key] = listing
+    _dirty = True
+
+
+# --- Scanning ---
+
+
+def _listing(directory, fresh, use_cache):
+    """The cached or freshly scanned {"mtime_ns", "files", "dirs"} of one directory."""
+    dir_stat = os.stat(directory)
+    key = os.path.realpath(directory)
+    cached = _load_cache()["dirs"].get(key) if use_cache else None
+    if cached is not None and cached["mtime_ns"] == dir_stat.st_mtime_ns and not fresh:
+        return cached
+
+    known = {row[0]: row for row in cached["files"]} if cached is not None else {}
+    files = []
+    dirs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                dirs.append(entry.name)
+            elif entry.is_file():
+                try:
+                    file_stat = entry.stat()
+                except FileNotFoundError:
+                    continue  # removed while listing
+                parsed = known.get(entry.name)
+                parsed = parsed[3:] if parsed is not None else parse_name(entry.name)
+                files.append([entry.name, file_stat.st_size, file_stat.st_mtime_ns, *parsed])
+    files.sort()
+    dirs.sort()
+    listing = {"mtime_ns": dir_stat.st_mtime_ns, "files": files, "dirs": dirs}
+    if use_cache and time.time_ns() - dir_stat.st_mtime_ns > RACY_WINDOW_NS and cached != listing:
+        _store(key, listing)
+    return listing
+
+
+def scan(directory, fresh=False, use_cache=True):
+    """
+    PageEntry records of the regular files in directory, sorted by name.
+    fresh=True re-stats every file; use_cache=False neither reads nor updates
+    the cache. Raises OSError (e.g. FileNotFoundError) like os.scandir.
+    """
+    listing = _listing(directory, fresh, use_cache)
+    return [
+        PageEntry(name, os.path.join(directory, name), size, mtime_ns, pwxy, title, language)
+        for name, size, mtime_ns, pwxy, title, language in listing["files"]
+    ]
+
+
+def scan_tree(directory, fresh=False, use_cache=True):
+    """Yield (relative directory, PageEntry) for every file below directory, in sorted walk order."""
+    pending = [""]
+    while pending:
+        relative_dir = pending.pop(0)
+        current = os.path.join(directory, relative_dir) if relative_dir else directory
+        listing = _listing(current, fresh, use_cache)
+        for name, size, mtime_ns, pwxy, title, language in listing["files"]:
+            yield relative_dir, PageEntry(name, os.path.join(current, name), size, mtime_ns, pwxy, title, language)
+        pending[:0] = [os.path.join(relative_dir, name) if relative_dir else name for name in listing["dirs"]]
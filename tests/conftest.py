@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+# The scripts are flat top-level modules; make them importable from the tests.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+
+import scanner  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def scan_cache(tmp_path, monkeypatch):
+    """Keep scanner.py's listing cache out of the repository."""
+    monkeypatch.setattr(scanner, "SCAN_CACHE_PATH", str(tmp_path / ".scan_cache.json"))
+    monkeypatch.setattr(scanner, "_cache", None)
+    monkeypatch.setattr(scanner, "_dirty", False)
@@ -0,0 +1,11 @@
+import byte_scan
+
+
+def test_line_spans(monkeypatch):
+    data = b"a\nxx yy\n\nzz"
+    positions = [data.index(b"xx"), data.index(b"yy"), data.index(b"zz")]
+    expected = [(2, 2, 7), (4, 9, 11)]
+    assert list(byte_scan.line_spans(data, positions)) == expected
+    monkeypatch.setattr(byte_scan, "COUNT_CHUNK", 3)
+    assert list(byte_scan.line_spans(data, positions)) == expected
+    assert list(byte_scan.line_spans(data, [])) == []
@@ -0,0 +1,130 @@
+import os
+
+import pytest
+
+import fix_ref
+
+PAGE = """---
+title: Links
+related: [a](/plugin_dev_zh/0111-a)
+---
+See [a](/plugin_dev_zh/0111-a) and [b](/plugin_dev_en/0211-b.mdx#setup).
+Already [c](/plugin_dev_zh/0311-c.zh) fixed.
+
+<Card title="x" href="/plugin_dev_zh/0111-a">
+  Inside [d](/plugin_dev_zh/0411-d)
+</Card>
+
+```md
+[e](/plugin_dev_zh/0511-e)
+```
+
+{/* [f](/plugin_dev_zh/0611-f) */}
+Last [g](/plugin_dev_ja/0711-g)"""
+
+FIXED = [
+    "[a](/plugin_dev_zh/0111-a.zh)",
+    "[b](/plugin_dev_en/0211-b.en.mdx#setup)",
+    "[c](/plugin_dev_zh/0311-c.zh)",
+    "[d](/plugin_dev_zh/0411-d.zh)",
+    "[g](/plugin_dev_ja/0711-g.ja)",
+]
+UNTOUCHED = [
+    "related: [a](/plugin_dev_zh/0111-a)\n",
+    "[e](/plugin_dev_zh/0511-e)\n",
+    "[f](/plugin_dev_zh/0611-f) */}",
+]
+
+
+def test_rewrite_links_only_in_prose():
+    new_content, changed = fix_ref.rewrite_links(PAGE)
+    assert changed
+    for link in FIXED:
+        assert link in new_content
+    for text in UNTOUCHED:
+        assert text in new_content
+    assert fix_ref.rewrite_links(new_content) == (new_content, False)
+
+
+def test_link_regions_skip_links_outside_prose():
+    data = PAGE.encode("utf-8")
+    regions = fix_ref.link_regions(data)
+    text = "|".join(data[start:end].decode("utf-8") for start, end in regions)
+    for name in ("0111-a)", "0211-b", "0311-c", "0411-d", "0711-g"):
+        assert name in text
+    assert "0511-e" not in text and "0611-f" not in text and "related" not in text
+
+
+def test_link_regions_clip_to_the_prose_region():
+    # The nearest ']' before the marker is inside the code block.
+    data = b"```\n]\n```\n](/plugin_dev_zh/a)"
+    code_end = data.index(b"```\n]\n```") + len(b"```\n]\n```")
+    assert fix_ref.link_regions(data) == [(code_end, len(data))]
+    # No ')' or newline after the marker: the region ends with the prose.
+    assert fix_ref.link_regions(b"[x](/plugin_dev_zh/abc") == [(0, 22)]
+
+
+def test_link_regions_merge_overlapping():
+    data = b"[a](/plugin_dev_zh/a) [b](/plugin_dev_zh/b)\nnext"
+    assert fix_ref.link_regions(data) == [(0, data.index(b"\n"))]
+
+
+def write_page(tmp_path, content, name="page.mdx"):
+    path = tmp_path / name
+    path.write_bytes(content.encode("utf-8"))
+    return str(path)
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_mapped_rewrite_matches_text_rewrite(tmp_path, newline):
+    content = PAGE.replace("\n", newline)
+    path = write_page(tmp_path, content)
+    assert fix_ref.rewrite_links_mapped(path)
+    with open(path, "rb") as f:
+        assert f.read() == fix_ref.rewrite_links(content)[0].encode("utf-8")
+
+
+def test_mapped_rewrite_leaves_clean_file_alone(tmp_path):
+    path = write_page(tmp_path, fix_ref.rewrite_links(PAGE)[0])
+    before = os.stat(path)
+    assert not fix_ref.rewrite_links_mapped(path)
+    after = os.stat(path)
+    assert (after.st_ino, after.st_mtime_ns) == (before.st_ino, before.st_mtime_ns)
+
+
+def fix_folder(tmp_path, content, scan_mode):
+    folder = tmp_path / scan_mode / "plugin_dev_zh"
+    folder.mkdir(parents=True)
+    path = write_page(folder, content)
+    counts = fix_ref.fix_links_in_dirs([str(folder)], manifest_path=None, scan_mode=scan_mode)
+    with open(path, "rb") as f:
+        return counts, f.read()
+
+
+@pytest.mark.parametrize("scan_mode", ["text", "mmap"])
+def test_fix_links_replaces_instead_of_writing_through_hard_links(tmp_path, scan_mode):
+    folder = tmp_path / "plugin_dev_zh"
+    folder.mkdir()
+    path = write_page(folder, PAGE)
+    archived = str(tmp_path / "archived.mdx")
+    os.link(path, archived)
+
+    checked, skipped, updated, errors = fix_ref.fix_links_in_dirs(
+        [str(folder)], manifest_path=None, scan_mode=scan_mode
+    )
+    assert (checked, skipped, updated, errors) == (1, 0, 1, 0)
+    with open(archived, encoding="utf-8") as f:
+        assert f.read() == PAGE
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == fix_ref.rewrite_links(PAGE)[0]
+    assert os.listdir(folder) == ["page.mdx"]
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_text_and_mapped_paths_keep_line_endings(tmp_path, newline):
+    content = PAGE.replace("\n", newline)
+    expected = fix_ref.rewrite_links(content)[0].encode("utf-8")
+    for scan_mode in ("text", "mmap"):
+        counts, data = fix_folder(tmp_path, content, scan_mode)
+        assert counts == (1, 0, 1, 0)
+        assert data == expected
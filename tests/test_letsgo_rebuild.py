@@ -0,0 +1,68 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import letsgo
+from conftest import BASE_DIR
+from docs_nav import find_language_nav
+
+ZH = next(config for config in letsgo.LANGUAGE_CONFIGS if config["language"] == "zh")
+UNROUTED_PAGE = "9121-unrouted-page.zh.mdx"
+
+
+@pytest.fixture
+def docs(tmp_path, monkeypatch):
+    """A copy of docs.json and the page directories; configs use paths relative to it."""
+    shutil.copy(os.path.join(BASE_DIR, "docs.json"), tmp_path / "docs.json")
+    for config in letsgo.LANGUAGE_CONFIGS:
+        shutil.copytree(os.path.join(BASE_DIR, config["docs_dir"]), tmp_path / config["docs_dir"])
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def docs_text():
+    with open("docs.json", encoding="utf-8") as f:
+        return f.read()
+
+
+def test_rebuild_is_idempotent(docs, capsys):
+    assert letsgo.main(["--rebuild"]) == 0
+    rebuilt = docs_text()
+    capsys.readouterr()
+    assert letsgo.main(["--rebuild"]) == 0
+    assert "No changes; docs.json left untouched." in capsys.readouterr().out
+    assert docs_text() == rebuilt
+
+
+def test_rebuild_ignores_existing_order(docs):
+    assert letsgo.main(["--rebuild"]) == 0
+    rebuilt = docs_text()
+
+    # Scramble the zh section: reverse every group and move all pages into one.
+    docs_data = json.loads(rebuilt)
+    tabs = find_language_nav(docs_data["navigation"], "zh")["tabs"]
+    for tab in tabs:
+        for group in tab["groups"]:
+            group["pages"].reverse()
+    first = tabs[0]["groups"][0]
+    for group in tabs[0]["groups"][1:]:
+        first["pages"].extend(group["pages"])
+        group["pages"] = []
+    with open("docs.json", "w", encoding="utf-8") as f:
+        json.dump(docs_data, f, ensure_ascii=False, indent=4)
+
+    assert letsgo.main(["--rebuild"]) == 0
+    assert docs_text() == rebuilt
+
+
+def test_rebuild_skips_unrouted_pages(docs, capsys):
+    assert ("9", "1", "2") not in ZH["group_map"]
+    source = sorted(os.listdir(ZH["docs_dir"]))[0]
+    shutil.copy(os.path.join(ZH["docs_dir"], source), os.path.join(ZH["docs_dir"], UNROUTED_PAGE))
+
+    assert letsgo.main(["--rebuild", "--lang", "zh"]) == 0
+    out = capsys.readouterr().out
+    assert f"[zh] Warning: PWX prefix ('9', '1', '2') for file '{UNROUTED_PAGE}' not found in group map." in out
+    assert UNROUTED_PAGE[:-4] not in docs_text()
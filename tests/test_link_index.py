@@ -0,0 +1,18 @@
+import pytest
+
+import link_index
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_rewrite_targets_keeps_line_endings(tmp_path, newline):
+    source = tmp_path / "0111-a.zh.mdx"
+    content = "---\ntitle: A\n---\n\nSee [b](/plugin_dev_zh/0211-b.zh#intro).\nLast line.\n".replace("\n", newline)
+    source.write_bytes(content.encode("utf-8"))
+    index = link_index.LinkIndex({"plugin_dev_zh/0111-a.zh": str(source)}, scan_mode="text")
+    index.scan_file("plugin_dev_zh/0111-a.zh", str(source))
+
+    changed = index.rewrite_targets({"/plugin_dev_zh/0211-b.zh": "/plugin_dev_zh/0212-b.zh"})
+    assert changed == [str(source)]
+    expected = content.replace("0211-b.zh#intro", "0212-b.zh#intro")
+    assert source.read_bytes() == expected.encode("utf-8")
+    assert [link.page for link in index.links_from("plugin_dev_zh/0111-a.zh")] == ["plugin_dev_zh/0212-b.zh"]
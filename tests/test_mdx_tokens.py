@@ -0,0 +1,154 @@
+import pytest
+
+import mdx_tokens
+
+LINK = "[x](/plugin_dev_zh/0111-foo)"
+
+# A page using every region kind, for the coverage and str/bytes checks.
+PAGE = f"""---
+title: 示例
+link: {LINK}
+---
+import Foo from './foo'
+export const meta = {{ href: "{LINK}" }}
+
+Intro {LINK}.
+
+<Tabs>
+  <Tab title="a > b">
+    Inside {LINK}
+    ```yaml
+    url: {LINK}
+    ```
+  </Tab>
+</Tabs>
+
+{{/* {LINK} */}}
+
+~~~
+{LINK}
+~~~
+Use ```inline``` code and {LINK}
+"""
+
+
+def split(text, front_matter=True):
+    return [(region.kind, text[region.start:region.end]) for region in mdx_tokens.regions(text, front_matter)]
+
+
+def test_front_matter_and_prose():
+    assert split("---\ntitle: a\n---\nHello\n") == [
+        ("front_matter", "---\ntitle: a\n---"),
+        ("prose", "\nHello\n"),
+    ]
+
+
+def test_body_without_front_matter():
+    # A '---' thematic break at the start of a split-off body is not a header.
+    text = "---\nnot: header\n---\nbody"
+    assert split(text, front_matter=False) == [("prose", text)]
+
+
+def test_fence():
+    assert split("a\n```python\nx = 1\n```\nb\n") == [
+        ("prose", "a\n"),
+        ("code", "```python\nx = 1\n```"),
+        ("prose", "\nb\n"),
+    ]
+
+
+def test_indented_fence():
+    text = f"- item\n    ```bash\n    {LINK}\n    ```\n"
+    assert split(text) == [
+        ("prose", "- item\n"),
+        ("code", f"    ```bash\n    {LINK}\n    ```"),
+        ("prose", "\n"),
+    ]
+
+
+def test_crlf_fence():
+    assert split("a\r\n```\r\ncode\r\n```\r\nb\r\n") == [
+        ("prose", "a\r\n"),
+        ("code", "```\r\ncode\r\n```\r"),
+        ("prose", "\nb\r\n"),
+    ]
+
+
+def test_unclosed_fence_runs_to_the_end():
+    text = f"a\n```\n{LINK}\n"
+    assert split(text) == [("prose", "a\n"), ("code", f"```\n{LINK}\n")]
+
+
+def test_fence_closes_with_same_character_and_length():
+    assert split("~~~\n```\n~~~~\nafter") == [("code", "~~~\n```\n~~~~"), ("prose", "\nafter")]
+    assert split("````\n```\n````\nafter") == [("code", "````\n```\n````"), ("prose", "\nafter")]
+
+
+def test_inline_triple_backticks_are_prose():
+    text = "```inline``` code\nmore\n"
+    assert split(text) == [("prose", text)]
+
+
+def test_jsx_tags_with_prose_children():
+    text = f'<Tab title="a > b">\nSee {LINK}\n</Tab>\n'
+    assert split(text) == [
+        ("jsx", '<Tab title="a > b">'),
+        ("prose", f"\nSee {LINK}\n"),
+        ("jsx", "</Tab>"),
+        ("prose", "\n"),
+    ]
+
+
+def test_jsx_braced_attribute():
+    assert split('<Card href={x > 1 ? "/a" : "/b"} />\nok') == [
+        ("jsx", '<Card href={x > 1 ? "/a" : "/b"} />'),
+        ("prose", "\nok"),
+    ]
+
+
+@pytest.mark.parametrize("comment", [f"{{/* {LINK} */}}", f"{{/*\n{LINK}\n*/}}"])
+def test_comment(comment):
+    assert split(f"{comment}\ntext") == [("jsx", comment), ("prose", "\ntext")]
+
+
+def test_import_export_block_ends_at_blank_line():
+    assert split("import Foo from './foo'\nexport const x = 1\n\nText\n") == [
+        ("jsx", "import Foo from './foo'\nexport const x = 1"),
+        ("prose", "\n\nText\n"),
+    ]
+
+
+def test_regions_cover_the_page():
+    regions = mdx_tokens.regions(PAGE)
+    assert regions[0].start == 0 and regions[-1].end == len(PAGE)
+    for previous, region in zip(regions, regions[1:]):
+        assert previous.end == region.start
+    assert {region.kind for region in regions} == set(mdx_tokens.KINDS)
+
+
+def test_only_prose_links_are_in_prose():
+    prose = "".join(text for kind, text in split(PAGE) if kind == "prose")
+    assert prose.count(LINK) == 3  # intro, inside the <Tab>, after the inline code
+
+
+def test_str_and_bytes_regions_match():
+    data = PAGE.encode("utf-8")
+    text_regions = [(region.kind, PAGE[region.start:region.end]) for region in mdx_tokens.regions(PAGE)]
+    byte_regions = [
+        (region.kind, data[region.start:region.end].decode("utf-8")) for region in mdx_tokens.regions(data)
+    ]
+    assert byte_regions == text_regions
+
+
+def test_prose_lines_numbers():
+    lines = dict(mdx_tokens.prose_lines(PAGE))
+    assert lines[8] == f"Intro {LINK}."
+    assert 14 not in lines  # url: inside the ```yaml fence
+
+
+def test_rewrite_prose_leaves_other_regions():
+    new_text, changed = mdx_tokens.rewrite_prose(PAGE, lambda text: text.replace(LINK, "LINK"))
+    assert changed
+    assert new_text.count("LINK") == 3
+    assert new_text.count(LINK) == PAGE.count(LINK) - 3
+    assert mdx_tokens.rewrite_prose(PAGE, lambda text: text) == (PAGE, False)
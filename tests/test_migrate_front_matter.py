@@ -0,0 +1,77 @@
+import io
+
+import pytest
+
+import instrument
+import migrate_front_matter
+import page_corpus
+
+OPERATIONS = migrate_front_matter.MIGRATIONS["summary-to-description"]
+PAGE = """---
+title: "Quoted title"
+summary: A short summary
+dimensions:
+  level: beginner
+---
+
+Body line one.
+Body line two.
+"""
+
+
+def quiet():
+    return instrument.Instrumentation("migrate_front_matter", stream=io.StringIO())
+
+
+@pytest.fixture
+def page_path(tmp_path):
+    return tmp_path / "0111-page.en.mdx"
+
+
+def test_rename_keeps_untouched_text(page_path):
+    page_path.write_bytes(PAGE.encode("utf-8"))
+    status, messages, _ = migrate_front_matter.migrate_file(str(page_path), OPERATIONS, instr=quiet())
+    assert status == "modified"
+    assert messages == ["[Action] Rename 'summary' -> 'description'."]
+    assert page_path.read_text(encoding="utf-8") == PAGE.replace("summary:", "description:")
+
+    status, _, _ = migrate_front_matter.migrate_file(str(page_path), OPERATIONS, instr=quiet())
+    assert status == "unchanged"
+
+
+def test_dry_run_leaves_file_alone(page_path):
+    page_path.write_bytes(PAGE.encode("utf-8"))
+    status, _, diff = migrate_front_matter.migrate_file(str(page_path), OPERATIONS, dry_run=True, instr=quiet())
+    assert status == "modified"
+    assert "-summary: A short summary\n+description: A short summary\n" in diff
+    assert page_path.read_text(encoding="utf-8") == PAGE
+
+
+def test_missing_header_is_skipped(page_path):
+    page_path.write_text("No header here.\n", encoding="utf-8")
+    assert migrate_front_matter.migrate_file(str(page_path), OPERATIONS, instr=quiet())[0] == "no_front_matter"
+
+
+@pytest.mark.parametrize("operations", [OPERATIONS, [{"op": "default", "path": "language", "value": "en"}]])
+def test_crlf_page_keeps_crlf(page_path, operations):
+    crlf = PAGE.replace("\n", "\r\n").encode("utf-8")
+    page_path.write_bytes(crlf)
+    assert migrate_front_matter.migrate_file(str(page_path), operations, instr=quiet())[0] == "modified"
+    data = page_path.read_bytes()
+    assert b"\n" not in data.replace(b"\r\n", b"")
+    assert data.endswith(b"\r\n\r\nBody line one.\r\nBody line two.\r\n")
+
+
+def test_corpus_page_keeps_crlf(tmp_path):
+    folder = tmp_path / "plugin_dev_en"
+    folder.mkdir()
+    path = folder / "0111-page.en.mdx"
+    path.write_bytes(PAGE.replace("\n", "\r\n").encode("utf-8"))
+
+    corpus = page_corpus.Corpus([str(folder)], base_dir=str(tmp_path), instr=quiet())
+    counts = migrate_front_matter.migrate_corpus(corpus, OPERATIONS, instr=quiet())
+    assert counts["modified"] == 1
+    corpus.flush()
+    data = path.read_bytes()
+    assert b"description:" in data
+    assert b"\n" not in data.replace(b"\r\n", b"")
@@ -0,0 +1,113 @@
+import io
+import os
+import shutil
+
+import pytest
+
+import instrument
+import nav_watch
+from conftest import BASE_DIR
+from letsgo import LANGUAGE_CONFIGS
+
+ZH = next(config for config in LANGUAGE_CONFIGS if config["language"] == "zh")
+NEW_PAGE = "0111-watched-page.zh.mdx"
+
+
+@pytest.fixture
+def docs(tmp_path, monkeypatch):
+    """A copy of docs.json and plugin_dev_zh; configs use paths relative to it."""
+    shutil.copy(os.path.join(BASE_DIR, "docs.json"), tmp_path / "docs.json")
+    shutil.copytree(os.path.join(BASE_DIR, ZH["docs_dir"]), tmp_path / ZH["docs_dir"])
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def docs_text(docs_json_path):
+    with open(docs_json_path, encoding="utf-8") as f:
+        return f.read()
+
+
+def add_page(name=NEW_PAGE):
+    source = sorted(os.listdir(ZH["docs_dir"]))[0]
+    shutil.copy(os.path.join(ZH["docs_dir"], source), os.path.join(ZH["docs_dir"], name))
+
+
+def test_page_events_update_navigation(docs):
+    watcher = nav_watch.NavWatcher([ZH], docs_json_path=str(docs / "docs.json"))
+    watcher.load()
+    assert not watcher.pending()
+
+    add_page()
+    watcher.handle([("zh", NEW_PAGE, True), ("zh", "notes.txt", True)])
+    assert watcher.pending()
+    assert watcher.flush()
+    assert f"plugin_dev_zh/{NEW_PAGE[:-4]}" in docs_text(docs / "docs.json")
+
+    os.remove(os.path.join(ZH["docs_dir"], NEW_PAGE))
+    watcher.handle([("zh", NEW_PAGE, False)])
+    assert watcher.flush()
+    assert NEW_PAGE[:-4] not in docs_text(docs / "docs.json")
+
+
+def test_missing_directory_keeps_pages(docs):
+    watcher = nav_watch.NavWatcher([ZH], docs_json_path=str(docs / "docs.json"))
+    watcher.load()
+    before = docs_text(docs / "docs.json")
+    pages = set(watcher.files["zh"])
+
+    os.rename(ZH["docs_dir"], "plugin_dev_zh_20260101_000000")
+    watcher.handle([("zh", None, False)])
+    assert watcher.files["zh"] == pages
+    assert not watcher.pending()
+
+    shutil.copytree("plugin_dev_zh_20260101_000000", ZH["docs_dir"])
+    watcher.handle([("zh", None, True)])
+    assert not watcher.pending()
+    assert docs_text(docs / "docs.json") == before
+
+
+def test_directory_appearing_after_load_is_synced(docs):
+    os.rename(ZH["docs_dir"], "away")
+    watcher = nav_watch.NavWatcher([ZH], docs_json_path=str(docs / "docs.json"))
+    watcher.load()
+    assert "zh" not in watcher.indexes
+
+    os.rename("away", ZH["docs_dir"])
+    add_page()
+    watcher.handle([("zh", None, True)])
+    assert watcher.pending()
+    assert watcher.flush()
+    assert "zh" in watcher.indexes and not watcher.pending()
+    assert f"plugin_dev_zh/{NEW_PAGE[:-4]}" in docs_text(docs / "docs.json")
+
+
+class ScriptedSource:
+    """Event source replaying one batch of events, then staying quiet."""
+
+    def __init__(self, events):
+        self.batches = [events]
+
+    def wait(self, timeout):
+        return self.batches.pop() if self.batches else []
+
+
+def test_watch_reports_through_instrumentation(docs, capsys):
+    stream = io.StringIO()
+    instr = instrument.Instrumentation("nav_watch", stream=stream)
+    watcher = nav_watch.NavWatcher([ZH], docs_json_path=str(docs / "docs.json"), instr=instr)
+    watcher.load()
+
+    add_page()
+    os.rename("plugin_dev_zh", "away")
+    watcher.handle([("zh", None, False)])
+    os.rename("away", "plugin_dev_zh")
+    nav_watch.watch(watcher, ScriptedSource([("zh", NEW_PAGE, True)]), debounce=0, interval=0, max_events=1)
+
+    out = stream.getvalue()
+    assert "[zh] Warning: Directory 'plugin_dev_zh' does not exist. Pages left as they were." in out
+    assert "[zh] +1 -0 pages" in out
+    assert f"Updated {docs / 'docs.json'} in " in out
+    assert capsys.readouterr().out == ""
+    summary = instr.summary()
+    assert summary["stages"]["flush"]["calls"] == 1
+    assert summary["counters"]["added"] == 1
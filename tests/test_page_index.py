@@ -0,0 +1,71 @@
+import os
+
+import pytest
+
+import page_index
+
+PAGE = """---
+standard_title: Getting Started
+language: zh
+title: 入门
+dimensions:
+  type:
+    primary: conceptual
+    detail: introduction
+  level: beginner
+---
+
+See [next](/plugin_dev_zh/0211-next.zh).
+"""
+
+
+@pytest.fixture
+def folder(tmp_path):
+    folder = tmp_path / "plugin_dev_zh"
+    folder.mkdir()
+    (folder / "0111-getting-started.zh.mdx").write_text(PAGE, encoding="utf-8")
+    return folder
+
+
+@pytest.fixture
+def index(tmp_path):
+    with page_index.PageIndex(str(tmp_path / "index.sqlite")) as index:
+        yield index
+
+
+def test_refresh_indexes_and_skips_unchanged(folder, index):
+    assert index.refresh([str(folder)]) == (1, 0, 0)
+    [row] = index.pages(lang="zh")
+    assert (row["pwxy"], row["standard_title"], row["level"]) == ("0111", "Getting Started", "beginner")
+    assert [link["page"] for link in index.links_from(row["path"])] == ["plugin_dev_zh/0211-next.zh"]
+    assert index.refresh([str(folder)]) == (0, 1, 0)
+
+    path = folder / "0111-getting-started.zh.mdx"
+    os.utime(path, ns=(0, 0))  # touched, same content: no re-parse
+    assert index.refresh([str(folder)]) == (0, 1, 0)
+    path.write_text(PAGE.replace("beginner", "advanced"), encoding="utf-8")
+    assert index.refresh([str(folder)]) == (1, 0, 0)
+    assert index.pages(level="advanced")[0]["pwxy"] == "9113"
+
+    path.unlink()
+    assert index.refresh([str(folder)]) == (0, 0, 1)
+    assert index.pages() == []
+
+
+def test_pwxy_rederived_when_naming_rules_change(folder, index):
+    index.refresh([str(folder)])
+    index.db.execute("UPDATE pages SET pwxy = '0000'")
+    index.db.execute("UPDATE meta SET value = 'older rules' WHERE key = 'pwxy_fingerprint'")
+    index.db.commit()
+    assert index.refresh([str(folder)]) == (0, 1, 0)
+    assert index.pages()[0]["pwxy"] == "0111"
+
+
+def test_undecodable_page_drops_its_row(folder, index, capsys):
+    index.refresh([str(folder)])
+    path = folder / "0111-getting-started.zh.mdx"
+    path.write_bytes(path.read_bytes() + b"\xff")
+    index.refresh([str(folder)])
+    assert "[Error] Cannot decode" in capsys.readouterr().out
+    assert index.pages() == []
+    assert index.query("SELECT * FROM links") == []
@@ -0,0 +1,38 @@
+import pwxy
+from letsgo import LANGUAGE_CONFIGS
+
+
+def test_check_reports_unrouted_keys_as_info(capsys):
+    assert pwxy.main(["--check"]) == 0
+    out = capsys.readouterr().out
+    assert "Warning" not in out
+    unrouted = [key for config in LANGUAGE_CONFIGS for key in pwxy.validate_group_map(config["group_map"])[0]]
+    assert out.count("can be produced but has no group") == len(unrouted)
+
+
+def test_check_strict_fails_on_unrouted_keys(capsys):
+    unrouted = any(pwxy.validate_group_map(config["group_map"])[0] for config in LANGUAGE_CONFIGS)
+    assert pwxy.main(["--check", "--strict"]) == (1 if unrouted else 0)
+    assert ("Warning: PWX" in capsys.readouterr().out) == unrouted
+
+
+def test_validate_group_map():
+    reachable = {tuple(prefix[:3]) for prefix in pwxy.mapped_combinations().values()}
+    group_map = dict.fromkeys(sorted(reachable)[1:], "Group")
+    group_map[("8", "8", "8")] = "Group"
+    assert pwxy.validate_group_map(group_map) == ([sorted(reachable)[0]], [("8", "8", "8")])
+
+
+def test_classify_many_matches_classify():
+    records = [
+        {"dimensions": {"type": {"primary": "conceptual", "detail": "introduction"}, "level": "beginner"}},
+        {"dimensions": {"type": {"primary": "implementation", "detail": "high"}, "level": "intermediate"}},
+        {"dimensions": {"type": {"primary": "unknown", "detail": "x"}, "level": "odd"}},
+        {},
+    ]
+    results = pwxy.classify_many(records)
+    assert [result.prefix for result in results] == [
+        pwxy.classify(*pwxy.dimension_values(record)).prefix for record in records
+    ]
+    assert results[0].prefix == "0111" and results[1].prefix == "9232"
+    assert isinstance(pwxy.classify_many([{"dimensions": "flat"}])[0], AttributeError)
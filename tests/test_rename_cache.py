@@ -0,0 +1,89 @@
+import io
+import json
+import os
+
+import instrument
+import rename
+
+TITLED = """---
+standard_title: Getting Started
+language: zh
+dimensions:
+  type:
+    primary: conceptual
+    detail: introduction
+  level: beginner
+---
+
+Body
+"""
+# No standard_title and no dimensions: named from its source filename.
+UNTITLED = """---
+language: zh
+---
+
+Body
+"""
+
+
+def quiet():
+    return instrument.Instrumentation("rename", stream=io.StringIO())
+
+
+def run(target_dir, cache_path):
+    renames = rename.process_markdown_files(target_dir, target_dir, cache_path, instr=quiet(), fsync="none")
+    assert renames is not None
+    tree = {}
+    for name in sorted(os.listdir(target_dir)):
+        with open(os.path.join(target_dir, name), "rb") as f:
+            tree[name] = f.read()
+    return tree
+
+
+def test_cached_runs_match_uncached_runs(tmp_path):
+    for mode in ("cached", "uncached"):
+        target_dir = tmp_path / mode / "plugin_dev_zh"
+        target_dir.mkdir(parents=True)
+        (target_dir / "getting-started.mdx").write_text(TITLED, encoding="utf-8")
+        (target_dir / "nodims.mdx").write_text(UNTITLED, encoding="utf-8")
+
+    cache_path = str(tmp_path / "cache.json")
+    for _ in range(3):
+        cached = run(str(tmp_path / "cached" / "plugin_dev_zh"), cache_path)
+        uncached = run(str(tmp_path / "uncached" / "plugin_dev_zh"), None)
+        assert cached == uncached
+    assert "0111-getting-started.zh.mdx" in cached
+
+
+def test_untitled_pages_are_not_cached(tmp_path):
+    target_dir = tmp_path / "plugin_dev_zh"
+    target_dir.mkdir()
+    (target_dir / "nodims.mdx").write_text(UNTITLED, encoding="utf-8")
+    cache_path = str(tmp_path / "cache.json")
+    run(str(target_dir), cache_path)
+    with open(cache_path, encoding="utf-8") as f:
+        assert json.load(f)["entries"] == {}
+
+
+def test_cache_entries_dropped_when_fingerprint_changes(tmp_path):
+    instr = quiet()
+    cache_path = str(tmp_path / "cache.json")
+    stats = {"a.mdx": [1, 2, "sha"]}
+    entries = {"sha": {"prefix": "0111", "filename": "0111-a.zh.mdx", "output_hash": "sha", "warnings": []}}
+    fingerprint = rename.cache_fingerprint()
+
+    rename.save_cache(
+        cache_path,
+        {"version": rename.CACHE_VERSION, "fingerprint": fingerprint, "stats": stats, "entries": entries},
+        instr,
+    )
+    cache = rename.load_cache(cache_path, instr)
+    assert (cache["stats"], cache["entries"]) == (stats, entries)
+
+    with open(cache_path, encoding="utf-8") as f:
+        data = json.load(f)
+    data["fingerprint"] = "rules of an older run"
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    cache = rename.load_cache(cache_path, instr)
+    assert (cache["stats"], cache["entries"], cache["fingerprint"]) == (stats, {}, fingerprint)
@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+import rename
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@pytest.fixture
+def target(tmp_path):
+    target_dir = tmp_path / "plugin_dev_zh"
+    target_dir.mkdir()
+    (target_dir / "old.mdx").write_bytes(b"old")
+    return str(target_dir)
+
+
+def test_staging_writer_swaps_new_tree_in(target, tmp_path):
+    source = tmp_path / "linked.mdx"
+    source.write_bytes(b"linked")
+    writer = rename.StagingWriter(target, fsync="none", threads=2)
+    assert not writer.open()
+    writer.write("new.mdx", b"new")
+    writer.link(str(source), "linked.mdx")
+    results, failures = writer.finish()
+    assert failures == [] and sorted(name for name, _, _ in results) == ["linked.mdx", "new.mdx"]
+    assert os.listdir(target) == ["old.mdx"]  # untouched until commit
+
+    archive_dir = str(tmp_path / "archive")
+    writer.commit(archive_dir)
+    assert sorted(os.listdir(target)) == ["linked.mdx", "new.mdx"]
+    assert os.listdir(archive_dir) == ["old.mdx"]
+    assert not os.path.exists(writer.staging_dir)
+    assert os.stat(os.path.join(target, "linked.mdx")).st_ino == os.stat(source).st_ino
+
+
+def test_staging_writer_restores_target_when_swap_fails(target, tmp_path, monkeypatch):
+    writer = rename.StagingWriter(target, fsync="none")
+    writer.open()
+    writer.write("new.mdx", b"new")
+    writer.finish()
+
+    real_rename = os.rename
+
+    def failing_rename(src, dst):
+        if src == writer.staging_dir:
+            raise OSError(28, "No space left on device")
+        real_rename(src, dst)
+
+    monkeypatch.setattr(rename.os, "rename", failing_rename)
+    with pytest.raises(OSError):
+        writer.commit(str(tmp_path / "archive"))
+    monkeypatch.undo()
+    writer.discard()
+    assert sorted(os.listdir(tmp_path)) == ["plugin_dev_zh"]
+    assert read(os.path.join(target, "old.mdx")) == b"old"
+
+
+def test_staging_writer_removes_stale_staging(target):
+    writer = rename.StagingWriter(target, fsync="none")
+    os.makedirs(os.path.join(writer.staging_dir, "leftover"))
+    assert writer.open()
+    assert os.listdir(writer.staging_dir) == []
+    writer.discard()
+
+
+def test_unique_path(tmp_path):
+    path = str(tmp_path / "plugin_dev_zh_20260101_000000")
+    assert rename.unique_path(path) == path
+    os.mkdir(path)
+    os.mkdir(f"{path}_1")
+    assert rename.unique_path(path) == f"{path}_2"
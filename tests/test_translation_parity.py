@@ -0,0 +1,108 @@
+import os
+
+import pytest
+
+import page_index
+import translation_parity
+
+
+def page(title, lang, body="Body"):
+    header = f"standard_title: {title}\n" if title else ""
+    return f"---\n{header}language: {lang}\n---\n\n{body}\n"
+
+
+PAGES = {
+    "en": {
+        "0111-alpha.en.mdx": page("Alpha", "en"),
+        "0211-beta.en.mdx": page("Beta", "en"),
+        "0311-gamma.en.mdx": page("Gamma", "en"),
+        "0000-broken.en.mdx": page(None, "en"),
+    },
+    "zh": {
+        "0111-alpha.zh.mdx": page("Alpha", "zh", "正文"),
+        "0212-beta.zh.mdx": page("Beta", "zh", "正文"),
+        "0411-delta.zh.mdx": page("Delta", "zh"),
+        "0411-delta-copy.zh.mdx": page("Delta", "zh"),
+    },
+}
+
+
+def nav_section(lang, groups):
+    return {"language": lang, "tabs": [{"tab": "Docs", "groups": [{"group": g, "pages": p} for g, p in groups]}]}
+
+
+@pytest.fixture
+def index(tmp_path):
+    folders = []
+    for lang, pages in PAGES.items():
+        folder = tmp_path / f"plugin_dev_{lang}"
+        folder.mkdir()
+        for name, content in pages.items():
+            (folder / name).write_text(content, encoding="utf-8")
+        folders.append(str(folder))
+    # The source pages are newer than their translations.
+    for name in PAGES["en"]:
+        os.utime(tmp_path / "plugin_dev_en" / name, ns=(2_000_000_000, 2_000_000_000))
+    for name in PAGES["zh"]:
+        os.utime(tmp_path / "plugin_dev_zh" / name, ns=(1_000_000_000, 1_000_000_000))
+
+    with page_index.PageIndex(str(tmp_path / "index.sqlite")) as index:
+        index.refresh(folders)
+        yield index
+
+
+def issues_by_kind(issues):
+    result = {}
+    for issue in issues:
+        result.setdefault(issue["kind"], []).append(issue)
+    return result
+
+
+def test_check_parity(index):
+    rows = {row["filename"]: row for row in index.pages()}
+    alpha_en, alpha_zh = rows["0111-alpha.en.mdx"], rows["0111-alpha.zh.mdx"]
+    docs_data = {
+        "navigation": {
+            "languages": [
+                nav_section("en", [("A", [alpha_en["page"]]), ("B", [])]),
+                nav_section("zh", [("A", []), ("B", [alpha_zh["page"]])]),
+            ]
+        }
+    }
+    baseline = {"Alpha": {"en": "older body", "zh": alpha_zh["body_sha1"]}}
+
+    issues, pairs = translation_parity.check_parity(index, docs_data, "en", baseline)
+    kinds = issues_by_kind(issues)
+    assert [issue["standard_title"] for issue in kinds["missing"]] == ["Gamma"]
+    assert [issue["standard_title"] for issue in kinds["extra"]] == ["Delta"]
+    assert [issue["standard_title"] for issue in kinds["duplicate"]] == ["Delta"]
+    assert [issue["page"].rsplit("/", 1)[1] for issue in kinds["untitled"]] == ["0000-broken.en.mdx"]
+    assert [(issue["expected"], issue["found"]) for issue in kinds["pwxy"]] == [("0211", "0212")]
+    assert [(issue["standard_title"], issue["expected"], issue["found"]) for issue in kinds["nav"]] == [
+        ("Alpha", (0, 0, None), (0, 1, None))
+    ]
+    stale = {issue["standard_title"]: issue["basis"] for issue in kinds["stale"]}
+    assert stale == {"Alpha": "baseline", "Beta": "mtime"}
+    assert set(pairs) == {"Alpha", "Beta"}
+    assert pairs["Alpha"] == {"en": alpha_en["body_sha1"], "zh": alpha_zh["body_sha1"]}
+
+    failing = {issue["kind"] for issue in issues if translation_parity.is_failure(issue, {"stale"})}
+    assert failing == {"stale"}
+    assert not any(
+        translation_parity.is_failure(issue, {"stale"}) for issue in kinds["stale"] if issue["basis"] == "mtime"
+    )
+    for issue in issues:
+        assert translation_parity.format_issue(issue).startswith("[")
+
+
+def test_missing_source_language(index):
+    with pytest.raises(ValueError):
+        translation_parity.check_parity(index, {}, "ja")
+
+
+def test_baseline_round_trip(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    pairs = {"Alpha": {"en": "a", "zh": "b"}}
+    translation_parity.save_baseline(path, pairs)
+    assert translation_parity.load_baseline(path) == pairs
+    assert translation_parity.load_baseline(str(tmp_path / "absent.json")) == {}
@@ -0,0 +1,267 @@
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+
+from docs_nav import find_language_nav
+from page_index import INDEX_PATH, PageIndex
+
+# Pairs the pages of every plugin_dev_<lang> folder with those of the source
+# language by standard_title and reports what is out of parity:
+#   missing    source page without a translation
+#   extra      translation without a source page
+#   duplicate  several pages of one language share a standard_title
+#   untitled   page without standard_title (usually a YAML error), cannot pair
+#   pwxy       paired pages with different PWXY filename prefixes
+#   nav        paired pages in different positions of the docs.json navigation
+#   stale      source body changed since the translation was last in sync
+# Every language is read once from the page index (page_index.py) into a dict
+# keyed by standard_title, so pairing is linear instead of comparing every
+# page with every other one.
+#
+# Staleness compares body hashes against BASELINE_PATH, which --update-baseline
+# records once translations are in sync. Without a baseline entry the file
+# mtimes are compared instead; those findings are informational only, since a
+# fresh checkout gives every file the same arbitrary mtime.
+
+# --- Path Setup ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# --- Configuration ---
+DOCS_JSON_PATH = os.path.join(BASE_DIR, "docs.json")
+BASELINE_PATH = os.path.join(BASE_DIR, "translation_baseline.json")
+BASELINE_VERSION = 1
+SOURCE_LANGUAGE = "en"
+ISSUE_KINDS = ("missing", "extra", "duplicate", "untitled", "pwxy", "nav", "stale")
+
+
+# --- Helper Functions ---
+
+
+def filename_prefix(row):
+    """The PWXY prefix a page is published under (its filename), or the computed one."""
+    prefix = row["filename"][:4]
+    return prefix if prefix.isdigit() else row["pwxy"]
+
+
+def nav_positions(docs_data, lang):
+    """Map page path -> (tab index, group index, nested group index or None)."""
+    positions = {}
+    lang_nav = find_language_nav(docs_data.get("navigation", {}), lang)
+    if lang_nav is None:
+        return positions
+    for tab_index, tab in enumerate(lang_nav.get("tabs") or []):
+        for group_index, group in enumerate(tab.get("groups") or [] if isinstance(tab, dict) else []):
+            if not isinstance(group, dict):
+                continue
+            nested_index = 0
+            for item in group.get("pages") or []:
+                if isinstance(item, str):
+                    positions.setdefault(item, (tab_index, group_index, None))
+                elif isinstance(item, dict):
+                    for page in item.get("pages") or []:
+                        if isinstance(page, str):
+                            positions.setdefault(page, (tab_index, group_index, nested_index))
+                    nested_index += 1
+    return positions
+
+
+def load_baseline(baseline_path):
+    if not baseline_path or not os.path.exists(baseline_path):
+        return {}
+    try:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Ignoring unreadable baseline '{baseline_path}': {e}", file=sys.stderr)
+        return {}
+    if not isinstance(baseline, dict) or baseline.get("version") != BASELINE_VERSION:
+        return {}
+    return baseline.get("pairs", {})
+
+
+def save_baseline(baseline_path, pairs):
+    tmp_path = f"{baseline_path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": BASELINE_VERSION, "pairs": pairs}, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, baseline_path)
+
+
+def index_language(rows):
+    """standard_title -> [rows] for one language, plus the rows without a title."""
+    by_title = defaultdict(list)
+    untitled = []
+    for row in rows:
+        if row["standard_title"]:
+            by_title[row["standard_title"]].append(row)
+        else:
+            untitled.append(row)
+    return by_title, untitled
+
+
+# --- Parity Check ---
+
+
+def check_parity(index, docs_data, source_lang=SOURCE_LANGUAGE, baseline=None):
+    """
+    Compare every language in the index with source_lang.
+    Returns (issues, pairs): issues is a list of dicts with a "kind" from
+    ISSUE_KINDS; pairs maps standard_title -> {lang: body_sha1} for every
+    complete source/translation pair (the data --update-baseline stores).
+    """
+    baseline = baseline or {}
+    rows_by_lang = defaultdict(list)
+    for row in index.query("SELECT * FROM pages ORDER BY path"):
+        rows_by_lang[row["dir_lang"]].append(row)
+
+    if source_lang not in rows_by_lang:
+        raise ValueError(f"No pages found for source language '{source_lang}'")
+
+    indexes = {lang: index_language(rows) for lang, rows in rows_by_lang.items()}
+    positions = {lang: nav_positions(docs_data, lang) for lang in rows_by_lang}
+    source_titles, _ = indexes[source_lang]
+    issues = []
+    pairs = defaultdict(dict)
+
+    for lang in sorted(indexes):
+        titles, untitled = indexes[lang]
+        for row in untitled:
+            issues.append({"kind": "untitled", "lang": lang, "page": row["path"], "status": row["status"]})
+        for title, rows in sorted(titles.items()):
+            if len(rows) > 1:
+                issues.append(
+                    {"kind": "duplicate", "lang": lang, "standard_title": title, "pages": [r["path"] for r in rows]}
+                )
+
+    for lang in sorted(indexes):
+        if lang == source_lang:
+            continue
+        titles, _ = indexes[lang]
+        for title in sorted(source_titles.keys() - titles.keys()):
+            issues.append(
+                {"kind": "missing", "lang": lang, "standard_title": title, "source": source_titles[title][0]["path"]}
+            )
+        for title in sorted(titles.keys() - source_titles.keys()):
+            issues.append({"kind": "extra", "lang": lang, "standard_title": title, "page": titles[title][0]["path"]})
+
+        for title in sorted(source_titles.keys() & titles.keys()):
+            source, target = source_titles[title][0], titles[title][0]
+            pair = {"lang": lang, "standard_title": title, "source": source["path"], "page": target["path"]}
+
+            source_prefix, target_prefix = filename_prefix(source), filename_prefix(target)
+            if source_prefix != target_prefix:
+                issues.append({"kind": "pwxy", **pair, "expected": source_prefix, "found": target_prefix})
+
+            source_position = positions[source_lang].get(source["page"])
+            target_position = positions[lang].get(target["page"])
+            if source_position != target_position:
+                issues.append(
+                    {"kind": "nav", **pair, "expected": source_position, "found": target_position}
+                )
+
+            if source["body_sha1"] and target["body_sha1"]:
+                pairs[title][source_lang] = source["body_sha1"]
+                pairs[title][lang] = target["body_sha1"]
+            synced = baseline.get(title)
+            if synced and synced.get(source_lang) and synced.get(lang):
+                if source["body_sha1"] != synced[source_lang] and target["body_sha1"] == synced[lang]:
+                    issues.append({"kind": "stale", **pair, "basis": "baseline"})
+            elif source["mtime_ns"] > target["mtime_ns"]:
+                issues.append({"kind": "stale", **pair, "basis": "mtime"})
+
+    return issues, dict(pairs)
+
+
+def is_failure(issue, fail_on):
+    if issue["kind"] not in fail_on:
+        return False
+    return issue["kind"] != "stale" or issue["basis"] == "baseline"
+
+
+def format_issue(issue):
+    kind = issue["kind"]
+    if kind == "missing":
+        return f"[Missing] {issue['lang']}: '{issue['standard_title']}' ({issue['source']})"
+    if kind == "extra":
+        return f"[Extra] {issue['page']}: no {SOURCE_LANGUAGE} page titled '{issue['standard_title']}'"
+    if kind == "duplicate":
+        return f"[Duplicate] {issue['lang']}: '{issue['standard_title']}' in {', '.join(issue['pages'])}"
+    if kind == "untitled":
+        return f"[Untitled] {issue['page']} (status: {issue['status']})"
+    if kind == "stale":
+        note = "" if issue["basis"] == "baseline" else " (by mtime, informational)"
+        return f"[Stale] {issue['page']}: {issue['source']} changed since last sync{note}"
+    label = "PWXY" if kind == "pwxy" else "Nav"
+    return f"[{label}] {issue['page']}: expected {issue['expected']}, found {issue['found']}"
+
+
+# --- Main Logic ---
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Report missing, extra, stale and misplaced translations of plugin_dev_<lang> pages."
+    )
+    parser.add_argument("--source", default=SOURCE_LANGUAGE, help="Source language (default: %(default)s)")
+    parser.add_argument("--index", default=INDEX_PATH, help="Page index file (default: %(default)s)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Sync baseline (default: %(default)s)")
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Record the current body hashes of every pair as in sync",
+    )
+    parser.add_argument(
+        "--fail-on",
+        action="append",
+        choices=ISSUE_KINDS,
+        help="Issue kinds that make the exit code 1 (repeatable; default: all)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+    fail_on = set(args.fail_on or ISSUE_KINDS)
+
+    try:
+        with open(DOCS_JSON_PATH, "r", encoding="utf-8") as f:
+            docs_data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"Error: Could not read {DOCS_JSON_PATH}: {e}")
+        return 2
+
+    with PageIndex(args.index) as index:
+        index.refresh()
+        baseline = load_baseline(args.baseline)
+        try:
+            issues, pairs = check_parity(index, docs_data, args.source, baseline)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 2
+
+    if args.update_baseline:
+        save_baseline(args.baseline, pairs)
+        print(f"Baseline written to {args.baseline} ({len(pairs)} pairs).", file=sys.stderr)
+        issues = [issue for issue in issues if issue["kind"] != "stale"]
+
+    failures = [issue for issue in issues if is_failure(issue, fail_on)]
+    if args.json:
+        json.dump(
+            {"source": args.source, "issues": issues, "failures": len(failures)},
+            sys.stdout,
+            ensure_ascii=False,
+            indent=2,
+        )
+        print()
+    else:
+        for issue in issues:
+            print(format_issue(issue))
+        counts = defaultdict(int)
+        for issue in issues:
+            counts[issue["kind"]] += 1
+        summary = ", ".join(f"{counts[kind]} {kind}" for kind in ISSUE_KINDS)
+        print(f"Parity against '{args.source}': {summary}; {len(failures)} failing.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())